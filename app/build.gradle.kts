@@ -110,6 +110,11 @@ dependencies {
 
     // Debug
     debugImplementation(libs.androidx.ui.tooling)
+
+    // Unit test (JVM)
+    testImplementation("junit:junit:4.13.2")
+    // android.jar의 org.json은 JVM 테스트에서 동작하지 않으므로 실제 구현 사용 (BridgeCodec 배치 디코딩)
+    testImplementation("org.json:json:20240303")
 }
 
 
@@ -14,71 +14,97 @@ object OscillatorCalculator {
      * 공식: (외국인5일 + 기관5일) / 시가총액 * 100
      */
     fun calculate(data: StockData): OscillatorResult {
-        val dates = data.dates
-        val marketCap = data.marketCap
-        val oscillator = mutableListOf<Double>()
+        val size = data.size
+        val result = OscillatorResult(
+            dates = data.dates,
+            marketCap = data.marketCap,  // 원본 시가총액 데이터 포함
+            oscillator = DoubleArray(size),
+            ema = DoubleArray(size),
+            macd = DoubleArray(size),
+            signal = DoubleArray(size),
+            histogram = DoubleArray(size)
+        )
+        calculateInto(data, result)
+        return result
+    }
+
+    /**
+     * 수급 오실레이터를 기존 결과 배열에 덮어써서 계산 (추가 할당 없음)
+     *
+     * 같은 길이의 데이터를 반복 계산할 때 결과 배열을 재사용합니다.
+     */
+    fun calculateInto(data: StockData, result: OscillatorResult) {
+        val size = data.size
+        require(result.size == size) { "결과 길이가 다릅니다: ${result.size} != $size" }
+
+        val oscillator = result.oscillator
+        val ema = result.ema
+        val macd = result.macd
+        val signal = result.signal
+        val histogram = result.histogram
 
         // 1. 수급 오실레이터 계산
-        for (i in data.marketCap.indices) {
+        for (i in 0 until size) {
             val mcap = data.marketCap[i].toDouble()
             val foreign = data.foreign5d[i].toDouble()
             val institution = data.institution5d[i].toDouble()
 
-            val osc = if (mcap > 0) {
+            oscillator[i] = if (mcap > 0) {
                 ((foreign + institution) / mcap) * 100.0
             } else {
                 0.0
             }
-
-            oscillator.add(osc)
         }
 
-        // 2. EMA 계산 (12일)
-        val ema = calculateEMA(oscillator, 12)
+        // 2. EMA 계산 (12일, MACD의 12일 EMA와 같은 값)
+        calculateEMA(oscillator, 12, ema)
 
-        // 3. MACD 계산
-        val ema12 = calculateEMA(oscillator, 12)
-        val ema26 = calculateEMA(oscillator, 26)
-        val macd = ema12.zip(ema26) { e12, e26 -> e12 - e26 }
+        // 3. MACD 계산 (26일 EMA를 macd 배열에 먼저 받은 뒤 12일 EMA에서 뺌)
+        calculateEMA(oscillator, 26, macd)
+        for (i in 0 until size) {
+            macd[i] = ema[i] - macd[i]
+        }
 
         // 4. Signal 계산 (MACD의 9일 EMA)
-        val signal = calculateEMA(macd, 9)
+        calculateEMA(macd, 9, signal)
 
         // 5. Histogram 계산
-        val histogram = macd.zip(signal) { m, s -> m - s }
-
-        return OscillatorResult(
-            dates = dates,
-            marketCap = marketCap,  // 원본 시가총액 데이터 포함
-            oscillator = oscillator,
-            ema = ema,
-            macd = macd,
-            signal = signal,
-            histogram = histogram
-        )
+        for (i in 0 until size) {
+            histogram[i] = macd[i] - signal[i]
+        }
     }
 
     /**
      * EMA (지수 이동 평균) 계산
+     *
+     * 앞 period-1개는 0, period번째는 단순 평균, 이후는 지수 이동 평균
+     * (데이터가 period보다 짧으면 모두 0)
      */
-    private fun calculateEMA(values: List<Double>, period: Int): List<Double> {
-        if (values.isEmpty()) return emptyList()
+    private fun calculateEMA(values: DoubleArray, period: Int, out: DoubleArray) {
+        val size = values.size
+        if (size < period) {
+            out.fill(0.0, 0, size)
+            return
+        }
 
-        val result = mutableListOf<Double>()
         val multiplier = 2.0 / (period + 1)
 
         // 첫 번째 EMA는 단순 평균
-        var ema = values.take(period).average()
-        result.add(ema)
+        var sum = 0.0
+        for (i in 0 until period) {
+            sum += values[i]
+        }
+        var ema = sum / period
+
+        // 앞부분을 0으로 채움
+        out.fill(0.0, 0, period - 1)
+        out[period - 1] = ema
 
         // 이후 EMA 계산
-        for (i in period until values.size) {
+        for (i in period until size) {
             ema = (values[i] - ema) * multiplier + ema
-            result.add(ema)
+            out[i] = ema
         }
-
-        // 앞부분을 0으로 채움
-        return List(period - 1) { 0.0 } + result
     }
 
     /**
@@ -1,5 +1,7 @@
 package com.stockoscillator.data.model
 
+import java.time.LocalDate
+
 /**
  * UI 상태
  */
@@ -14,16 +16,115 @@ sealed class UiState<out T> {
 }
 
 /**
- * 주식 데이터
+ * 날짜 열 (1970-01-01 기준 일수)
+ *
+ * 행마다 문자열을 만들지 않고, 화면에 표시할 때만 yyyy-MM-dd 문자열로 변환합니다.
+ */
+class EpochDates(val days: IntArray) {
+    val size: Int get() = days.size
+
+    fun isEmpty(): Boolean = days.isEmpty()
+
+    operator fun get(index: Int): String = LocalDate.ofEpochDay(days[index].toLong()).toString()
+
+    fun lastOrNull(): String? = if (days.isEmpty()) null else get(days.size - 1)
+
+    override fun equals(other: Any?): Boolean =
+        this === other || (other is EpochDates && days.contentEquals(other.days))
+
+    override fun hashCode(): Int = days.contentHashCode()
+
+    override fun toString(): String = "EpochDates(size=$size, last=${lastOrNull()})"
+}
+
+/**
+ * 주식 데이터 (열 단위 기본형 배열)
  */
 data class StockData(
     val ticker: String,
     val name: String,
-    val dates: List<String>,
-    val marketCap: List<Long>,        // 시가총액
-    val foreign5d: List<Long>,        // 외국인 5일 누적
-    val institution5d: List<Long>     // 기관 5일 누적
-)
+    val dates: EpochDates,
+    val marketCap: LongArray,         // 시가총액
+    val foreign5d: LongArray,         // 외국인 5일 누적
+    val institution5d: LongArray      // 기관 5일 누적
+) {
+    val size: Int get() = dates.size
+
+    // 배열 속성은 data class 기본 구현이 참조로 비교하므로 내용으로 비교
+    override fun equals(other: Any?): Boolean =
+        this === other || (other is StockData &&
+            ticker == other.ticker &&
+            name == other.name &&
+            dates == other.dates &&
+            marketCap.contentEquals(other.marketCap) &&
+            foreign5d.contentEquals(other.foreign5d) &&
+            institution5d.contentEquals(other.institution5d))
+
+    override fun hashCode(): Int {
+        var result = ticker.hashCode()
+        result = 31 * result + name.hashCode()
+        result = 31 * result + dates.hashCode()
+        result = 31 * result + marketCap.contentHashCode()
+        result = 31 * result + foreign5d.contentHashCode()
+        result = 31 * result + institution5d.contentHashCode()
+        return result
+    }
+}
+
+/**
+ * 최근 조각부터 받는 StockData를 앞쪽으로 채워 나가는 버퍼 (단계적 수집용)
+ *
+ * 예상 행 수만큼 기본형 배열을 한 번 만들어 두고 조각을 뒤에서부터 채우므로,
+ * 조각마다 지금까지 받은 조각을 다시 이어 붙이지 않습니다 (모자라면 두 배로 늘림).
+ *
+ * @param capacity 예상 행 수
+ */
+class StockDataBuffer(capacity: Int) {
+    private var dates = IntArray(capacity)
+    private var marketCap = LongArray(capacity)
+    private var foreign5d = LongArray(capacity)
+    private var institution5d = LongArray(capacity)
+    private var start = capacity      // 채운 구간: [start, 용량)
+    private var latest: StockData? = null
+
+    val size: Int get() = dates.size - start
+
+    /**
+     * 지금까지 채운 구간보다 과거인 조각(날짜 오름차순)을 앞에 추가
+     */
+    fun prepend(chunk: StockData) {
+        if (chunk.size > start) grow(size + chunk.size)
+        start -= chunk.size
+        chunk.dates.days.copyInto(dates, start)
+        chunk.marketCap.copyInto(marketCap, start)
+        chunk.foreign5d.copyInto(foreign5d, start)
+        chunk.institution5d.copyInto(institution5d, start)
+        if (latest == null) latest = chunk
+    }
+
+    /**
+     * 채운 구간 전체 (날짜 오름차순, 종목 정보는 가장 최근 조각 기준)
+     */
+    fun toStockData(): StockData {
+        val first = checkNotNull(latest) { "채운 조각이 없습니다" }
+        return first.copy(
+            dates = EpochDates(dates.copyOfRange(start, dates.size)),
+            marketCap = marketCap.copyOfRange(start, marketCap.size),
+            foreign5d = foreign5d.copyOfRange(start, foreign5d.size),
+            institution5d = institution5d.copyOfRange(start, institution5d.size)
+        )
+    }
+
+    private fun grow(needed: Int) {
+        val capacity = maxOf(needed, dates.size * 2)
+        val shift = capacity - dates.size
+        dates = dates.copyInto(IntArray(capacity), start + shift, start)
+        marketCap = marketCap.copyInto(LongArray(capacity), start + shift, start)
+        foreign5d = foreign5d.copyInto(LongArray(capacity), start + shift, start)
+        institution5d = institution5d.copyInto(LongArray(capacity), start + shift, start)
+        start += shift
+    }
+}
 
 /**
  * 증시 자금 동향 데이터
@@ -37,17 +138,95 @@ data class MarketDepositData(
 )
 
 /**
- * 수급 오실레이터 계산 결과
+ * 최근 묶음부터 받는 MarketDepositData를 앞쪽으로 채워 나가는 버퍼 (StockDataBuffer와 같은 방식)
+ *
+ * @param capacity 예상 행 수
+ */
+class MarketDepositBuffer(capacity: Int) {
+    private var dates = Array(capacity) { "" }
+    private var depositAmounts = DoubleArray(capacity)
+    private var depositChanges = DoubleArray(capacity)
+    private var creditAmounts = DoubleArray(capacity)
+    private var creditChanges = DoubleArray(capacity)
+    private var start = capacity      // 채운 구간: [start, 용량)
+
+    val size: Int get() = dates.size - start
+
+    /**
+     * 지금까지 채운 구간보다 과거인 묶음(날짜 오름차순)을 앞에 추가
+     */
+    fun prepend(chunk: MarketDepositData) {
+        val count = chunk.dates.size
+        if (count > start) grow(size + count)
+        start -= count
+        for (i in 0 until count) {
+            dates[start + i] = chunk.dates[i]
+            depositAmounts[start + i] = chunk.depositAmounts[i]
+            depositChanges[start + i] = chunk.depositChanges[i]
+            creditAmounts[start + i] = chunk.creditAmounts[i]
+            creditChanges[start + i] = chunk.creditChanges[i]
+        }
+    }
+
+    /**
+     * 채운 구간 전체 (날짜 오름차순)
+     */
+    fun toMarketDepositData(): MarketDepositData = MarketDepositData(
+        dates = dates.copyOfRange(start, dates.size).asList(),
+        depositAmounts = depositAmounts.copyOfRange(start, depositAmounts.size).asList(),
+        depositChanges = depositChanges.copyOfRange(start, depositChanges.size).asList(),
+        creditAmounts = creditAmounts.copyOfRange(start, creditAmounts.size).asList(),
+        creditChanges = creditChanges.copyOfRange(start, creditChanges.size).asList()
+    )
+
+    private fun grow(needed: Int) {
+        val capacity = maxOf(needed, dates.size * 2)
+        val shift = capacity - dates.size
+        dates = dates.copyInto(Array(capacity) { "" }, start + shift, start)
+        depositAmounts = depositAmounts.copyInto(DoubleArray(capacity), start + shift, start)
+        depositChanges = depositChanges.copyInto(DoubleArray(capacity), start + shift, start)
+        creditAmounts = creditAmounts.copyInto(DoubleArray(capacity), start + shift, start)
+        creditChanges = creditChanges.copyInto(DoubleArray(capacity), start + shift, start)
+        start += shift
+    }
+}
+
+/**
+ * 수급 오실레이터 계산 결과 (열 단위 기본형 배열)
  */
 data class OscillatorResult(
-    val dates: List<String>,
-    val marketCap: List<Long>,       // 시가총액 (원본 데이터)
-    val oscillator: List<Double>,     // 수급 오실레이터
-    val ema: List<Double>,            // EMA
-    val macd: List<Double>,           // MACD
-    val signal: List<Double>,         // Signal
-    val histogram: List<Double>       // Histogram
-)
+    val dates: EpochDates,
+    val marketCap: LongArray,        // 시가총액 (원본 데이터)
+    val oscillator: DoubleArray,      // 수급 오실레이터
+    val ema: DoubleArray,             // EMA
+    val macd: DoubleArray,            // MACD
+    val signal: DoubleArray,          // Signal
+    val histogram: DoubleArray        // Histogram
+) {
+    val size: Int get() = dates.size
+
+    // 배열 속성은 data class 기본 구현이 참조로 비교하므로 내용으로 비교
+    override fun equals(other: Any?): Boolean =
+        this === other || (other is OscillatorResult &&
+            dates == other.dates &&
+            marketCap.contentEquals(other.marketCap) &&
+            oscillator.contentEquals(other.oscillator) &&
+            ema.contentEquals(other.ema) &&
+            macd.contentEquals(other.macd) &&
+            signal.contentEquals(other.signal) &&
+            histogram.contentEquals(other.histogram))
+
+    override fun hashCode(): Int {
+        var result = dates.hashCode()
+        result = 31 * result + marketCap.contentHashCode()
+        result = 31 * result + oscillator.contentHashCode()
+        result = 31 * result + ema.contentHashCode()
+        result = 31 * result + macd.contentHashCode()
+        result = 31 * result + signal.contentHashCode()
+        result = 31 * result + histogram.contentHashCode()
+        return result
+    }
+}
 
 /**
  * 매매 신호
@@ -70,4 +249,18 @@ data class SignalAnalysis(
     val foreignTrend: String,       // 외국인 동향
     val institutionTrend: String,   // 기관 동향
     val recommendation: String      // 투자 권고
-)
\ No newline at end of file
+)
+
+/**
+ * 백그라운드 미리 받기 진행 상황
+ */
+data class PrefetchStatus(
+    val state: String,              // idle / waiting / running
+    val total: Int,                 // 예약된 작업 수
+    val completed: Int,             // 새로 받은 작업 수
+    val skipped: Int,               // 이미 캐시되어 건너뛴 작업 수
+    val failed: Int,                // 실패한 작업 수
+    val queued: Int,                // 대기 중인 작업 수
+    val progress: Double,           // 0.0 ~ 1.0
+    val startAt: String?            // 시작 예정 시각 (장 마감 후 데이터 확정 시각)
+)
@@ -0,0 +1,119 @@
+package com.stockoscillator.data.repository
+
+import com.stockoscillator.data.model.EpochDates
+import com.stockoscillator.data.model.StockData
+import org.json.JSONObject
+import java.nio.ByteBuffer
+import java.nio.ByteOrder
+
+/**
+ * Python bridge_codec 바이너리 페이로드 디코더
+ *
+ * 형식은 bridge_codec.py 모듈 설명 참고 (리틀엔디언, 8바이트 정렬)
+ * 각 열은 행 단위 객체 없이 기본형 배열(IntArray/LongArray)로 바로 읽습니다.
+ */
+object BridgeCodec {
+
+    private const val VERSION = 1
+    private const val STOCK_MAGIC = "SOSC"
+    private const val BATCH_MAGIC = "SOSB"
+
+    /**
+     * 종목 페이로드를 StockData로 디코딩
+     */
+    fun decodeStockData(bytes: ByteArray): StockData =
+        decodeStockData(ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN))
+
+    /**
+     * 배치 페이로드 디코딩
+     *
+     * @return Pair<종목 코드 → StockData, 종목 코드 → 오류 메시지>
+     */
+    fun decodeBatch(bytes: ByteArray): Pair<Map<String, StockData>, Map<String, String>> {
+        val buffer = ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN)
+        checkHeader(buffer, BATCH_MAGIC)
+        val count = buffer.int
+
+        val results = LinkedHashMap<String, StockData>(count)
+        repeat(count) {
+            val length = buffer.int
+            val end = buffer.position() + length
+            val stock = decodeStockData(buffer.slice().order(ByteOrder.LITTLE_ENDIAN))
+            results[stock.ticker] = stock
+            buffer.position(end)
+        }
+
+        val errorsJson = JSONObject(readUtf8(buffer, buffer.int))
+        val errors = mutableMapOf<String, String>()
+        errorsJson.keys().forEach { ticker -> errors[ticker] = errorsJson.getString(ticker) }
+
+        return Pair(results, errors)
+    }
+
+    private fun decodeStockData(buffer: ByteBuffer): StockData {
+        val start = buffer.position()
+        checkHeader(buffer, STOCK_MAGIC)
+        val rows = buffer.int
+        val tickerLength = buffer.short.toInt() and 0xFFFF
+        val nameLength = buffer.short.toInt() and 0xFFFF
+
+        val ticker = readUtf8(buffer, tickerLength)
+        val name = readUtf8(buffer, nameLength)
+        align(buffer, start)
+
+        val dates = readInts(buffer, rows)
+        align(buffer, start)
+
+        val marketCap = readLongs(buffer, rows)
+        val foreign5d = readLongs(buffer, rows)
+        val institution5d = readLongs(buffer, rows)
+
+        return StockData(
+            ticker = ticker,
+            name = name,
+            dates = EpochDates(dates),
+            marketCap = marketCap,
+            foreign5d = foreign5d,
+            institution5d = institution5d
+        )
+    }
+
+    private fun checkHeader(buffer: ByteBuffer, magic: String) {
+        val actual = readAscii(buffer, 4)
+        require(actual == magic) { "잘못된 페이로드입니다: $actual" }
+        val version = buffer.short.toInt() and 0xFFFF
+        require(version == VERSION) { "지원하지 않는 버전입니다: $version" }
+        buffer.short  // reserved
+    }
+
+    private fun align(buffer: ByteBuffer, start: Int) {
+        val offset = buffer.position() - start
+        buffer.position(buffer.position() + (8 - offset % 8) % 8)
+    }
+
+    private fun readInts(buffer: ByteBuffer, count: Int): IntArray {
+        val values = IntArray(count)
+        buffer.asIntBuffer().get(values)
+        buffer.position(buffer.position() + count * 4)
+        return values
+    }
+
+    private fun readLongs(buffer: ByteBuffer, count: Int): LongArray {
+        val values = LongArray(count)
+        buffer.asLongBuffer().get(values)
+        buffer.position(buffer.position() + count * 8)
+        return values
+    }
+
+    private fun readAscii(buffer: ByteBuffer, length: Int): String {
+        val bytes = ByteArray(length)
+        buffer.get(bytes)
+        return String(bytes, Charsets.US_ASCII)
+    }
+
+    private fun readUtf8(buffer: ByteBuffer, length: Int): String {
+        val bytes = ByteArray(length)
+        buffer.get(bytes)
+        return String(bytes, Charsets.UTF_8)
+    }
+}
@@ -1,11 +1,18 @@
 package com.stockoscillator.data.repository
 
 import android.content.Context
+import com.chaquo.python.PyObject
 import com.chaquo.python.Python
 import com.chaquo.python.android.AndroidPlatform
+import com.stockoscillator.data.model.MarketDepositBuffer
 import com.stockoscillator.data.model.MarketDepositData
+import com.stockoscillator.data.model.PrefetchStatus
 import com.stockoscillator.data.model.StockData
+import com.stockoscillator.data.model.StockDataBuffer
 import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.flow.Flow
+import kotlinx.coroutines.flow.flow
+import kotlinx.coroutines.flow.flowOn
 import kotlinx.coroutines.withContext
 import org.json.JSONArray
 import org.json.JSONObject
@@ -25,6 +32,19 @@ class StockRepository(private val context: Context) {
     // 전체 종목 리스트 캐시
     private var allStocksCache: List<Pair<String, String>>? = null
 
+    /**
+     * Python 모듈 미리 불러오기 (pandas, pykrx 등)
+     *
+     * Python 쪽 데몬 스레드에서 import하므로 바로 반환됩니다.
+     */
+    suspend fun warmUp() = withContext(Dispatchers.IO) {
+        try {
+            python.getModule("stock_analyzer").callAttr("warm_up")
+        } catch (e: Exception) {
+            e.printStackTrace()
+        }
+    }
+
     /**
      * 종목 검색
      *
@@ -61,16 +81,20 @@ class StockRepository(private val context: Context) {
             try {
                 if (query.isEmpty()) return@withContext emptyList()
 
-                // 전체 종목 리스트 가져오기 (캐시 사용)
-                val allStocks = getAllStocks()
+                // Python 검색 엔진 (관련도 순, 초성 검색 지원)
+                val module = python.getModule("stock_analyzer")
+                val result = module.callAttr("search_stocks_autocomplete", query, 20).toString()
 
-                // 쿼리로 필터링
-                val filtered = allStocks.filter { (ticker, name) ->
-                    name.contains(query, ignoreCase = true) ||
-                            ticker.contains(query, ignoreCase = true)
-                }.take(20)
+                if (result.trimStart().startsWith("{")) {
+                    // 오류 응답
+                    return@withContext emptyList()
+                }
 
-                filtered
+                val json = JSONArray(result)
+                (0 until json.length()).map { i ->
+                    val item = json.getJSONObject(i)
+                    Pair(item.getString("ticker"), item.getString("name"))
+                }
             } catch (e: Exception) {
                 e.printStackTrace()
                 emptyList()
@@ -118,14 +142,15 @@ class StockRepository(private val context: Context) {
         withContext(Dispatchers.IO) {
             try {
                 val module = python.getModule("stock_analyzer")
-                val result = module.callAttr("get_stock_analysis", ticker, days).toString()
+                val result = module.callAttr("get_stock_analysis", ticker, days, "binary")
 
-                val json = JSONObject(result)
-
-                if (json.has("error")) {
-                    null
+                // 성공 시 바이너리 페이로드, 오류 시 JSON 문자열
+                if (isBytes(result)) {
+                    BridgeCodec.decodeStockData(result.toJava(ByteArray::class.java))
                 } else {
-                    parseStockData(json)
+                    val json = JSONObject(result.toString())
+                    android.util.Log.e("StockRepository", "분석 오류: ${json.optString("error")}")
+                    null
                 }
             } catch (e: Exception) {
                 e.printStackTrace()
@@ -133,6 +158,133 @@ class StockRepository(private val context: Context) {
             }
         }
 
+    /**
+     * 긴 기간 주식 데이터 단계적 수집
+     *
+     * Python 쪽에서 최근 조각부터 과거 방향으로 chunkDays씩 받아 옵니다.
+     * 조각을 받을 때마다 지금까지 받은 구간 전체(날짜 오름차순)를 내보내 과거 데이터가 차례로 채워지게 합니다.
+     * 조각은 기간으로 크기를 정한 StockDataBuffer에 뒤에서부터 채우므로 받은 조각을 다시 이어 붙이지 않고,
+     * 내보낼 때 채운 구간만 한 번 복사합니다.
+     * 수집 실패 시 지금까지 받은 조각으로 끝나며, 첫 조각부터 실패하면 아무것도 내보내지 않습니다.
+     *
+     * @param ticker 종목 코드
+     * @param days 전체 기간
+     * @param chunkDays 조각 길이
+     */
+    fun streamStockData(ticker: String, days: Int = 3650, chunkDays: Int = 180): Flow<StockData> = flow {
+        val module = python.getModule("stock_analyzer")
+        val chunks = module.callAttr("stream_stock_analysis", ticker, days, chunkDays, "binary")
+        // 거래일은 평일 이하이므로 기간의 평일 수로 크기를 정함
+        val buffer = StockDataBuffer((days + 1) * 5 / 7 + 2)
+        try {
+            while (true) {
+                val chunk = nextChunk(chunks) ?: break
+
+                // 성공 시 바이너리 페이로드, 오류 시 JSON 문자열
+                if (!isBytes(chunk)) {
+                    val json = JSONObject(chunk.toString())
+                    android.util.Log.e("StockRepository", "단계적 수집 오류: ${json.optString("error")}")
+                    break
+                }
+
+                buffer.prepend(BridgeCodec.decodeStockData(chunk.toJava(ByteArray::class.java)))
+                emit(buffer.toStockData())
+            }
+        } finally {
+            chunks.callAttr("close")
+        }
+    }.flowOn(Dispatchers.IO)
+
+    /**
+     * 여러 종목 데이터 일괄 수집 (관심종목 새로고침용)
+     *
+     * Python 쪽에서 병렬로 수집하여 한 번의 호출로 결과를 받습니다.
+     *
+     * @param tickers 종목 코드 리스트
+     * @param days 분석 기간
+     * @return 종목 코드 → StockData (실패한 종목은 제외)
+     */
+    suspend fun getStockDataBatch(tickers: List<String>, days: Int = 180): Map<String, StockData> =
+        withContext(Dispatchers.IO) {
+            try {
+                if (tickers.isEmpty()) return@withContext emptyMap()
+
+                val module = python.getModule("stock_analyzer")
+                val result = module.callAttr(
+                    "get_stock_analysis_batch",
+                    JSONArray(tickers).toString(),
+                    days,
+                    "binary"
+                )
+
+                if (!isBytes(result)) {
+                    val json = JSONObject(result.toString())
+                    android.util.Log.e("StockRepository", "배치 분석 오류: ${json.optString("error")}")
+                    return@withContext emptyMap()
+                }
+
+                val (stocks, errors) = BridgeCodec.decodeBatch(result.toJava(ByteArray::class.java))
+                errors.forEach { (ticker, error) ->
+                    android.util.Log.w("StockRepository", "배치 분석 실패: $ticker - $error")
+                }
+                stocks
+            } catch (e: Exception) {
+                e.printStackTrace()
+                emptyMap()
+            }
+        }
+
+    /**
+     * 관심종목/최근 검색 종목 미리 받기 예약
+     *
+     * Python 쪽 백그라운드 스레드가 장 마감 후(데이터 확정 후) 로컬 캐시를 채우므로 바로 반환됩니다.
+     *
+     * @param tickers 종목 코드 리스트 (앞쪽이 먼저)
+     * @param days 미리 받을 기간 (화면에서 조회하는 기간 이상)
+     * @param afterClose false면 바로 시작
+     * @return 예약 직후 진행 상황 or null
+     */
+    suspend fun schedulePrefetch(
+        tickers: List<String>,
+        days: Int = 180,
+        afterClose: Boolean = true
+    ): PrefetchStatus? = withContext(Dispatchers.IO) {
+        try {
+            val module = python.getModule("stock_analyzer")
+            val result = module.callAttr(
+                "schedule_prefetch",
+                JSONArray(tickers).toString(),
+                days,
+                if (afterClose) "after_close" else "now"
+            ).toString()
+
+            val json = JSONObject(result)
+            if (json.has("error")) {
+                android.util.Log.e("StockRepository", "미리 받기 예약 오류: ${json.getString("error")}")
+                null
+            } else {
+                parsePrefetchStatus(json.getJSONObject("status"))
+            }
+        } catch (e: Exception) {
+            e.printStackTrace()
+            null
+        }
+    }
+
+    /**
+     * 미리 받기 진행 상황
+     */
+    suspend fun getPrefetchStatus(): PrefetchStatus? = withContext(Dispatchers.IO) {
+        try {
+            val module = python.getModule("stock_analyzer")
+            val json = JSONObject(module.callAttr("get_prefetch_status").toString())
+            if (json.has("error")) null else parsePrefetchStatus(json)
+        } catch (e: Exception) {
+            e.printStackTrace()
+            null
+        }
+    }
+
     /**
      * 증시 자금 동향 데이터 수집
      *
@@ -167,6 +319,41 @@ class StockRepository(private val context: Context) {
             }
         }
 
+    /**
+     * 증시 자금 동향 단계적 수집
+     *
+     * chunkPages 페이지씩 최근 묶음부터 받아, 묶음을 받을 때마다 지금까지 받은 구간 전체(날짜 오름차순)를 내보냅니다.
+     * 묶음은 첫 묶음의 페이지당 행 수로 크기를 정한 MarketDepositBuffer에 뒤에서부터 채웁니다.
+     *
+     * @param numPages 전체 페이지 수
+     * @param chunkPages 묶음당 페이지 수
+     */
+    fun streamMarketDepositData(numPages: Int = 50, chunkPages: Int = 5): Flow<MarketDepositData> = flow {
+        val module = python.getModule("stock_analyzer")
+        val chunks = module.callAttr("stream_market_deposit_data", numPages, chunkPages)
+        var buffer: MarketDepositBuffer? = null
+        try {
+            while (true) {
+                val json = JSONObject((nextChunk(chunks) ?: break).toString())
+                if (json.has("error")) {
+                    android.util.Log.e("StockRepository", "증시 데이터 단계적 수집 오류: ${json.getString("error")}")
+                    break
+                }
+
+                val chunk = parseMarketDepositData(json)
+                val filled = buffer ?: run {
+                    val firstPages = minOf(chunkPages, numPages).coerceAtLeast(1)
+                    val rowsPerPage = (chunk.dates.size + firstPages - 1) / firstPages
+                    MarketDepositBuffer(rowsPerPage * numPages).also { buffer = it }
+                }
+                filled.prepend(chunk)
+                emit(filled.toMarketDepositData())
+            }
+        } finally {
+            chunks.callAttr("close")
+        }
+    }.flowOn(Dispatchers.IO)
+
     /**
      * 최신 증시 자금 동향
      */
@@ -190,25 +377,17 @@ class StockRepository(private val context: Context) {
         }
 
     /**
-     * JSON을 StockData로 파싱
+     * Python iterator의 다음 조각 (끝나면 null)
      */
-    private fun parseStockData(json: JSONObject): StockData {
-        val ticker = json.getString("ticker")
-        val name = json.getString("name")
-
-        val dates = jsonArrayToStringList(json.getJSONArray("dates"))
-        val marketCap = jsonArrayToLongList(json.getJSONArray("market_cap"))
-        val foreign5d = jsonArrayToLongList(json.getJSONArray("foreign_5d"))
-        val institution5d = jsonArrayToLongList(json.getJSONArray("institution_5d"))
+    private fun nextChunk(chunks: PyObject): PyObject? =
+        python.builtins.callAttr("next", chunks, null)
 
-        return StockData(
-            ticker = ticker,
-            name = name,
-            dates = dates,
-            marketCap = marketCap,
-            foreign5d = foreign5d,
-            institution5d = institution5d
-        )
+    /**
+     * Python 반환값이 bytes(바이너리 페이로드)인지 확인
+     */
+    private fun isBytes(result: PyObject): Boolean {
+        val builtins = python.builtins
+        return builtins.callAttr("isinstance", result, builtins["bytes"]).toBoolean()
     }
 
     /**
@@ -231,17 +410,26 @@ class StockRepository(private val context: Context) {
     }
 
     /**
-     * JSONArray를 String List로 변환
+     * JSON을 PrefetchStatus로 파싱
      */
-    private fun jsonArrayToStringList(array: JSONArray): List<String> {
-        return (0 until array.length()).map { array.getString(it) }
+    private fun parsePrefetchStatus(json: JSONObject): PrefetchStatus {
+        return PrefetchStatus(
+            state = json.getString("state"),
+            total = json.getInt("total"),
+            completed = json.getInt("completed"),
+            skipped = json.getInt("skipped"),
+            failed = json.getInt("failed"),
+            queued = json.getInt("queued"),
+            progress = json.getDouble("progress"),
+            startAt = if (json.isNull("start_at")) null else json.getString("start_at")
+        )
     }
 
     /**
-     * JSONArray를 Long List로 변환
+     * JSONArray를 String List로 변환
      */
-    private fun jsonArrayToLongList(array: JSONArray): List<Long> {
-        return (0 until array.length()).map { array.getLong(it) }
+    private fun jsonArrayToStringList(array: JSONArray): List<String> {
+        return (0 until array.length()).map { array.getString(it) }
     }
 
     /**
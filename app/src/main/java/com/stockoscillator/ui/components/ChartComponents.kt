@@ -29,7 +29,7 @@ import android.util.Log
 @Composable
 fun MarketCapOscillatorChart(
     result: OscillatorResult,
-    marketCap: List<Long>,
+    marketCap: LongArray,
     latestDate: String? = null,
     modifier: Modifier = Modifier
 ) {
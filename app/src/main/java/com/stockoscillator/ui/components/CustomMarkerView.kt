@@ -8,6 +8,7 @@ import com.github.mikephil.charting.data.Entry
 import com.github.mikephil.charting.highlight.Highlight
 import com.github.mikephil.charting.utils.MPPointF
 import com.stockoscillator.R
+import com.stockoscillator.data.model.EpochDates
 
 private const val TAG = "CustomMarkerView"
 
@@ -89,7 +90,7 @@ class CustomMarkerView(
 class MarketCapMarkerView(
     context: Context,
     layoutResource: Int,
-    private val dates: List<String>,
+    private val dates: EpochDates,
     private val valueType: ValueType = ValueType.CURRENCY
 ) : MarkerView(context, layoutResource) {
 
@@ -206,9 +207,9 @@ class MarketCapMarkerView(
 class MacdMarkerView(
     context: Context,
     layoutResource: Int,
-    private val dates: List<String>,
-    private val macdValues: List<Double>,
-    private val signalValues: List<Double>
+    private val dates: EpochDates,
+    private val macdValues: DoubleArray,
+    private val signalValues: DoubleArray
 ) : MarkerView(context, layoutResource) {
 
     private var tvDate: TextView? = null
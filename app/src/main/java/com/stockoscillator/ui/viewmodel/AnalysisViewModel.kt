@@ -182,6 +182,19 @@ class AnalysisViewModel(application: Application) : AndroidViewModel(application
                 _marketAnalysis.value = ""
                 _latestMarketDataDate.value = null
 
+                // 페이지가 많으면 최근 묶음부터 받아 과거 데이터를 단계적으로 채움
+                if (numPages > STREAM_CHUNK_PAGES) {
+                    var received = false
+                    repository.streamMarketDepositData(numPages, STREAM_CHUNK_PAGES).collect { marketData ->
+                        received = true
+                        showMarketData(marketData)
+                    }
+                    if (!received) {
+                        _marketUiState.value = UiState.Error("증시 데이터를 불러올 수 없습니다. 네트워크 연결을 확인하거나 나중에 다시 시도해주세요.")
+                    }
+                    return@launch
+                }
+
                 // 증시 자금 동향 데이터 수집
                 val marketData = repository.getMarketDepositData(numPages)
 
@@ -199,19 +212,7 @@ class AnalysisViewModel(application: Application) : AndroidViewModel(application
                     return@launch
                 }
 
-                android.util.Log.d("AnalysisViewModel", "데이터 개수: ${marketData.dates.size}")
-
-                // 최신 데이터 날짜 저장
-                _latestMarketDataDate.value = marketData.dates.lastOrNull()
-
-                // 분석 수행
-                val analysis = OscillatorCalculator.analyzeMarketDeposit(marketData)
-                _marketAnalysis.value = analysis
-
-                android.util.Log.d("AnalysisViewModel", "분석 완료: $analysis")
-
-                // UI 업데이트
-                _marketUiState.value = UiState.Success(marketData)
+                showMarketData(marketData)
 
             } catch (e: Exception) {
                 android.util.Log.e("AnalysisViewModel", "증시 분석 중 오류", e)
@@ -226,6 +227,25 @@ class AnalysisViewModel(application: Application) : AndroidViewModel(application
         }
     }
 
+    /**
+     * 증시 자금 동향 분석 후 UI 업데이트
+     */
+    private fun showMarketData(marketData: MarketDepositData) {
+        android.util.Log.d("AnalysisViewModel", "데이터 개수: ${marketData.dates.size}")
+
+        // 최신 데이터 날짜 저장
+        _latestMarketDataDate.value = marketData.dates.lastOrNull()
+
+        // 분석 수행
+        val analysis = OscillatorCalculator.analyzeMarketDeposit(marketData)
+        _marketAnalysis.value = analysis
+
+        android.util.Log.d("AnalysisViewModel", "분석 완료: $analysis")
+
+        // UI 업데이트
+        _marketUiState.value = UiState.Success(marketData)
+    }
+
     /**
      * 투자자별 수급 데이터 계산
      */
@@ -322,4 +342,9 @@ class AnalysisViewModel(application: Application) : AndroidViewModel(application
         // Flow는 자동으로 취소되므로 별도 정리 불필요
         android.util.Log.d("AnalysisViewModel", "ViewModel cleared")
     }
+
+    companion object {
+        // 이 페이지 수보다 많으면 이 크기 묶음으로 나누어 최근 묶음부터 표시
+        private const val STREAM_CHUNK_PAGES = 5
+    }
 }
\ No newline at end of file
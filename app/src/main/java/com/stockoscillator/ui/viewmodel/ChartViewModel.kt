@@ -6,6 +6,7 @@ import androidx.lifecycle.viewModelScope
 import com.stockoscillator.data.calculator.OscillatorCalculator
 import com.stockoscillator.data.model.OscillatorResult
 import com.stockoscillator.data.model.SignalAnalysis
+import com.stockoscillator.data.model.StockData
 import com.stockoscillator.data.model.UiState
 import com.stockoscillator.data.repository.SearchHistoryRepository
 import com.stockoscillator.data.repository.StockRepository
@@ -54,6 +55,15 @@ class ChartViewModel(application: Application) : AndroidViewModel(application) {
     val autocompleteSuggestions: StateFlow<List<Pair<String, String>>> = _autocompleteSuggestions.asStateFlow()
 
     init {
+        // 첫 검색/조회 전에 Python 모듈을 백그라운드에서 미리 불러오기
+        viewModelScope.launch {
+            repository.warmUp()
+
+            // 최근 검색 종목은 장 마감 후 미리 받아 두어 다시 열 때 캐시에서 바로 표시
+            val recentTickers = historyRepository.searchHistory.value.map { it.ticker }
+            repository.schedulePrefetch(recentTickers)
+        }
+
         // ✅ 개선: Flow 기반 자동완성 처리
         viewModelScope.launch {
             searchQueryFlow
@@ -121,7 +131,19 @@ class ChartViewModel(application: Application) : AndroidViewModel(application) {
                 // 검색 기록 추가
                 historyRepository.addSearchHistory(stockInfo.first, stockInfo.second)
 
-                // 2. 데이터 수집
+                // 2. 데이터 수집 (여러 해 기간은 최근 구간부터 받아 과거 데이터를 단계적으로 채움)
+                if (days > STREAM_MIN_DAYS) {
+                    var received = false
+                    repository.streamStockData(stockInfo.first, days, STREAM_CHUNK_DAYS).collect { stockData ->
+                        received = true
+                        showStockData(stockData)
+                    }
+                    if (!received) {
+                        _uiState.value = UiState.Error("데이터를 불러올 수 없습니다")
+                    }
+                    return@launch
+                }
+
                 val stockData = repository.getStockData(stockInfo.first, days)
                 if (stockData == null) {
                     _uiState.value = UiState.Error("데이터를 불러올 수 없습니다")
@@ -133,18 +155,7 @@ class ChartViewModel(application: Application) : AndroidViewModel(application) {
                     return@launch
                 }
 
-                // 최신 데이터 날짜 저장
-                _latestDataDate.value = stockData.dates.lastOrNull()
-
-                // 3. 오실레이터 계산
-                val result = OscillatorCalculator.calculate(stockData)
-
-                // 4. 매매 신호 분석
-                val analysis = OscillatorCalculator.analyzeSignal(result)
-                _analysisResult.value = analysis
-
-                // 5. UI 업데이트
-                _uiState.value = UiState.Success(result)
+                showStockData(stockData)
 
             } catch (e: Exception) {
                 android.util.Log.e("ChartViewModel", "분석 중 오류", e)
@@ -160,6 +171,24 @@ class ChartViewModel(application: Application) : AndroidViewModel(application) {
         }
     }
 
+    /**
+     * 오실레이터 계산, 매매 신호 분석 후 UI 업데이트
+     */
+    private fun showStockData(stockData: StockData) {
+        // 최신 데이터 날짜 저장
+        _latestDataDate.value = stockData.dates.lastOrNull()
+
+        // 3. 오실레이터 계산
+        val result = OscillatorCalculator.calculate(stockData)
+
+        // 4. 매매 신호 분석
+        val analysis = OscillatorCalculator.analyzeSignal(result)
+        _analysisResult.value = analysis
+
+        // 5. UI 업데이트
+        _uiState.value = UiState.Success(result)
+    }
+
     /**
      * 검색 기록에서 항목 선택
      */
@@ -198,4 +227,13 @@ class ChartViewModel(application: Application) : AndroidViewModel(application) {
         // Flow는 자동으로 취소되므로 별도 정리 불필요
         android.util.Log.d("ChartViewModel", "ViewModel cleared")
     }
+
+    companion object {
+        // 이 기간보다 긴(여러 해) 분석만 조각으로 나누어 최근 구간부터 표시
+        // (1년 이하는 한 번에 받아 Python 쪽 요청 병합/결과 캐시를 그대로 사용)
+        private const val STREAM_MIN_DAYS = 730
+
+        // 단계적 표시 조각 길이 (일)
+        private const val STREAM_CHUNK_DAYS = 180
+    }
 }
\ No newline at end of file
@@ -0,0 +1,394 @@
+"""
+시장 전체 과거 데이터 백필 모듈
+KOSPI/KOSDAQ 전 종목의 원본 일별 데이터(시가총액, 투자자별 거래대금)를
+여러 프로세스로 나누어 timeseries_cache에 미리 채웁니다.
+
+- 작업 단위: 종목 × 기간 조각(chunk_days). 한 종목의 조각은 최근 구간부터 과거 방향으로
+  순서대로 받아 캐시 범위(coverage)가 끊기지 않게 유지
+- 모든 프로세스가 하나의 요청 속도 예산(SharedRateLimiter)을 나눠 씀 (재시도/헤지 포함)
+- 진행 상황은 backfill.db에 조각 단위로 기록 → 중단 후 같은 명령으로 다시 실행하면 이어서 수집
+- 상장 전 구간(조각 결과가 비어 있음)을 만나면 그 종목의 더 과거 조각은 건너뜀
+- 롤링 합계 등 파생 값은 저장하지 않음 (원본만 저장, 5일 합계는 조회 시 재계산)
+
+사용법:
+    python backfill.py --years 10                       # 전체 종목 10년
+    python backfill.py --years 10 --workers 6 --rate 8  # 프로세스 수 / 초당 요청 수
+    python backfill.py --status                         # 진행 상황
+"""
+
+import json
+import multiprocessing
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from local_store import connect
+
+DB_NAME = "backfill.db"
+
+DEFAULT_WORKERS = 4
+# 모든 프로세스 합계 초당 요청 수 (조각 하나에 pykrx 요청 2회)
+DEFAULT_RATE = 8.0
+DEFAULT_CHUNK_DAYS = 730
+
+_DATE_FMT = "%Y-%m-%d"
+
+STATUSES = ("pending", "done", "skipped", "failed")
+
+
+class SharedRateLimiter:
+    """
+    여러 프로세스가 공유하는 토큰 버킷 (deposit_scraper.RateLimiter와 같은 방식)
+
+    토큰 수와 갱신 시각을 공유 메모리(multiprocessing.Value)에 두므로
+    프로세스 풀 initializer 인자로 넘겨 자식 프로세스에서 같은 예산을 씁니다.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = multiprocessing.Value("d", self.capacity, lock=False)
+        self._updated = multiprocessing.Value("d", time.time(), lock=False)
+        self._lock = multiprocessing.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.time()
+                tokens = min(self.capacity, self._tokens.value + (now - self._updated.value) * self.rate)
+                self._updated.value = now
+                if tokens >= 1.0:
+                    self._tokens.value = tokens - 1.0
+                    return
+                self._tokens.value = tokens
+                wait = (1.0 - tokens) / self.rate
+            time.sleep(wait)
+
+
+def _ensure_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "run_id TEXT PRIMARY KEY, start TEXT NOT NULL, end TEXT NOT NULL, "
+        "chunk_days INTEGER NOT NULL, created_at REAL NOT NULL, finished_at REAL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tasks ("
+        "run_id TEXT NOT NULL, ticker TEXT NOT NULL, chunk_start TEXT NOT NULL, "
+        "chunk_end TEXT NOT NULL, status TEXT NOT NULL, rows INTEGER DEFAULT 0, "
+        "error TEXT, updated_at REAL, PRIMARY KEY (run_id, ticker, chunk_start))"
+    )
+
+
+def _connect():
+    conn = connect(DB_NAME)
+    _ensure_schema(conn)
+    return conn
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).replace("-", ""), "%Y%m%d").date()
+
+
+def make_chunks(start, end, chunk_days=DEFAULT_CHUNK_DAYS):
+    """
+    [start, end]를 chunk_days 길이 조각으로 나눔 (최근 조각부터)
+
+    Returns:
+        list: [(chunk_start, chunk_end), ...] (date)
+    """
+    chunks = []
+    chunk_end = end
+    while chunk_end >= start:
+        chunk_start = max(start, chunk_end - timedelta(days=chunk_days - 1))
+        chunks.append((chunk_start, chunk_end))
+        chunk_end = chunk_start - timedelta(days=1)
+    return chunks
+
+
+def default_run_id(start, end, chunk_days=DEFAULT_CHUNK_DAYS):
+    """같은 구간/조각 크기로 다시 실행하면 같은 run_id → 이어서 수집"""
+    return f"{start:%Y%m%d}-{end:%Y%m%d}-{chunk_days}"
+
+
+def plan(tickers, start, end, chunk_days=DEFAULT_CHUNK_DAYS, run_id=None):
+    """
+    백필 작업 등록 (이미 등록된 조각은 상태 유지)
+
+    Returns:
+        str: run_id
+    """
+    start, end = _as_date(start), _as_date(end)
+    run_id = run_id or default_run_id(start, end, chunk_days)
+    chunks = make_chunks(start, end, chunk_days)
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, start, end, chunk_days, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, start.strftime(_DATE_FMT), end.strftime(_DATE_FMT), chunk_days, time.time())
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, ticker, chunk_start, chunk_end, status) "
+                "VALUES (?, ?, ?, ?, 'pending')",
+                [(run_id, ticker, s.strftime(_DATE_FMT), e.strftime(_DATE_FMT))
+                 for ticker in tickers for s, e in chunks]
+            )
+    finally:
+        conn.close()
+    return run_id
+
+
+def _pending(conn, run_id, retry_failed=True):
+    """
+    종목별 남은 조각 (최근 조각부터)
+
+    Returns:
+        dict: {ticker: [(chunk_start, chunk_end), ...]}
+    """
+    statuses = ("pending", "failed") if retry_failed else ("pending",)
+    rows = conn.execute(
+        f"SELECT ticker, chunk_start, chunk_end FROM tasks "
+        f"WHERE run_id = ? AND status IN ({', '.join('?' * len(statuses))}) "
+        f"ORDER BY ticker, chunk_start DESC",
+        (run_id, *statuses)
+    ).fetchall()
+
+    pending = {}
+    for ticker, chunk_start, chunk_end in rows:
+        pending.setdefault(ticker, []).append((chunk_start, chunk_end))
+    return pending
+
+
+def _mark(conn, run_id, ticker, chunk_start, status, rows=0, error=None):
+    with conn:
+        conn.execute(
+            "UPDATE tasks SET status = ?, rows = ?, error = ?, updated_at = ? "
+            "WHERE run_id = ? AND ticker = ? AND chunk_start = ?",
+            (status, rows, error, time.time(), run_id, ticker, chunk_start)
+        )
+
+
+def _init_worker(limiter):
+    """자식 프로세스 초기화: 공유 요청 속도 예산을 KRX 호출에 연결"""
+    import resilient_fetch
+
+    resilient_fetch.set_rate_limiter("krx", limiter)
+
+
+def _backfill_ticker(run_id, ticker, chunks):
+    """
+    한 종목의 남은 조각을 최근 조각부터 순서대로 수집 (조각마다 진행 상황 기록)
+
+    수집 실패 시 그 종목의 나머지 조각은 다음 실행으로 미룹니다
+    (더 과거 조각을 먼저 받으면 캐시 범위가 끊기므로).
+
+    Returns:
+        dict: {"ticker", "done", "skipped", "failed", "rows", "error"}
+    """
+    from timeseries_cache import ensure_range, is_cached
+
+    result = {"ticker": ticker, "done": 0, "skipped": 0, "failed": 0, "rows": 0, "error": None}
+    conn = _connect()
+    try:
+        for i, (chunk_start, chunk_end) in enumerate(chunks):
+            start, end = _as_date(chunk_start), _as_date(chunk_end)
+            cached = is_cached(ticker, start, end)
+            try:
+                rows = 0 if cached else ensure_range(ticker, start, end, allow_stale=False)
+            except Exception as e:
+                result["failed"] += 1
+                result["error"] = str(e)
+                _mark(conn, run_id, ticker, chunk_start, "failed", error=str(e))
+                print(f"[backfill] {ticker} {chunk_start} ~ {chunk_end} 실패: {e}", file=sys.stderr)
+                break
+
+            result["done"] += 1
+            result["rows"] += rows
+            _mark(conn, run_id, ticker, chunk_start, "done", rows)
+
+            if not cached and rows == 0:
+                # 받아 온 조각이 비어 있으면 상장 전 구간: 더 과거 조각은 받을 것이 없음
+                for skip_start, _ in chunks[i + 1:]:
+                    _mark(conn, run_id, ticker, skip_start, "skipped")
+                result["skipped"] += len(chunks) - i - 1
+                break
+    finally:
+        conn.close()
+    return result
+
+
+def run(tickers=None, start=None, end=None, years=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+        chunk_days=DEFAULT_CHUNK_DAYS, run_id=None, retry_failed=True, to_store=False, progress=None):
+    """
+    백필 실행 (중단된 run_id는 남은 조각부터 이어서 수집)
+
+    Args:
+        tickers: 종목 코드 목록 (None이면 ticker_index의 KOSPI/KOSDAQ 전체)
+        start, end: 수집 구간 (None이면 end=직전 거래일, start=end - years년)
+        years: start가 없을 때 수집 기간 (년, 기본 5)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        rate: 모든 프로세스 합계 초당 KRX 요청 수
+        chunk_days: 조각 길이 (일)
+        run_id: 이어서 실행할 작업 ID (None이면 구간/조각 크기로 결정)
+        retry_failed: 실패한 조각도 다시 시도
+        to_store: 완료 후 universe_store(메모리 매핑 저장소)에도 반영
+        progress: progress(완료 종목 수, 전체 종목 수) 콜백
+
+    Returns:
+        dict: {"run_id", "tickers", "done", "skipped", "failed", "rows", "elapsed", "errors": {ticker: 오류}}
+    """
+    import trading_calendar
+
+    # 영업일 달력과 종목 목록은 프로세스 풀을 만들기 전에 한 번만 준비 (자식 프로세스가 물려받음)
+    end = _as_date(end) if end else trading_calendar.last_trading_day()
+    start = _as_date(start) if start else end - timedelta(days=int(365.25 * (years or 5)))
+    trading_calendar.trading_days(start, end)
+
+    if tickers is None:
+        from ticker_index import get_ticker_index
+        tickers = [r["ticker"] for r in get_ticker_index().records]
+    tickers = list(dict.fromkeys(tickers))
+
+    run_id = plan(tickers, start, end, chunk_days, run_id)
+    conn = _connect()
+    try:
+        pending = _pending(conn, run_id, retry_failed)
+    finally:
+        conn.close()
+
+    print(f"[backfill] {run_id}: {len(pending)}/{len(tickers)}개 종목 남음 "
+          f"({sum(len(c) for c in pending.values())}개 조각)", file=sys.stderr)
+
+    summary = {"run_id": run_id, "tickers": len(pending), "done": 0, "skipped": 0, "failed": 0,
+               "rows": 0, "elapsed": 0.0, "errors": {}}
+    started = time.time()
+    finished = 0
+
+    def collect(result):
+        nonlocal finished
+        for key in ("done", "skipped", "failed", "rows"):
+            summary[key] += result[key]
+        if result["error"]:
+            summary["errors"][result["ticker"]] = result["error"]
+        finished += 1
+        if progress is not None:
+            progress(finished, len(pending))
+
+    limiter = SharedRateLimiter(rate)
+    if workers <= 1 or len(pending) <= 1:
+        _init_worker(limiter)
+        try:
+            for ticker, chunks in pending.items():
+                collect(_backfill_ticker(run_id, ticker, chunks))
+        finally:
+            import resilient_fetch
+            resilient_fetch.set_rate_limiter("krx", None)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 initializer=_init_worker, initargs=(limiter,)) as pool:
+            futures = [pool.submit(_backfill_ticker, run_id, ticker, chunks)
+                       for ticker, chunks in pending.items()]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    if to_store:
+        import universe_store
+        universe_store.import_from_cache(tickers, start, end)
+
+    summary["elapsed"] = round(time.time() - started, 1)
+    if not summary["failed"]:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+        finally:
+            conn.close()
+
+    print(f"[backfill] {run_id} 완료: 조각 {summary['done']}개, 건너뜀 {summary['skipped']}개, "
+          f"실패 {summary['failed']}개, {summary['rows']}행, {summary['elapsed']}초", file=sys.stderr)
+    return summary
+
+
+def status(run_id=None):
+    """
+    백필 진행 상황 (run_id가 없으면 가장 최근 작업)
+
+    Returns:
+        dict: {"run_id", "start", "end", "chunk_days", "finished", "counts": {상태: 조각 수},
+               "rows", "progress"} 또는 None
+    """
+    conn = _connect()
+    try:
+        if run_id is None:
+            row = conn.execute(
+                "SELECT run_id, start, end, chunk_days, finished_at FROM runs "
+                "ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT run_id, start, end, chunk_days, finished_at FROM runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        counts = dict.fromkeys(STATUSES, 0)
+        rows = 0
+        for task_status, n, total_rows in conn.execute(
+            "SELECT status, COUNT(*), SUM(rows) FROM tasks WHERE run_id = ? GROUP BY status", (row[0],)
+        ):
+            counts[task_status] = n
+            rows += total_rows or 0
+    finally:
+        conn.close()
+
+    total = sum(counts.values())
+    return {
+        "run_id": row[0],
+        "start": row[1],
+        "end": row[2],
+        "chunk_days": row[3],
+        "finished": row[4] is not None,
+        "counts": counts,
+        "rows": rows,
+        "progress": (counts["done"] + counts["skipped"]) / total if total else 1.0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="시장 전체 과거 데이터 백필")
+    parser.add_argument("--tickers", nargs="+", help="종목 코드 (없으면 전체 종목)")
+    parser.add_argument("--start", help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", help="종료일 (YYYY-MM-DD, 기본: 직전 거래일)")
+    parser.add_argument("--years", type=float, default=5, help="start가 없을 때 수집 기간 (년)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="프로세스 수")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="초당 KRX 요청 수 (전체 합계)")
+    parser.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS, help="조각 길이 (일)")
+    parser.add_argument("--run-id", help="이어서 실행할 작업 ID")
+    parser.add_argument("--to-store", action="store_true", help="완료 후 universe_store에 반영")
+    parser.add_argument("--status", action="store_true", help="진행 상황만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        print(json.dumps(status(args.run_id), ensure_ascii=False, indent=2))
+        sys.exit(0)
+
+    def report(done, total):
+        if done == total or done % 50 == 0:
+            print(f"{done}/{total}개 종목", file=sys.stderr)
+
+    summary = run(args.tickers, args.start, args.end, args.years, args.workers, args.rate,
+                  args.chunk_days, args.run_id, to_store=args.to_store, progress=report)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    sys.exit(1 if summary["failed"] else 0)
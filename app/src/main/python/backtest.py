@@ -0,0 +1,485 @@
+"""
+매매 신호 백테스트 모듈 (NumPy)
+Kotlin OscillatorCalculator.analyzeSignal의 점수(-100 ~ +100)와 TradeSignal 구간을
+마지막 봉 하나가 아닌 모든 봉에 대해 벡터 연산으로 계산하고, 진입/청산을 모의 실행합니다.
+
+점수 규칙 (analyzeSignal과 동일, i번째 봉까지의 데이터만 사용):
+- 최근 5봉 오실레이터 평균: > strong +40, > weak +20, < -strong -40, < -weak -20
+- MACD - Signal: 골든크로스 +30, 데드크로스 -30, 양수 +15, 그 외 -15
+- 최근 3봉 히스토그램: 모두 양수이고 상승 +30, 모두 음수이고 하락 -30
+- 구간: >= 60 STRONG_BUY, >= 20 BUY, <= -60 STRONG_SELL, <= -20 SELL, 그 외 NEUTRAL
+
+수익률은 가격 대신 시가총액 변화로 계산합니다 (증자/감자가 있는 구간은 오차가 생길 수 있음).
+종목 여러 개는 프로세스 풀에서 나누어 계산하며, 종목당 데이터는 한 번만 읽고 모든 파라미터 조합에 재사용합니다.
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+
+from oscillator_engine import (
+    MACD_FAST, MACD_SLOW, ROLLING_DAYS, SIGNAL_PERIOD, calculate_ema, calculate_oscillator
+)
+
+# TradeSignal 코드 (배열에는 정수로 저장)
+STRONG_SELL, SELL, NEUTRAL, BUY, STRONG_BUY = -2, -1, 0, 1, 2
+SIGNAL_NAMES = {
+    STRONG_SELL: "STRONG_SELL",
+    SELL: "SELL",
+    NEUTRAL: "NEUTRAL",
+    BUY: "BUY",
+    STRONG_BUY: "STRONG_BUY",
+}
+
+# analyzeSignal은 최근 3봉 히스토그램을 보므로 그 전 봉은 점수 없음 (NaN)
+MIN_BARS = 3
+
+DEFAULT_PARAMS = {
+    "weak_threshold": 0.2,
+    "strong_threshold": 0.5,
+    "macd_fast": MACD_FAST,
+    "macd_slow": MACD_SLOW,
+    "signal_period": SIGNAL_PERIOD,
+    "entry_score": 20.0,   # BUY 이상이면 진입
+    "exit_score": -20.0,   # SELL 이하이면 청산
+    "delay": 1,            # 신호 봉 종가 다음 봉 종가에 체결 (장 마감 후 확정되는 수급 데이터)
+}
+
+PARAM_KEYS = tuple(DEFAULT_PARAMS)
+
+# 구간별 선행 수익률 기간 (거래일)
+HORIZONS = (5, 20)
+
+
+# --- 점수 ---
+
+def _recent_mean(values, window=ROLLING_DAYS):
+    """
+    봉마다 최근 window개(앞부분은 있는 만큼)의 평균
+
+    Kotlin takeLast(n).average()와 같은 순서로 더해 같은 값을 냅니다.
+    """
+    n = len(values)
+    mean = np.empty(n, dtype=np.float64)
+    head = min(window - 1, n)
+    # 앞부분: 누적합은 순차 합계 (np.add.accumulate)
+    mean[:head] = np.cumsum(values[:head]) / np.arange(1, head + 1)
+    if n >= window:
+        total = values[:n - window + 1].copy()
+        for k in range(1, window):
+            total += values[k:n - window + 1 + k]
+        mean[window - 1:] = total / window
+    return mean
+
+
+def score_series(oscillator, macd, signal, histogram,
+                 weak_threshold=0.2, strong_threshold=0.5):
+    """
+    모든 봉의 analyzeSignal 점수
+
+    Returns:
+        ndarray: float64 점수 (앞 MIN_BARS-1개는 NaN)
+    """
+    oscillator = np.asarray(oscillator, dtype=np.float64)
+    n = len(oscillator)
+    score = np.full(n, np.nan)
+    if n < MIN_BARS:
+        return score
+
+    # 1. 오실레이터 평균 (±40)
+    avg = _recent_mean(oscillator)
+    osc_score = np.select(
+        [avg > strong_threshold, avg > weak_threshold, avg < -strong_threshold, avg < -weak_threshold],
+        [40.0, 20.0, -40.0, -20.0],
+        0.0
+    )
+
+    # 2. MACD 크로스 (±30 / ±15)
+    cross = np.asarray(macd, dtype=np.float64) - np.asarray(signal, dtype=np.float64)
+    prev = np.empty_like(cross)
+    prev[0] = np.nan
+    prev[1:] = cross[:-1]
+    cross_score = np.select(
+        [(cross > 0) & (prev <= 0), (cross < 0) & (prev >= 0), cross > 0],
+        [30.0, -30.0, 15.0],
+        -15.0
+    )
+
+    # 3. 히스토그램 추세 (±30)
+    histogram = np.asarray(histogram, dtype=np.float64)
+    h0, h1, h2 = histogram[:-2], histogram[1:-1], histogram[2:]
+    trend_score = np.zeros(n, dtype=np.float64)
+    trend_score[2:] = np.select(
+        [(h0 > 0) & (h1 > 0) & (h2 > 0) & (h2 > h0), (h0 < 0) & (h1 < 0) & (h2 < 0) & (h2 < h0)],
+        [30.0, -30.0],
+        0.0
+    )
+
+    score[MIN_BARS - 1:] = (osc_score + cross_score + trend_score)[MIN_BARS - 1:]
+    return np.clip(score, -100.0, 100.0)
+
+
+def classify(score):
+    """
+    점수 → TradeSignal 코드 (NaN은 NEUTRAL)
+
+    Returns:
+        ndarray: int8 코드 (STRONG_SELL ~ STRONG_BUY)
+    """
+    score = np.asarray(score, dtype=np.float64)
+    return np.select(
+        [score >= 60, score >= 20, score <= -60, score <= -20],
+        [STRONG_BUY, BUY, STRONG_SELL, SELL],
+        NEUTRAL
+    ).astype(np.int8)
+
+
+class _Indicators:
+    """한 종목의 오실레이터와 기간별 EMA/MACD (파라미터 조합 사이에 재사용)"""
+
+    def __init__(self, oscillator):
+        self.oscillator = oscillator
+        self._ema = {}
+        self._macd = {}
+
+    def ema(self, period):
+        values = self._ema.get(period)
+        if values is None:
+            values = self._ema[period] = calculate_ema(self.oscillator, period)
+        return values
+
+    def macd(self, fast, slow, signal_period):
+        key = (fast, slow, signal_period)
+        cached = self._macd.get(key)
+        if cached is None:
+            macd = self.ema(fast) - self.ema(slow)
+            signal = calculate_ema(macd, signal_period)
+            cached = self._macd[key] = (macd, signal, macd - signal)
+        return cached
+
+    def score(self, params):
+        macd, signal, histogram = self.macd(
+            params["macd_fast"], params["macd_slow"], params["signal_period"]
+        )
+        return score_series(self.oscillator, macd, signal, histogram,
+                            params["weak_threshold"], params["strong_threshold"])
+
+
+# --- 모의 매매 ---
+
+def _shift(values, k, fill):
+    """values를 k칸 뒤로 밀고 앞을 fill로 채움"""
+    if k <= 0:
+        return values
+    out = np.empty_like(values)
+    out[:k] = fill
+    out[k:] = values[:-k] if k < len(values) else fill
+    return out
+
+
+def positions(score, entry_score=20.0, exit_score=-20.0, delay=1):
+    """
+    봉별 보유 여부 (1 = 해당 봉 종가에 보유 중)
+
+    진입 신호(score >= entry_score) 뒤 첫 청산 신호(score <= exit_score)까지 보유하며,
+    신호는 delay봉 뒤 종가에 체결됩니다. 상태 전이는 마지막 신호를 앞으로 채워(ffill) 계산합니다.
+
+    Returns:
+        ndarray: int8
+    """
+    score = np.asarray(score, dtype=np.float64)
+    events = np.where(score >= entry_score, 1, np.where(score <= exit_score, -1, 0))
+    idx = np.where(events != 0, np.arange(len(events)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    state = np.where(idx >= 0, events[np.maximum(idx, 0)], -1)
+    held = (state == 1).astype(np.int8)
+    return _shift(held, delay, 0)
+
+
+def simulate(score, market_cap, entry_score=20.0, exit_score=-20.0, delay=1):
+    """
+    진입/청산 모의 실행
+
+    Returns:
+        dict: {"trades", "wins", "hit_rate", "mean_return", "total_return",
+               "buy_hold_return", "exposure", "avg_holding_bars", "open"}
+               (수익률은 비율, 0.05 = 5%)
+    """
+    mcap = np.asarray(market_cap, dtype=np.float64)
+    n = len(mcap)
+    held = positions(score, entry_score, exit_score, delay)
+
+    # 일별 수익률 (시가총액 0 이하 봉은 0으로)
+    daily = np.zeros(n, dtype=np.float64)
+    if n > 1:
+        valid = (mcap[1:] > 0) & (mcap[:-1] > 0)
+        np.divide(mcap[1:], mcap[:-1], out=daily[1:], where=valid)
+        daily[1:] = np.where(valid, daily[1:] - 1.0, 0.0)
+
+    # 보유 구간: 진입 봉 종가에 매수 → 이후 봉의 수익률을 받음
+    edges = np.diff(held, prepend=0, append=0)
+    entries = np.flatnonzero(edges == 1)
+    exits = np.flatnonzero(edges == -1)  # 보유 마지막 봉 다음 (청산 체결 봉)
+    is_open = len(exits) > 0 and exits[-1] == n
+    exits = np.minimum(exits, n - 1)
+
+    growth = np.cumprod(1.0 + daily)
+    trade_returns = growth[exits] / growth[entries] - 1.0 if len(entries) else np.empty(0)
+    wins = int(np.count_nonzero(trade_returns > 0))
+    trades = len(trade_returns)
+
+    strategy = _shift(held, 1, 0) * daily
+    valid_caps = mcap[mcap > 0]
+    return {
+        "trades": trades,
+        "wins": wins,
+        "hit_rate": wins / trades if trades else None,
+        "mean_return": float(trade_returns.mean()) if trades else None,
+        "total_return": float(np.prod(1.0 + strategy) - 1.0),
+        "buy_hold_return": float(valid_caps[-1] / valid_caps[0] - 1.0) if len(valid_caps) > 1 else 0.0,
+        "exposure": float(held.mean()) if n else 0.0,
+        "avg_holding_bars": float((exits - entries).mean()) if trades else None,
+        "open": bool(is_open),
+    }
+
+
+def forward_returns(market_cap, horizon):
+    """h봉 뒤 수익률 (끝부분, 시가총액 0 이하는 NaN)"""
+    mcap = np.asarray(market_cap, dtype=np.float64)
+    out = np.full(len(mcap), np.nan)
+    if len(mcap) > horizon:
+        base, later = mcap[:-horizon], mcap[horizon:]
+        valid = (base > 0) & (later > 0)
+        np.divide(later, base, out=out[:-horizon], where=valid)
+        out[:-horizon] = np.where(valid, out[:-horizon] - 1.0, np.nan)
+    return out
+
+
+def bucket_stats(signals, market_cap, score=None, horizons=HORIZONS):
+    """
+    TradeSignal 구간별 선행 수익률 통계
+
+    적중 = 매수 구간은 이후 상승, 매도 구간은 이후 하락, NEUTRAL은 집계만 합니다.
+
+    Returns:
+        dict: {"BUY": {"bars": n, "5d": {"mean": ..., "hit_rate": ...}, ...}, ...}
+    """
+    signals = np.asarray(signals)
+    scored = np.ones(len(signals), dtype=bool) if score is None else ~np.isnan(score)
+    forward = {h: forward_returns(market_cap, h) for h in horizons}
+
+    stats = {}
+    for code, name in SIGNAL_NAMES.items():
+        mask = scored & (signals == code)
+        entry = {"bars": int(np.count_nonzero(mask))}
+        for h, values in forward.items():
+            selected = values[mask & ~np.isnan(values)]
+            if len(selected) == 0:
+                entry[f"{h}d"] = {"count": 0, "mean": None, "hit_rate": None}
+                continue
+            if code > NEUTRAL:
+                hits = np.count_nonzero(selected > 0)
+            elif code < NEUTRAL:
+                hits = np.count_nonzero(selected < 0)
+            else:
+                hits = None
+            entry[f"{h}d"] = {
+                "count": len(selected),
+                "mean": float(selected.mean()),
+                "hit_rate": hits / len(selected) if hits is not None else None,
+            }
+        stats[name] = entry
+    return stats
+
+
+# --- 종목 단위 실행 ---
+
+def resolve_params(params=None):
+    """DEFAULT_PARAMS에 params를 덮어쓴 dict (모르는 키는 ValueError)"""
+    resolved = dict(DEFAULT_PARAMS)
+    if params:
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+        resolved.update(params)
+    if resolved["macd_fast"] >= resolved["macd_slow"]:
+        raise ValueError("macd_fast는 macd_slow보다 작아야 합니다")
+    return resolved
+
+
+def param_grid(**axes):
+    """
+    파라미터 조합 목록 (지정하지 않은 항목은 기본값)
+
+    예: param_grid(weak_threshold=(0.1, 0.2), macd_fast=(8, 12), macd_slow=(21, 26))
+
+    Returns:
+        list: [params dict, ...] (macd_fast >= macd_slow 조합은 제외)
+    """
+    names = [key for key in PARAM_KEYS if key in axes]
+    unknown = set(axes) - set(PARAM_KEYS)
+    if unknown:
+        raise ValueError(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+
+    grid = []
+    for values in itertools.product(*(axes[name] for name in names)):
+        params = dict(DEFAULT_PARAMS)
+        params.update(zip(names, values))
+        if params["macd_fast"] < params["macd_slow"]:
+            grid.append(params)
+    return grid
+
+
+def run(data, params=None, include_series=False):
+    """
+    get_stock_data 결과 dict 하나로 백테스트
+
+    Returns:
+        dict: {"params", "summary", "buckets"} (+ include_series면 "score", "signals")
+    """
+    params = resolve_params(params)
+    oscillator = calculate_oscillator(data["market_cap"], data["foreign_5d"], data["institution_5d"])
+    score = _Indicators(oscillator).score(params)
+    signals = classify(score)
+
+    result = {
+        "params": params,
+        "summary": simulate(score, data["market_cap"], params["entry_score"],
+                            params["exit_score"], params["delay"]),
+        "buckets": bucket_stats(signals, data["market_cap"], score),
+    }
+    if include_series:
+        result["score"] = [None if np.isnan(s) else float(s) for s in score.tolist()]
+        result["signals"] = [SIGNAL_NAMES[int(code)] for code in signals.tolist()]
+    return result
+
+
+def sweep(data, grid):
+    """
+    한 종목에 대해 모든 파라미터 조합 실행 (오실레이터/EMA는 조합 사이에 공유)
+
+    Returns:
+        list: [simulate 결과 dict, ...] (grid 순서)
+    """
+    mcap = np.asarray(data["market_cap"], dtype=np.float64)
+    indicators = _Indicators(
+        calculate_oscillator(data["market_cap"], data["foreign_5d"], data["institution_5d"])
+    )
+    return [
+        simulate(indicators.score(params), mcap, params["entry_score"],
+                 params["exit_score"], params["delay"])
+        for params in grid
+    ]
+
+
+def _run_chunk(tickers, days, grid, source="cache"):
+    """
+    종목 묶음 실행 (프로세스 풀 작업 단위)
+
+    Returns:
+        tuple: ({ticker: [simulate 결과, ...]}, {ticker: 오류 메시지})
+    """
+    if source == "store":
+        from universe_store import get_store
+
+        store = get_store()
+        if store is None:
+            return {}, dict.fromkeys(tickers, "universe_store 저장소가 없습니다")
+        load = store.stock_data
+    else:
+        from stock_data_fetcher import get_stock_data as load
+
+    results, errors = {}, {}
+    for ticker in tickers:
+        try:
+            data = load(ticker, days)
+            if data is None or len(data["dates"]) < MIN_BARS:
+                errors[ticker] = "데이터를 가져올 수 없습니다"
+                continue
+            results[ticker] = sweep(data, grid)
+        except Exception as e:
+            errors[ticker] = str(e)
+    return results, errors
+
+
+def _aggregate(per_ticker, grid):
+    """종목별 결과를 파라미터 조합별로 합산"""
+    rows = []
+    for i, params in enumerate(grid):
+        summaries = [results[i] for results in per_ticker.values()]
+        trades = sum(s["trades"] for s in summaries)
+        wins = sum(s["wins"] for s in summaries)
+        returns = [s["mean_return"] * s["trades"] for s in summaries if s["trades"]]
+        totals = [s["total_return"] for s in summaries]
+        excess = [s["total_return"] - s["buy_hold_return"] for s in summaries]
+        rows.append({
+            "params": params,
+            "tickers": len(summaries),
+            "trades": trades,
+            "hit_rate": wins / trades if trades else None,
+            "mean_trade_return": sum(returns) / trades if trades else None,
+            "mean_total_return": float(np.mean(totals)) if totals else None,
+            "median_total_return": float(np.median(totals)) if totals else None,
+            "mean_excess_return": float(np.mean(excess)) if excess else None,
+        })
+    return rows
+
+
+def run_universe(tickers, days=1825, grid=None, workers=None, chunksize=16, progress=None,
+                 source="cache"):
+    """
+    여러 종목에 파라미터 조합을 실행하여 조합별로 합산 (프로세스 풀)
+
+    Args:
+        tickers: 종목 코드 목록
+        days: 종목별 데이터 기간 (일)
+        grid: param_grid() 결과 (None이면 기본 파라미터 하나)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        chunksize: 작업 하나에 넣을 종목 수
+        progress: progress(완료 종목 수, 전체 종목 수) 콜백
+        source: "cache" (get_stock_data, 부족한 구간은 수집) 또는
+                "store" (universe_store 메모리 매핑 저장소만 읽음, 네트워크 사용 안 함)
+
+    Returns:
+        dict: {"results": [조합별 합산 dict, ...], "per_ticker": {ticker: [...]},
+               "errors": {ticker: 오류 메시지}}
+    """
+    grid = grid or [resolve_params()]
+    tickers = list(dict.fromkeys(tickers))
+    chunks = [tickers[i:i + chunksize] for i in range(0, len(tickers), chunksize)]
+    workers = workers or os.cpu_count() or 1
+
+    per_ticker, errors = {}, {}
+    done = 0
+
+    def collect(chunk_result, size):
+        nonlocal done
+        results, chunk_errors = chunk_result
+        per_ticker.update(results)
+        errors.update(chunk_errors)
+        done += size
+        if progress is not None:
+            progress(done, len(tickers))
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            collect(_run_chunk(chunk, days, grid, source), len(chunk))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = {pool.submit(_run_chunk, chunk, days, grid, source): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                collect(future.result(), futures[future])
+
+    # 입력 순서 유지
+    per_ticker = {ticker: per_ticker[ticker] for ticker in tickers if ticker in per_ticker}
+    if errors:
+        print(f"[backtest] {len(errors)}개 종목 실패", file=sys.stderr)
+    return {
+        "results": _aggregate(per_ticker, grid),
+        "per_ticker": per_ticker,
+        "errors": errors,
+    }
@@ -0,0 +1,172 @@
+"""
+Python → Kotlin 브릿지용 바이너리(컬럼) 인코딩 모듈
+종목 데이터의 날짜/시가총액/수급 컬럼을 JSON 대신 타입이 정해진 배열로 묶어
+하나의 bytes로 반환합니다. Kotlin 쪽에서는 ByteBuffer로 바로 읽습니다.
+
+종목 페이로드 (리틀엔디언):
+    header   "<4sHHIHH"  magic(b"SOSC"), version, reserved, rows, ticker_len, name_len
+    ticker   UTF-8 (ticker_len bytes)
+    name     UTF-8 (name_len bytes)
+    (8바이트 경계까지 0 패딩)
+    dates            int32[rows]  1970-01-01 기준 일수 (epoch day)
+    (8바이트 경계까지 0 패딩)
+    market_cap       int64[rows]
+    foreign_5d       int64[rows]
+    institution_5d   int64[rows]
+
+배치 페이로드:
+    header   "<4sHHI"    magic(b"SOSB"), version, reserved, count
+    count × (uint32 길이 + 종목 페이로드)
+    uint32 길이 + errors JSON (UTF-8, {"티커": "오류 메시지", ...})
+"""
+
+import json
+import struct
+
+import numpy as np
+
+VERSION = 1
+
+STOCK_MAGIC = b"SOSC"
+BATCH_MAGIC = b"SOSB"
+
+_STOCK_HEADER = struct.Struct("<4sHHIHH")
+_BATCH_HEADER = struct.Struct("<4sHHI")
+_LENGTH = struct.Struct("<I")
+
+VALUE_COLUMNS = ("market_cap", "foreign_5d", "institution_5d")
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _padding(offset):
+    return -offset % 8
+
+
+def encode_stock_data(data):
+    """
+    get_stock_data 결과(+ ticker, name)를 종목 페이로드로 인코딩
+
+    Parameters:
+    -----------
+    data : dict
+        {"ticker", "name", "dates": ["YYYY-MM-DD", ...], "market_cap", "foreign_5d", "institution_5d"}
+
+    Returns:
+    --------
+    bytes
+    """
+    ticker = str(data.get("ticker", "")).encode("utf-8")
+    name = str(data.get("name", "")).encode("utf-8")
+
+    dates = (np.asarray(data["dates"], dtype="datetime64[D]") - _EPOCH).astype("<i4")
+    rows = len(dates)
+
+    parts = [_STOCK_HEADER.pack(STOCK_MAGIC, VERSION, 0, rows, len(ticker), len(name)), ticker, name]
+    offset = _STOCK_HEADER.size + len(ticker) + len(name)
+    parts.append(b"\0" * _padding(offset))
+
+    parts.append(dates.tobytes())
+    parts.append(b"\0" * _padding(rows * 4))
+
+    for key in VALUE_COLUMNS:
+        values = np.asarray(data[key], dtype=np.float64)
+        if len(values) != rows:
+            raise ValueError(f"{key} 길이({len(values)})가 dates 길이({rows})와 다릅니다")
+        parts.append(np.rint(values).astype("<i8").tobytes())
+
+    return b"".join(parts)
+
+
+def decode_stock_data(payload, offset=0):
+    """
+    종목 페이로드 디코딩 (왕복 검증/벤치마크용)
+
+    Returns:
+    --------
+    dict
+        encode_stock_data 입력과 같은 형식 (값은 int)
+    """
+    magic, version, _, rows, ticker_len, name_len = _STOCK_HEADER.unpack_from(payload, offset)
+    if magic != STOCK_MAGIC:
+        raise ValueError(f"잘못된 페이로드입니다: {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"지원하지 않는 버전입니다: {version}")
+
+    pos = offset + _STOCK_HEADER.size
+    ticker = bytes(payload[pos:pos + ticker_len]).decode("utf-8")
+    pos += ticker_len
+    name = bytes(payload[pos:pos + name_len]).decode("utf-8")
+    pos += name_len
+    pos += _padding(pos - offset)
+
+    dates = np.frombuffer(payload, dtype="<i4", count=rows, offset=pos)
+    pos += rows * 4 + _padding(rows * 4)
+
+    result = {
+        "ticker": ticker,
+        "name": name,
+        "dates": np.datetime_as_string(dates.astype("datetime64[D]")).tolist(),
+    }
+    for key in VALUE_COLUMNS:
+        result[key] = np.frombuffer(payload, dtype="<i8", count=rows, offset=pos).tolist()
+        pos += rows * 8
+
+    return result
+
+
+def encode_batch(results, errors):
+    """
+    배치 결과를 배치 페이로드로 인코딩
+
+    Parameters:
+    -----------
+    results : dict
+        {"티커": get_stock_data 결과(+ ticker, name), ...}
+    errors : dict
+        {"티커": "오류 메시지", ...}
+
+    Returns:
+    --------
+    bytes
+    """
+    parts = [_BATCH_HEADER.pack(BATCH_MAGIC, VERSION, 0, len(results))]
+    for data in results.values():
+        payload = encode_stock_data(data)
+        parts.append(_LENGTH.pack(len(payload)))
+        parts.append(payload)
+
+    errors_json = json.dumps(errors, ensure_ascii=False).encode("utf-8")
+    parts.append(_LENGTH.pack(len(errors_json)))
+    parts.append(errors_json)
+    return b"".join(parts)
+
+
+def decode_batch(payload):
+    """
+    배치 페이로드 디코딩 (왕복 검증/벤치마크용)
+
+    Returns:
+    --------
+    dict
+        {"results": {"티커": {...}, ...}, "errors": {...}}
+    """
+    magic, version, _, count = _BATCH_HEADER.unpack_from(payload, 0)
+    if magic != BATCH_MAGIC:
+        raise ValueError(f"잘못된 페이로드입니다: {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"지원하지 않는 버전입니다: {version}")
+
+    pos = _BATCH_HEADER.size
+    results = {}
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(payload, pos)
+        pos += _LENGTH.size
+        data = decode_stock_data(payload, pos)
+        results[data["ticker"]] = data
+        pos += length
+
+    (length,) = _LENGTH.unpack_from(payload, pos)
+    pos += _LENGTH.size
+    errors = json.loads(bytes(payload[pos:pos + length]).decode("utf-8"))
+    return {"results": results, "errors": errors}
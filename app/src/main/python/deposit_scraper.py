@@ -4,19 +4,87 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import html as html_lib
+import re
+import threading
 import time
 import sys
 
+from http_session import get_session
+from instrumentation import count, set_rows, span
+import resilient_fetch
 
-def scrape_deposit_data(num_pages=5):
+BASE_URL = "https://finance.naver.com/sise/sise_deposit.naver"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Referer': 'https://finance.naver.com/'
+}
+
+# 동시 요청 수 / 초당 요청 수 (서버 부하 방지)
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_RATE = 10.0
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식 요청 속도 제한 (스레드 안전)
+
+    Args:
+        rate: 초당 허용 요청 수
+        burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiter = RateLimiter()
+
+# 조건부 요청용 검증자 캐시: url → {"etag", "last_modified", "rows"}
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+def configure(rate=None, burst=None):
+    """요청 속도 제한 설정 변경"""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(rate or DEFAULT_RATE, burst)
+
+
+def scrape_deposit_data(num_pages=5, known_dates=None, max_workers=DEFAULT_MAX_WORKERS, first_page=1):
     """
     네이버 증권에서 증시자금동향 데이터를 수집합니다.
 
+    페이지를 max_workers개씩 동시에 요청하며, known_dates가 주어지면
+    이미 가진 날짜만 있는 페이지를 만난 시점에서 이후 페이지 요청을 멈춥니다.
+
     Args:
         num_pages: 수집할 페이지 수 (기본값: 5)
+        known_dates: 이미 보유한 날짜 집합 (선택)
+        max_workers: 동시 요청 수
+        first_page: 시작 페이지 (이미 받은 최근 페이지 다음부터 과거 데이터만 받을 때)
 
     Returns:
         dict: {
@@ -27,28 +95,36 @@ def scrape_deposit_data(num_pages=5):
             'credit_changes': [...]
         }
     """
-    print(f"[deposit_scraper] 데이터 수집 시작: {num_pages}페이지", file=sys.stderr)
+    print(f"[deposit_scraper] 데이터 수집 시작: {num_pages}페이지 (페이지 {first_page}부터)", file=sys.stderr)
 
+    known_dates = set(known_dates or ())
     all_data = []
-
-    for page_num in range(1, num_pages + 1):
-        try:
-            print(f"[deposit_scraper] 페이지 {page_num} 수집 중...", file=sys.stderr)
-            page_data = scrape_page(page_num)
-
-            if page_data:
-                all_data.extend(page_data)
-                print(f"[deposit_scraper] 페이지 {page_num}: {len(page_data)}개 수집", file=sys.stderr)
-            else:
-                print(f"[deposit_scraper] 페이지 {page_num}: 데이터 없음", file=sys.stderr)
-
-            # 요청 간 딜레이 (서버 부하 방지)
-            if page_num < num_pages:
-                time.sleep(0.5)
-
-        except Exception as e:
-            print(f"[deposit_scraper] 페이지 {page_num} 수집 실패: {e}", file=sys.stderr)
-            continue
+    workers = max(1, min(max_workers, num_pages))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        next_page = first_page
+        last_page = first_page + num_pages - 1
+        stop = False
+
+        while next_page <= last_page and not stop:
+            pages = list(range(next_page, min(next_page + workers, last_page + 1)))
+            next_page = pages[-1] + 1
+
+            # 한 묶음의 페이지를 동시에 요청하고, 결과는 페이지 순서대로 처리
+            for page_num, page_data in zip(pages, executor.map(scrape_page, pages)):
+                if page_data:
+                    all_data.extend(page_data)
+                    print(f"[deposit_scraper] 페이지 {page_num}: {len(page_data)}개 수집", file=sys.stderr)
+
+                    if known_dates and all(row['date'] in known_dates for row in page_data):
+                        print(f"[deposit_scraper] 페이지 {page_num}: 모두 보유한 날짜, 수집 중단", file=sys.stderr)
+                        stop = True
+                        break
+                else:
+                    # 이후(더 오래된) 페이지만 저장하면 중간에 빈 구간이 생기므로 여기서 중단
+                    print(f"[deposit_scraper] 페이지 {page_num}: 데이터 없음, 수집 중단", file=sys.stderr)
+                    stop = True
+                    break
 
     if not all_data:
         print("[deposit_scraper] 수집된 데이터가 없습니다", file=sys.stderr)
@@ -56,8 +132,10 @@ def scrape_deposit_data(num_pages=5):
 
     print(f"[deposit_scraper] 총 {len(all_data)}개 데이터 수집", file=sys.stderr)
 
-    # 데이터프레임 생성
+    # 데이터프레임 생성 (pandas는 예탁금 화면에서만 필요하므로 여기서 import)
     try:
+        import pandas as pd
+
         df = pd.DataFrame(all_data)
 
         # 중복 제거 및 정렬
@@ -94,76 +172,220 @@ def scrape_page(page_num):
         list: 데이터 리스트
     """
 
-    url = f"https://finance.naver.com/sise/sise_deposit.naver?page={page_num}"
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'Referer': 'https://finance.naver.com/'
-    }
+    url = f"{BASE_URL}?page={page_num}"
+
+    headers = dict(HEADERS)
+    with _validators_lock:
+        cached = _validators.get(url)
+    if cached:
+        # 조건부 요청: 변경이 없으면 304로 본문 없이 응답
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    def request():
+        _rate_limiter.acquire()
+        with span("deposit.fetch"):
+            return resilient_fetch.check_status(
+                get_session().get(url, headers=headers, timeout=resilient_fetch.timeout("naver"))
+            )
 
     try:
         print(f"[deposit_scraper] URL 요청: {url}", file=sys.stderr)
 
-        response = requests.get(url, headers=headers, timeout=15)
+        # 재시도/헤지/서킷 브레이커는 resilient_fetch가 처리 (같은 페이지 GET은 여러 번 보내도 안전)
+        response = resilient_fetch.call("naver", request)
+
+        if response.status_code == 304 and cached:
+            count("deposit.http", "not_modified")
+            print(f"[deposit_scraper] 페이지 {page_num}: 변경 없음 (304)", file=sys.stderr)
+            return list(cached['rows'])
+
         response.raise_for_status()
         response.encoding = 'euc-kr'
+        count("deposit.http", "ok")
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 테이블 찾기
-        table = soup.find('table', {'class': 'type_1'})
+        with span("deposit.parse"):
+            data_list = parse_deposit_html(response.text)
+            if data_list is not None:
+                set_rows(len(data_list))
 
-        if not table:
+        if data_list is None:
             print(f"[deposit_scraper] 페이지 {page_num}: 테이블을 찾을 수 없습니다", file=sys.stderr)
             return None
 
-        data_list = []
-        rows = table.find_all('tr')
+        print(f"[deposit_scraper] 페이지 {page_num}: {len(data_list)}개 데이터 추출", file=sys.stderr)
 
-        print(f"[deposit_scraper] 페이지 {page_num}: {len(rows)}개 행 발견", file=sys.stderr)
+        # 마지막으로 받은 행은 검증자가 없어도 보관 (요청 실패 시 대체 데이터)
+        with _validators_lock:
+            _validators[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'rows': list(data_list)
+            }
 
-        for idx, row in enumerate(rows[2:], start=2):  # 헤더 2행 제외
-            try:
-                cols = row.find_all('td')
+        return data_list
 
-                if len(cols) < 5:
-                    continue
+    except (requests.exceptions.RequestException, resilient_fetch.RetryableStatus,
+            resilient_fetch.CircuitOpenError, TimeoutError) as e:
+        if cached:
+            count("deposit.http", "stale")
+            print(f"[deposit_scraper] 페이지 {page_num} 요청 실패, 이전 데이터 사용: {e}", file=sys.stderr)
+            return list(cached['rows'])
+        print(f"[deposit_scraper] 페이지 {page_num} 요청 실패: {e}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"[deposit_scraper] 페이지 {page_num} 스크래핑 실패: {e}", file=sys.stderr)
+        return None
 
-                date = cols[0].get_text(strip=True)
 
-                if not date or date == '':
-                    continue
+# ---------------------------------------------------------------------------
+# HTML 파서 백엔드
+#   - stream: table.type_1 구간만 잘라 정규식으로 행/셀 추출 (DOM 생성 없음)
+#   - lxml:   lxml.html (설치된 경우)
+#   - bs4:    BeautifulSoup html.parser (기존 방식)
+# 기본값(auto)은 stream을 쓰고, 테이블을 찾지 못하면 lxml → bs4 순으로 재시도합니다.
+# ---------------------------------------------------------------------------
 
-                # 데이터 추출
-                deposit_amount = parse_number(cols[1].get_text(strip=True))
-                deposit_change = parse_number(cols[2].get_text(strip=True))
-                credit_amount = parse_number(cols[3].get_text(strip=True))
-                credit_change = parse_number(cols[4].get_text(strip=True))
+PARSER_BACKENDS = ('auto', 'stream', 'lxml', 'bs4')
 
-                data_list.append({
-                    'date': date,
-                    'deposit_amount': deposit_amount,
-                    'deposit_change': deposit_change,
-                    'credit_amount': credit_amount,
-                    'credit_change': credit_change
-                })
+_parser_backend = 'auto'
 
-            except Exception as e:
-                print(f"[deposit_scraper] 행 {idx} 파싱 실패: {e}", file=sys.stderr)
-                continue
+_TABLE_START_RE = re.compile(r'<table\b[^>]*class="[^"]*\btype_1\b[^"]*"[^>]*>', re.I)
+_TABLE_END_RE = re.compile(r'</table\s*>', re.I)
+_ROW_RE = re.compile(r'<tr\b[^>]*>(.*?)</tr\s*>', re.I | re.S)
+_CELL_RE = re.compile(r'<td\b[^>]*>(.*?)</td\s*>', re.I | re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
 
-        print(f"[deposit_scraper] 페이지 {page_num}: {len(data_list)}개 데이터 추출", file=sys.stderr)
-        return data_list
 
-    except requests.exceptions.RequestException as e:
-        print(f"[deposit_scraper] 페이지 {page_num} 요청 실패: {e}", file=sys.stderr)
+def set_parser_backend(backend):
+    """HTML 파서 백엔드 설정 ('auto', 'stream', 'lxml', 'bs4')"""
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"지원하지 않는 파서입니다: {backend} (가능: {PARSER_BACKENDS})")
+    _parser_backend = backend
+
+
+def lxml_available():
+    """lxml 설치 여부"""
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _cell_text(fragment):
+    """셀 HTML에서 텍스트 추출 (BeautifulSoup get_text(strip=True)와 같은 규칙)"""
+    return ''.join(part.strip() for part in html_lib.unescape(_TAG_RE.sub('\x00', fragment)).split('\x00'))
+
+
+def _extract_rows_stream(html):
+    """table.type_1 구간만 정규식으로 추출 → [[셀 텍스트, ...], ...] 또는 None"""
+    start = _TABLE_START_RE.search(html)
+    if not start:
         return None
-    except Exception as e:
-        print(f"[deposit_scraper] 페이지 {page_num} 스크래핑 실패: {e}", file=sys.stderr)
+    end = _TABLE_END_RE.search(html, start.end())
+    table = html[start.end():end.start() if end else len(html)]
+
+    return [
+        [_cell_text(cell) for cell in _CELL_RE.findall(row)]
+        for row in _ROW_RE.findall(table)
+    ]
+
+
+def _extract_rows_lxml(html):
+    """lxml로 table.type_1 행 추출 → [[셀 텍스트, ...], ...] 또는 None"""
+    import lxml.html
+
+    doc = lxml.html.fromstring(html)
+    tables = doc.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " type_1 ")]')
+    if not tables:
+        return None
+
+    return [
+        [''.join(text.strip() for text in td.itertext()) for td in tr.xpath('./td')]
+        for tr in tables[0].iter('tr')
+    ]
+
+
+def _extract_rows_bs4(html):
+    """BeautifulSoup으로 table.type_1 행 추출 → [[셀 텍스트, ...], ...] 또는 None"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'class': 'type_1'})
+    if not table:
+        return None
+
+    return [
+        [td.get_text(strip=True) for td in row.find_all('td')]
+        for row in table.find_all('tr')
+    ]
+
+
+_EXTRACTORS = {
+    'stream': _extract_rows_stream,
+    'lxml': _extract_rows_lxml,
+    'bs4': _extract_rows_bs4,
+}
+
+
+def _extract_rows(html, backend):
+    if backend != 'auto':
+        return _EXTRACTORS[backend](html)
+
+    rows = _extract_rows_stream(html)
+    if rows is None:
+        rows = _extract_rows_lxml(html) if lxml_available() else _extract_rows_bs4(html)
+    return rows
+
+
+def parse_deposit_html(html, backend=None):
+    """
+    sise_deposit 페이지 HTML에서 데이터 행 추출
+
+    Args:
+        html: 페이지 HTML 문자열
+        backend: 파서 백엔드 (None이면 set_parser_backend 설정값)
+
+    Returns:
+        list: [{'date', 'deposit_amount', 'deposit_change', 'credit_amount', 'credit_change'}, ...]
+              테이블이 없으면 None
+    """
+    rows = _extract_rows(html, backend or _parser_backend)
+    if rows is None:
         return None
 
+    data_list = []
+    for idx, cols in enumerate(rows):
+        # 헤더 행(th만 있음)과 구분선 행은 td가 5개 미만
+        if len(cols) < 5:
+            continue
+
+        date = cols[0]
+        if not date:
+            continue
+
+        try:
+            data_list.append({
+                'date': date,
+                'deposit_amount': parse_number(cols[1]),
+                'deposit_change': parse_number(cols[2]),
+                'credit_amount': parse_number(cols[3]),
+                'credit_change': parse_number(cols[4])
+            })
+        except Exception as e:
+            print(f"[deposit_scraper] 행 {idx} 파싱 실패: {e}", file=sys.stderr)
+            continue
+
+    return data_list
+
+
+# 쉼표와 "억", "원" 제거용 변환 테이블
+_NUMBER_STRIP = str.maketrans('', '', ',억원')
+
 
 def parse_number(text):
     """
@@ -177,7 +399,7 @@ def parse_number(text):
     """
     try:
         # 쉼표와 "억원" 제거
-        cleaned = text.replace(',', '').replace('억원', '').replace('억', '').strip()
+        cleaned = text.translate(_NUMBER_STRIP).strip()
 
         # 빈 문자열이나 "-" 처리
         if not cleaned or cleaned == '-' or cleaned == '':
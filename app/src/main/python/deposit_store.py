@@ -0,0 +1,253 @@
+"""
+증시자금동향 로컬 저장소 모듈
+고객예탁금/신용잔고 일별 데이터를 SQLite에 누적 저장하고,
+새로고침 시에는 1페이지부터 이미 가진 날짜를 만날 때까지만 수집합니다.
+"""
+
+import sys
+import threading
+import time
+
+from deposit_scraper import scrape_deposit_data
+from instrumentation import count
+from local_store import connect
+
+DB_NAME = "deposit.db"
+
+# 네이버 sise_deposit 페이지당 행 수
+ROWS_PER_PAGE = 10
+
+# 마지막 새로고침 후 이 시간(초) 안에는 저장된 데이터만 사용
+REFRESH_INTERVAL = 600
+
+# 새로고침 시 이미 가진 날짜를 찾아 수집할 최대 페이지 수
+# (이 안에서 만나지 못하면 저장된 데이터와 이어지지 않으므로 저장소를 새로 시작)
+MAX_REFRESH_PAGES = 50
+
+_lock = threading.Lock()
+
+
+def _sort_key(date):
+    """네이버 날짜(YY.MM.DD)를 정렬용 YYYY-MM-DD로 변환"""
+    yy, mm, dd = date.split('.')
+    return f"20{yy}-{mm}-{dd}"
+
+
+def _get_conn():
+    conn = connect(DB_NAME)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS deposit ("
+        "sort_key TEXT PRIMARY KEY, date TEXT NOT NULL, "
+        "deposit_amount REAL, deposit_change REAL, "
+        "credit_amount REAL, credit_change REAL)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+def _row_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM deposit").fetchone()[0]
+
+
+def _known_dates(conn):
+    return {row[0] for row in conn.execute("SELECT date FROM deposit")}
+
+
+def _last_refresh(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'last_refresh'").fetchone()
+    return float(row[0]) if row else 0.0
+
+
+def _upsert(conn, data, refreshed=False):
+    """
+    행 저장 (refreshed=True면 1페이지부터 새로 받은 것이므로 새로고침 시각도 기록)
+
+    과거 페이지만 받은 경우(get_older_pages)에는 새로고침 시각을 바꾸지 않습니다.
+    """
+    rows = []
+    for values in zip(data['dates'], data['deposit_amounts'], data['deposit_changes'],
+                      data['credit_amounts'], data['credit_changes']):
+        try:
+            rows.append((_sort_key(values[0]),) + tuple(values))
+        except ValueError:
+            print(f"[deposit_store] 날짜 형식 오류: {values[0]}", file=sys.stderr)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO deposit "
+            "(sort_key, date, deposit_amount, deposit_change, credit_amount, credit_change) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        if refreshed:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_refresh', ?)",
+                (str(time.time()),)
+            )
+    return len(rows)
+
+
+def _is_disjoint(known, data):
+    """수집한 행이 저장된 날짜와 하나도 겹치지 않는지 (겹쳐야 빈 구간 없이 이어짐)"""
+    return bool(known) and known.isdisjoint(data['dates'])
+
+
+def refresh(num_pages=5, force=False):
+    """
+    저장소 새로고침
+
+    - 저장된 행이 num_pages 분량보다 적으면 num_pages 페이지 전체 수집 (최초/확장)
+    - 그 외에는 1페이지부터 이미 가진 날짜만 있는 페이지를 만날 때까지 수집
+      (num_pages와 관계없이 최대 MAX_REFRESH_PAGES 페이지)
+    - 수집한 행이 저장된 날짜와 겹치지 않으면 중간에 빈 구간이 생기므로 이어 붙이지 않음:
+      요청한 페이지를 모두 받았으면 저장소를 비우고 새로 시작, 중간에 실패했으면 저장하지 않음
+    - 최근 REFRESH_INTERVAL 안에 새로고침했다면 생략 (force=True면 항상 수행)
+
+    load()/get_older_pages()는 행 수로 페이지를 나누므로 저장된 행은 항상 빈 구간 없이 이어져야 합니다.
+
+    Returns:
+        int: 저장(갱신)한 행 수
+    """
+    with _lock:
+        conn = _get_conn()
+        try:
+            enough = _row_count(conn) >= num_pages * ROWS_PER_PAGE
+            if enough and not force and time.time() - _last_refresh(conn) < REFRESH_INTERVAL:
+                count("deposit.store", "hit")
+                print("[deposit_store] 최근 새로고침됨, 저장된 데이터 사용", file=sys.stderr)
+                return 0
+
+            count("deposit.store", "miss")
+            known = _known_dates(conn)
+            if enough:
+                pages = max(num_pages, MAX_REFRESH_PAGES)
+                data = scrape_deposit_data(pages, known_dates=known)
+            else:
+                pages = num_pages
+                data = scrape_deposit_data(pages)
+
+            if not data:
+                return 0
+
+            if _is_disjoint(known, data):
+                if len(data['dates']) < pages * ROWS_PER_PAGE:
+                    count("deposit.store", "gap")
+                    print(f"[deposit_store] 저장된 날짜까지 수집하지 못함 ({len(data['dates'])}개), "
+                          f"빈 구간을 막기 위해 저장하지 않음", file=sys.stderr)
+                    return 0
+
+                count("deposit.store", "reset")
+                print(f"[deposit_store] 저장된 데이터와 이어지지 않음 ({pages}페이지 안에 보유 날짜 없음), "
+                      f"저장소를 새로 시작", file=sys.stderr)
+                with conn:
+                    conn.execute("DELETE FROM deposit")
+
+            saved = _upsert(conn, data, refreshed=True)
+            print(f"[deposit_store] {saved}개 행 저장 (전체 {_row_count(conn)}개)", file=sys.stderr)
+            return saved
+        finally:
+            conn.close()
+
+
+def load(num_pages=5, first_page=1):
+    """
+    저장된 데이터 중 first_page부터 num_pages 페이지 분량 (날짜 오름차순)
+
+    Returns:
+        dict 또는 None: scrape_deposit_data와 같은 형식
+    """
+    conn = _get_conn()
+    try:
+        rows = conn.execute(
+            "SELECT date, deposit_amount, deposit_change, credit_amount, credit_change "
+            "FROM deposit ORDER BY sort_key DESC LIMIT ? OFFSET ?",
+            (num_pages * ROWS_PER_PAGE, (first_page - 1) * ROWS_PER_PAGE)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not rows:
+        return None
+
+    rows.reverse()
+    columns = list(zip(*rows))
+    return {
+        'dates': list(columns[0]),
+        'deposit_amounts': list(columns[1]),
+        'deposit_changes': list(columns[2]),
+        'credit_amounts': list(columns[3]),
+        'credit_changes': list(columns[4])
+    }
+
+
+def slice_pages(data, num_pages):
+    """더 많은 페이지의 load 결과에서 최근 num_pages 페이지 분량만 잘라내기"""
+    rows = num_pages * ROWS_PER_PAGE
+    return {key: values[-rows:] for key, values in data.items()}
+
+
+def get_deposit_data(num_pages=5):
+    """
+    새로고침 후 저장소에서 데이터 반환 (수집 실패 시 저장된 데이터 사용)
+
+    Returns:
+        dict 또는 None
+    """
+    try:
+        refresh(num_pages)
+    except Exception as e:
+        print(f"[deposit_store] 새로고침 실패, 저장된 데이터 사용: {e}", file=sys.stderr)
+    return load(num_pages)
+
+
+def get_older_pages(first_page, num_pages):
+    """
+    first_page부터 num_pages 페이지 분량 (최근 페이지는 새로고침하지 않음)
+
+    저장된 행이 그 페이지까지 닿지 않으면 저장된 마지막 페이지 다음부터 해당 페이지까지 수집합니다.
+    (요청한 페이지만 받으면 그 사이에 빈 구간이 생길 수 있음)
+
+    Returns:
+        dict 또는 None
+    """
+    with _lock:
+        conn = _get_conn()
+        try:
+            stored = _row_count(conn)
+            if stored < (first_page - 1 + num_pages) * ROWS_PER_PAGE:
+                count("deposit.store", "miss")
+                start_page = min(first_page, stored // ROWS_PER_PAGE + 1)
+                data = scrape_deposit_data(first_page + num_pages - start_page, first_page=start_page)
+                if data:
+                    _upsert(conn, data)
+            else:
+                count("deposit.store", "hit")
+        finally:
+            conn.close()
+    return load(num_pages, first_page)
+
+
+def iter_deposit_data(num_pages=50, chunk_pages=5):
+    """
+    get_deposit_data를 페이지 묶음으로 나누어 최근 묶음부터 yield (긴 기간 단계적 조회용)
+
+    첫 묶음은 새로고침 후 반환하고, 이후 묶음은 저장소에 없는 페이지만 수집합니다.
+    모든 묶음을 오래된 순으로 이어 붙이면 get_deposit_data(num_pages) 결과와 같습니다.
+
+    Yields:
+        dict: get_deposit_data와 같은 형식 (날짜 오름차순)
+    """
+    first = get_deposit_data(min(chunk_pages, num_pages))
+    if not first:
+        return
+    yield first
+
+    for first_page in range(chunk_pages + 1, num_pages + 1, chunk_pages):
+        chunk = get_older_pages(first_page, min(chunk_pages, num_pages - first_page + 1))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_latest_data():
+    """최신 데이터(1페이지 분량)"""
+    return get_deposit_data(num_pages=1)
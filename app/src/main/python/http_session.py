@@ -0,0 +1,131 @@
+"""
+공용 HTTP 세션 모듈
+연결 풀을 재사용하는 requests.Session을 하나만 만들어 모든 수집 모듈이 공유합니다.
+timeout 없이 보낸 요청에는 호스트 정책(resilient_fetch)의 기본 timeout을 적용합니다.
+"""
+
+import sys
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import resilient_fetch
+
+# 호스트별 연결 풀 크기 (배치/병렬 수집 스레드 수 이상)
+POOL_SIZE = 16
+
+# timeout 없이 보낸 요청의 기본 timeout 정책: (호스트 이름 끝, resilient_fetch 정책 이름)
+HOST_POLICIES = (
+    ("krx.co.kr", "krx"),
+    ("naver.com", "naver"),
+)
+
+_session = None
+_session_lock = threading.Lock()
+_pykrx_installed = None  # 설정 결과 (None이면 아직 시도 전)
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """
+    timeout 없이 보낸 요청에 호스트 정책의 기본 timeout을 적용하는 연결 어댑터
+
+    pykrx 등 외부 라이브러리는 timeout 없이 요청하므로, 응답이 없는 연결에
+    스레드가 무한정 묶이지 않도록 세션 단위로 기본값을 둡니다.
+    """
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = _default_timeout(request.url)
+        return super().send(request, **kwargs)
+
+
+def _default_timeout(url):
+    host = urlsplit(url).hostname or ""
+    for suffix, policy in HOST_POLICIES:
+        if host == suffix or host.endswith("." + suffix):
+            return resilient_fetch.timeout(policy)
+    return resilient_fetch.Policy().timeout
+
+
+def _mount_pool(session, pool_size=POOL_SIZE):
+    adapter = _TimeoutAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def new_session():
+    """연결 풀과 기본 timeout을 설정한 새 requests.Session (쿠키를 따로 두어야 할 때)"""
+    return _mount_pool(requests.Session())
+
+
+def get_session():
+    """공용 requests.Session 반환 (최초 호출 시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+
+class _PykrxRequestsShim:
+    """
+    pykrx 모듈의 requests 대체 객체
+
+    requests.Session() 호출을 session_factory로 돌려, 요청마다 새 Session을 만드는 대신
+    연결 풀과 기본 timeout이 설정된 세션을 쓰게 합니다. 그 외 속성(예외 클래스 등)은 requests에 위임합니다.
+    """
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    def Session(self):  # noqa: N802 - requests.Session() 호출 형태 유지
+        return self._session_factory()
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def install_pykrx_session():
+    """
+    pykrx가 연결 풀과 기본 timeout이 설정된 세션을 쓰도록 설정 (여러 번 호출해도 한 번만 적용)
+
+    resilient_fetch.krx가 처음 호출될 때 적용합니다.
+    - 로그인 없이 요청할 때(webio): 공용 세션 사용
+    - KRX 로그인 세션(auth): 쿠키를 따로 두므로 새 세션을 만들 때마다(재로그인 포함) 같은 설정 적용,
+      이미 만들어진 로그인 세션에도 적용
+
+    Returns:
+        bool: 적용 여부 (설정 중 오류는 다음 호출에서 다시 시도)
+    """
+    global _pykrx_installed
+
+    if _pykrx_installed is not None:
+        return _pykrx_installed
+
+    with _session_lock:
+        if _pykrx_installed is not None:
+            return _pykrx_installed
+
+        try:
+            from pykrx.website.comm import auth, webio
+        except ImportError as e:
+            # 대체 모듈(오프라인 측정 등)은 다시 시도하지 않음
+            print(f"[http_session] pykrx webio를 찾을 수 없습니다: {e}", file=sys.stderr)
+            _pykrx_installed = False
+            return False
+
+        try:
+            webio.requests = _PykrxRequestsShim(get_session)
+            auth.requests = _PykrxRequestsShim(new_session)
+            current = getattr(auth, "_auth_session", None)
+            if current is not None and hasattr(current, "session"):
+                _mount_pool(current.session)
+        except Exception as e:
+            print(f"[http_session] pykrx 세션 설정 실패: {e}", file=sys.stderr)
+            return False
+
+        _pykrx_installed = True
+        return True
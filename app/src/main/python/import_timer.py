@@ -0,0 +1,103 @@
+"""
+지연 import 및 import 시간 측정 모듈
+무거운 모듈(pandas, pykrx, requests 등)을 처음 필요할 때 한 번만 import하고,
+load_module 호출별 소요 시간과 그 과정에서 새로 불러온 최상위 패키지를 기록합니다.
+
+전역 import 훅(builtins.__import__)은 건드리지 않으므로 다른 스레드(미리 받기, warm-up)의
+import에는 영향이 없습니다. 하위 모듈별 상세 시간은 `python -X importtime`으로 확인합니다.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+_lock = threading.RLock()
+
+# 모듈 이름 → 모듈 객체 (load_module로 불러온 것만)
+_loaded = {}
+
+# load_module 호출별 기록: [{"module", "seconds", "thread", "new_modules", "packages"}]
+_loads = []
+
+
+def load_module(name):
+    """
+    모듈을 한 번만 import하여 반환 (스레드 안전)
+
+    import 실패 시 ImportError를 그대로 전달하므로, 다음 호출에서 다시 시도합니다.
+    """
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+
+    # 다른 스레드가 같은 시간에 불러온 모듈도 포함될 수 있음 (참고용)
+    added = set(sys.modules) - before
+    with _lock:
+        if name not in _loaded:
+            _loaded[name] = module
+            _loads.append({
+                "module": name,
+                "seconds": elapsed,
+                "thread": threading.current_thread().name,
+                "new_modules": len(added),
+                "packages": sorted({m.partition(".")[0] for m in added}),
+            })
+    return module
+
+
+def is_loaded(name):
+    return name in _loaded
+
+
+def warm_up(names, background=True):
+    """
+    모듈들을 미리 import (기본: 데몬 스레드에서 실행)
+
+    Returns:
+        threading.Thread 또는 None (background=False)
+    """
+    def run():
+        for name in names:
+            try:
+                load_module(name)
+            except Exception as e:
+                print(f"[import_timer] 미리 불러오기 실패 ({name}): {e}", file=sys.stderr)
+
+    if not background:
+        run()
+        return None
+
+    thread = threading.Thread(target=run, name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def report(limit=30):
+    """
+    import 시간 보고서
+
+    Returns:
+        dict: {
+            "loads": [{"module", "seconds", "thread", "new_modules", "packages"}, ...],  # load_module 호출 순
+            "slowest": [{"module", "ms"}, ...],    # 소요 시간 상위 limit개
+            "total_seconds": load_module 누적 시간
+        }
+    """
+    with _lock:
+        loads = [dict(entry, packages=list(entry["packages"])) for entry in _loads]
+
+    slowest = sorted(loads, key=lambda entry: entry["seconds"], reverse=True)[:limit]
+    return {
+        "loads": loads,
+        "slowest": [
+            {"module": entry["module"], "ms": round(entry["seconds"] * 1000, 3)}
+            for entry in slowest
+        ],
+        "total_seconds": sum(entry["seconds"] for entry in loads),
+    }
@@ -0,0 +1,292 @@
+"""
+구간 시간 측정(계측) 모듈
+진입점 호출 한 번을 루트 구간으로, 그 안의 네트워크 수집/파싱/pandas 변환/직렬화를
+하위 구간으로 기록하고, 구간별 최근 WINDOW개 시간으로 백분위수를 계산합니다.
+
+모드:
+    off     - 기록하지 않음 (구간 진입 비용은 전역 변수 확인 한 번)
+    sample  - 진입점 호출 중 sample_rate 비율만 기록
+    profile - 모든 호출을 기록하고, 진입점은 cProfile로 함수별 시간까지 누적
+
+사용법:
+    @entry_point("get_stock_analysis")
+    def get_stock_analysis(...): ...
+
+    with span("deposit.fetch"):
+        ...
+    set_rows(len(rows))            # 현재 구간의 반환 행 수
+    count("timeseries.cache", "hit")
+"""
+
+import functools
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+MODES = ("off", "sample", "profile")
+
+# 구간별로 보관할 최근 측정 수
+WINDOW = 512
+
+# get_metrics에 포함할 cProfile 상위 함수 수
+PROFILE_TOP = 25
+
+_mode = "off"
+_sample_rate = 0.1
+
+_lock = threading.Lock()
+_local = threading.local()
+
+# 구간 이름 → deque[(초, 행 수 또는 None)]
+_durations = defaultdict(lambda: deque(maxlen=WINDOW))
+# 구간 이름 → 누적 호출 수
+_calls = defaultdict(int)
+# 카운터 이름 → {결과: 횟수}
+_counters = defaultdict(lambda: defaultdict(int))
+
+# cProfile은 프로세스 전체에서 한 번에 하나만 동작하므로 잠금으로 보호
+# (cProfile/pstats는 콜드 스타트 비용 때문에 profile 모드에서만 import)
+_profile_lock = threading.Lock()
+_profile_stats = None
+
+
+def set_mode(mode, sample_rate=None):
+    """
+    계측 모드 변경
+
+    Args:
+        mode: "off", "sample", "profile"
+        sample_rate: sample 모드에서 기록할 비율 (0~1)
+    """
+    global _mode, _sample_rate
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 계측 모드입니다: {mode} ({', '.join(MODES)})")
+    if sample_rate is not None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate는 0~1 사이여야 합니다: {sample_rate}")
+        _sample_rate = float(sample_rate)
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def _is_recording():
+    """현재 스레드에서 기록 중인지 (진입점 밖이면 모드/샘플링으로 판단)"""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        return stack[-1] is not None
+    if _mode == "sample":
+        return random.random() < _sample_rate
+    return _mode == "profile"
+
+
+class _Span:
+    __slots__ = ("name", "rows", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.start = 0.0
+
+
+class _NullContext:
+    """기록하지 않을 때 쓰는 빈 컨텍스트"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullContext()
+
+
+class span:
+    """
+    구간 시간 측정 컨텍스트
+
+    sample 모드에서 샘플링되지 않은 진입점 안의 구간은 기록하지 않습니다.
+    """
+
+    __slots__ = ("_name", "_span")
+
+    def __new__(cls, name):
+        if _mode == "off":
+            return _NULL
+        return super().__new__(cls)
+
+    def __init__(self, name):
+        self._name = name
+        self._span = None
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+
+        recording = _is_recording()
+        self._span = _Span(self._name) if recording else None
+        stack.append(self._span)
+        if self._span is not None:
+            self._span.start = time.perf_counter()
+        return self._span
+
+    def __exit__(self, *exc):
+        _local.stack.pop()
+        current = self._span
+        if current is not None:
+            elapsed = time.perf_counter() - current.start
+            with _lock:
+                _durations[current.name].append((elapsed, current.rows))
+                _calls[current.name] += 1
+        return False
+
+
+def set_rows(rows):
+    """현재 구간의 반환 행 수 기록"""
+    stack = getattr(_local, "stack", None)
+    if stack and stack[-1] is not None:
+        stack[-1].rows = int(rows)
+
+
+def count(name, outcome):
+    """
+    결과 카운터 증가 (예: count("timeseries.cache", "hit"))
+
+    진입점 밖이거나 기록 중인 호출에서만 셉니다.
+    """
+    if _mode == "off":
+        return
+    stack = getattr(_local, "stack", None)
+    if stack and stack[-1] is None:
+        return
+    with _lock:
+        _counters[name][outcome] += 1
+
+
+def entry_point(name):
+    """
+    진입점 데코레이터: 호출 전체를 루트 구간으로 기록 (profile 모드에서는 cProfile 누적)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _mode == "off":
+                return fn(*args, **kwargs)
+
+            if _mode != "profile" or getattr(_local, "stack", None):
+                with span(name):
+                    return fn(*args, **kwargs)
+
+            # 다른 스레드가 프로파일 중이면 시간만 기록
+            if not _profile_lock.acquire(blocking=False):
+                with span(name):
+                    return fn(*args, **kwargs)
+
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                with span(name):
+                    profiler.enable()
+                    try:
+                        return fn(*args, **kwargs)
+                    finally:
+                        profiler.disable()
+            finally:
+                _merge_profile(profiler)
+                _profile_lock.release()
+
+        return wrapper
+    return decorator
+
+
+def _merge_profile(profiler):
+    global _profile_stats
+    import io
+    import pstats
+
+    with _lock:
+        if _profile_stats is None:
+            _profile_stats = pstats.Stats(profiler, stream=io.StringIO())
+        else:
+            _profile_stats.add(profiler)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _profile_summary(top):
+    if _profile_stats is None:
+        return []
+    rows = []
+    for (filename, line, func), (_, calls, tottime, cumtime, _) in _profile_stats.stats.items():
+        rows.append({
+            "function": f"{func} ({filename.rsplit('/', 1)[-1]}:{line})",
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        })
+    rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+    return rows[:top]
+
+
+def snapshot(profile_top=PROFILE_TOP):
+    """
+    현재까지의 측정 결과
+
+    Returns:
+        dict: {
+            "mode", "sample_rate",
+            "spans": {이름: {"calls", "window", "mean_ms", "p50_ms", "p90_ms",
+                             "p99_ms", "max_ms", "rows_mean"}},
+            "counters": {이름: {결과: 횟수}},
+            "profile": [{"function", "calls", "tottime_ms", "cumtime_ms"}, ...]
+        }
+    """
+    with _lock:
+        durations = {name: list(values) for name, values in _durations.items()}
+        calls = dict(_calls)
+        counters = {name: dict(outcomes) for name, outcomes in _counters.items()}
+        profile = _profile_summary(profile_top)
+
+    spans = {}
+    for name, values in sorted(durations.items()):
+        times = sorted(v[0] * 1000 for v in values)
+        rows = [v[1] for v in values if v[1] is not None]
+        spans[name] = {
+            "calls": calls.get(name, 0),
+            "window": len(times),
+            "mean_ms": round(sum(times) / len(times), 3) if times else 0.0,
+            "p50_ms": round(_percentile(times, 0.50), 3),
+            "p90_ms": round(_percentile(times, 0.90), 3),
+            "p99_ms": round(_percentile(times, 0.99), 3),
+            "max_ms": round(times[-1], 3) if times else 0.0,
+            "rows_mean": round(sum(rows) / len(rows), 1) if rows else None,
+        }
+
+    return {
+        "mode": _mode,
+        "sample_rate": _sample_rate,
+        "spans": spans,
+        "counters": counters,
+        "profile": profile,
+    }
+
+
+def reset():
+    """측정 결과 초기화"""
+    global _profile_stats
+    with _lock:
+        _durations.clear()
+        _calls.clear()
+        _counters.clear()
+        _profile_stats = None
@@ -0,0 +1,55 @@
+"""
+로컬 저장소 공통 모듈
+캐시/인덱스 파일을 저장할 디렉터리와 SQLite 연결을 관리합니다.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+# 저장 디렉터리 환경 변수 (테스트/벤치마크에서 경로를 바꿀 때 사용)
+DATA_DIR_ENV = "STOCK_OSCILLATOR_DATA_DIR"
+
+
+def get_data_dir(subdir=None):
+    """
+    로컬 데이터 디렉터리 경로를 반환합니다.
+
+    Chaquopy 환경에서는 HOME이 앱 전용 files 디렉터리를 가리키므로
+    그 아래 stock_cache 디렉터리를 사용합니다.
+
+    Args:
+        subdir: 하위 디렉터리 이름 (선택)
+
+    Returns:
+        str: 생성된 디렉터리의 절대 경로
+    """
+    base = os.environ.get(DATA_DIR_ENV)
+    if not base:
+        home = os.environ.get("HOME") or tempfile.gettempdir()
+        base = os.path.join(home, "stock_cache")
+
+    path = os.path.join(base, subdir) if subdir else base
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def connect(db_name):
+    """
+    데이터 디렉터리 안의 SQLite 데이터베이스에 연결합니다.
+
+    Args:
+        db_name: 데이터베이스 파일 이름 (예: "tickers.db")
+
+    Returns:
+        sqlite3.Connection
+    """
+    db_path = os.path.join(get_data_dir(), db_name)
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except sqlite3.DatabaseError as e:
+        print(f"[local_store] PRAGMA 설정 실패 ({db_name}): {e}", file=sys.stderr)
+    return conn
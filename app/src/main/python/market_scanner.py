@@ -0,0 +1,294 @@
+"""
+시장 전체 수급 오실레이터 스캔 모듈
+pykrx의 시장 전체 스냅샷(종목별 시가총액, 투자자별 순매수)을 하루 한 번 받아
+KOSPI/KOSDAQ 전 종목의 수급 오실레이터를 한 번에 계산합니다.
+
+공식: (외국인 5일 순매수 + 기관 5일 순매수) / 시가총액 * 100
+"""
+
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import count, set_rows, span
+from local_store import connect
+import resilient_fetch
+import trading_calendar
+
+DB_NAME = "market_scan.db"
+MARKETS = ("KOSPI", "KOSDAQ")
+
+# 외국인합계 = 외국인 + 기타외국인
+FOREIGN_INVESTORS = ("외국인", "기타외국인")
+INSTITUTION_INVESTOR = "기관합계"
+
+ROLLING_DAYS = 5
+
+# 장중(당일) 스캔 결과 재사용 시간 (초)
+INTRADAY_TTL = 600
+
+
+def _recent_business_days(count):
+    """
+    최근 영업일 목록 (오래된 순)
+
+    Returns:
+        list: ["YYYYMMDD", ...] (길이 count)
+    """
+    return [d.strftime("%Y%m%d") for d in trading_calendar.recent_trading_days(count)]
+
+
+def _net_purchases(from_date, to_date, market, investor):
+    """투자자의 기간 순매수거래대금 (종목코드 인덱스 Series)"""
+    from pykrx import stock
+
+    df = resilient_fetch.krx(
+        stock.get_market_net_purchases_of_equities, from_date, to_date, market, investor
+    )
+    if df.empty:
+        return pd.Series(dtype="float64"), pd.Series(dtype="object")
+    return df["순매수거래대금"].astype("float64"), df["종목명"]
+
+
+def fetch_snapshot(market):
+    """
+    한 시장의 스캔용 횡단면 데이터 수집
+    (영업일 조회 + 시가총액 1회 + 투자자별 순매수 3회)
+
+    Returns:
+        DataFrame: index=티커, columns=[name, market, market_cap, foreign_5d, institution_5d]
+    """
+    from pykrx import stock
+
+    days = _recent_business_days(ROLLING_DAYS)
+    from_date, to_date = days[0], days[-1]
+
+    caps = resilient_fetch.krx(stock.get_market_cap, to_date, market=market)["시가총액"].astype("float64")
+
+    foreign = None
+    names = pd.Series(dtype="object")
+    for investor in FOREIGN_INVESTORS:
+        values, investor_names = _net_purchases(from_date, to_date, market, investor)
+        foreign = values if foreign is None else foreign.add(values, fill_value=0.0)
+        names = names.combine_first(investor_names)
+
+    institution, investor_names = _net_purchases(from_date, to_date, market, INSTITUTION_INVESTOR)
+    names = names.combine_first(investor_names)
+
+    frame = pd.DataFrame({
+        "market_cap": caps,
+        "foreign_5d": foreign,
+        "institution_5d": institution,
+    })
+    frame[["foreign_5d", "institution_5d"]] = frame[["foreign_5d", "institution_5d"]].fillna(0.0)
+    frame = frame[frame["market_cap"].notna()]
+    frame["name"] = names.reindex(frame.index).fillna("")
+    frame["market"] = market
+    frame.attrs["date"] = to_date
+    return frame
+
+
+def snapshot_from_store(market):
+    """
+    universe_store에 최근 ROLLING_DAYS 거래일이 모두 있고 마감 후 기록되었으면
+    그 값으로 fetch_snapshot과 같은 형식의 데이터 생성 (네트워크 사용 안 함)
+
+    Returns:
+        DataFrame 또는 None
+    """
+    import universe_store
+    from ticker_index import get_ticker_index
+
+    store = universe_store.get_store()
+    if store is None or store.n_dates < ROLLING_DAYS:
+        return None
+
+    days = trading_calendar.recent_trading_days(ROLLING_DAYS)
+    expected = [universe_store.to_epoch_day(d) for d in days]
+    if store.dates[-ROLLING_DAYS:].tolist() != expected:
+        return None
+    if not trading_calendar.is_settled(days[-1], store.updated_at):
+        return None
+
+    snap = store.rolling_snapshot(market, ROLLING_DAYS)
+    index = get_ticker_index()
+    frame = pd.DataFrame({
+        "market_cap": snap["market_cap"],
+        "foreign_5d": snap["foreign_5d"],
+        "institution_5d": snap["institution_5d"],
+    }, index=pd.Index(snap["tickers"], name="티커"))
+    frame = frame[frame["market_cap"].notna()]
+    frame["name"] = [index.get_name(t) or "" for t in frame.index]
+    frame["market"] = market
+    frame.attrs["date"] = snap["date"]
+    return frame
+
+
+def compute_oscillator(frame):
+    """
+    시장 전체 오실레이터 계산 (벡터 연산)
+
+    Returns:
+        ndarray: float64 오실레이터 (시가총액 0 이하 종목은 0)
+    """
+    mcap = frame["market_cap"].to_numpy(dtype=np.float64)
+    flow = (frame["foreign_5d"].to_numpy(dtype=np.float64)
+            + frame["institution_5d"].to_numpy(dtype=np.float64))
+    osc = np.zeros_like(mcap)
+    np.divide(flow, mcap, out=osc, where=mcap > 0)
+    return osc * 100.0
+
+
+def _ensure_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS scan ("
+        "date TEXT NOT NULL, market TEXT NOT NULL, ticker TEXT NOT NULL, name TEXT, "
+        "market_cap REAL, foreign_5d REAL, institution_5d REAL, oscillator REAL, "
+        "PRIMARY KEY (date, market, ticker))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS scan_meta ("
+        "market TEXT PRIMARY KEY, date TEXT NOT NULL, scanned_at REAL NOT NULL)"
+    )
+
+
+def _load_cached(conn, market, allow_stale=False):
+    """저장된 스캔 결과 (오래된 결과는 allow_stale일 때만, 없으면 None)"""
+    row = conn.execute(
+        "SELECT date, scanned_at FROM scan_meta WHERE market = ?", (market,)
+    ).fetchone()
+    if row is None:
+        return None
+
+    date, scanned_at = row
+    if not allow_stale and not _is_fresh(date, scanned_at):
+        return None
+
+    frame = pd.read_sql_query(
+        "SELECT ticker, name, market, market_cap, foreign_5d, institution_5d, oscillator "
+        "FROM scan WHERE date = ? AND market = ?",
+        conn, params=(date, market), index_col="ticker"
+    )
+    frame.attrs["date"] = date
+    return frame
+
+
+def _is_fresh(date, scanned_at):
+    # 새 거래일이 시작되면 다시 스캔, 같은 거래일이면 데이터 확정 전에만 INTRADAY_TTL마다 갱신
+    # (휴장일/주말에는 마지막 거래일 결과를 계속 사용)
+    if date < trading_calendar.trading_date_key():
+        return False
+    last_day = datetime.strptime(date, "%Y%m%d")
+    return (trading_calendar.is_settled(last_day, scanned_at)
+            or time.time() - scanned_at <= INTRADAY_TTL)
+
+
+def _save(conn, market, frame):
+    date = frame.attrs["date"]
+    rows = list(zip(
+        [date] * len(frame), [market] * len(frame), frame.index.tolist(),
+        frame["name"].tolist(), frame["market_cap"].tolist(),
+        frame["foreign_5d"].tolist(), frame["institution_5d"].tolist(),
+        frame["oscillator"].tolist()
+    ))
+    with conn:
+        conn.execute("DELETE FROM scan WHERE market = ?", (market,))
+        conn.executemany("INSERT INTO scan VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO scan_meta (market, date, scanned_at) VALUES (?, ?, ?)",
+            (market, date, time.time())
+        )
+
+
+def get_market_frame(market):
+    """
+    한 시장의 오실레이터 계산 결과 (하루 단위 캐시)
+
+    Returns:
+        DataFrame: index=티커, columns=[name, market, market_cap, foreign_5d,
+                   institution_5d, oscillator]
+    """
+    conn = connect(DB_NAME)
+    try:
+        _ensure_schema(conn)
+        cached = _load_cached(conn, market)
+        if cached is not None:
+            count("market_scan.cache", "hit")
+            print(f"[market_scanner] {market} 캐시 사용 ({cached.attrs['date']})", file=sys.stderr)
+            return cached
+
+        count("market_scan.cache", "miss")
+        with span("market_scan.fetch"):
+            frame = snapshot_from_store(market)
+            if frame is not None:
+                print(f"[market_scanner] {market} 저장소 사용 ({frame.attrs['date']})", file=sys.stderr)
+            else:
+                print(f"[market_scanner] {market} 스냅샷 수집", file=sys.stderr)
+                try:
+                    frame = fetch_snapshot(market)
+                except Exception as e:
+                    # KRX 요청이 재시도 후에도 실패하면(서킷 열림 포함) 마지막 스캔 결과로 응답
+                    stale = _load_cached(conn, market, allow_stale=True)
+                    if stale is None:
+                        raise
+                    count("market_scan.cache", "stale")
+                    print(f"[market_scanner] {market} 수집 실패, 이전 결과 사용 "
+                          f"({stale.attrs['date']}): {e}", file=sys.stderr)
+                    return stale
+            set_rows(len(frame))
+        with span("market_scan.compute"):
+            frame["oscillator"] = compute_oscillator(frame)
+        _save(conn, market, frame)
+        return frame
+    finally:
+        conn.close()
+
+
+def scan_market(market="ALL", top_n=20):
+    """
+    시장 전체 수급 오실레이터 순위
+
+    Args:
+        market: "KOSPI", "KOSDAQ" 또는 "ALL"
+        top_n: 상위/하위 종목 수
+
+    Returns:
+        dict: {
+            "date": "YYYYMMDD",
+            "count": 전체 종목 수,
+            "top": [{"ticker", "name", "market", "market_cap", "foreign_5d",
+                     "institution_5d", "oscillator"}, ...],   # 순유입 상위
+            "bottom": [...]                                    # 순유출 상위
+        }
+    """
+    markets = MARKETS if market == "ALL" else (market,)
+    frames = [get_market_frame(m) for m in markets]
+    date = max(f.attrs.get("date", "") for f in frames)
+
+    frame = pd.concat(frames)
+    order = np.argsort(frame["oscillator"].to_numpy(), kind="stable")
+
+    def to_records(indices):
+        subset = frame.iloc[indices]
+        return [
+            {
+                "ticker": ticker,
+                "name": row["name"],
+                "market": row["market"],
+                "market_cap": row["market_cap"],
+                "foreign_5d": row["foreign_5d"],
+                "institution_5d": row["institution_5d"],
+                "oscillator": row["oscillator"],
+            }
+            for ticker, row in subset.iterrows()
+        ]
+
+    return {
+        "date": date,
+        "count": int(len(frame)),
+        "top": to_records(order[::-1][:top_n]),
+        "bottom": to_records(order[:top_n]),
+    }
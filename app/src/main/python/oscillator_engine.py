@@ -0,0 +1,273 @@
+"""
+수급 오실레이터 / MACD 계산 엔진 (NumPy)
+Kotlin OscillatorCalculator.calculate와 같은 결과를 float64 배열로 계산합니다.
+
+- 오실레이터: (외국인5일 + 기관5일) / 시가총액 * 100 (시가총액 0 이하면 0)
+- EMA: 첫 period개의 단순 평균으로 시작, 앞 period-1개는 0으로 채움
+- MACD = EMA12 - EMA26, Signal = MACD의 EMA9, Histogram = MACD - Signal
+
+Kotlin과 비트 단위로 같은 값을 내기 위해 합계/재귀식의 연산 순서를 그대로 따릅니다.
+"""
+
+import copy
+from collections import deque
+
+import numpy as np
+
+ROLLING_DAYS = 5
+EMA_PERIOD = 12
+MACD_FAST = 12
+MACD_SLOW = 26
+SIGNAL_PERIOD = 9
+
+
+def _as_float_array(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def calculate_oscillator(market_cap, foreign_5d, institution_5d):
+    """
+    수급 오실레이터 계산 (벡터 연산)
+
+    Returns:
+        ndarray: float64 오실레이터
+    """
+    mcap = _as_float_array(market_cap)
+    flow = _as_float_array(foreign_5d) + _as_float_array(institution_5d)
+
+    osc = np.zeros_like(mcap)
+    np.divide(flow, mcap, out=osc, where=mcap > 0)
+    osc *= 100.0
+    return osc
+
+
+def calculate_ema(values, period):
+    """
+    EMA 계산 (Kotlin calculateEMA와 동일한 시드/패딩 규칙)
+
+    - 첫 EMA는 앞 period개 값의 단순 평균 (값이 부족하면 전체 평균)
+    - 결과의 앞 period-1개는 0.0
+    - 입력 길이가 period보다 짧으면 모두 0.0 (Kotlin 결과의 앞 n개와 동일)
+
+    Returns:
+        ndarray: 입력과 같은 길이의 float64 배열
+    """
+    values = _as_float_array(values)
+    n = len(values)
+    result = np.zeros(n, dtype=np.float64)
+    if n < period:
+        return result
+
+    # 순차 합계 (Kotlin average()와 같은 순서)
+    total = 0.0
+    for value in values[:period].tolist():
+        total += value
+    ema = total / period
+    result[period - 1] = ema
+
+    multiplier = 2.0 / (period + 1)
+    tail = values[period:].tolist()
+    out = [0.0] * len(tail)
+    for i, value in enumerate(tail):
+        ema = (value - ema) * multiplier + ema
+        out[i] = ema
+    result[period:] = out
+    return result
+
+
+def calculate_indicators(oscillator):
+    """
+    오실레이터에서 EMA/MACD/Signal/Histogram 계산 (EMA12는 한 번만 계산)
+
+    Returns:
+        dict: {"ema", "macd", "signal", "histogram"} → float64 배열
+    """
+    oscillator = _as_float_array(oscillator)
+
+    ema_fast = calculate_ema(oscillator, MACD_FAST)
+    ema = ema_fast if EMA_PERIOD == MACD_FAST else calculate_ema(oscillator, EMA_PERIOD)
+    ema_slow = calculate_ema(oscillator, MACD_SLOW)
+
+    macd = ema_fast - ema_slow
+    signal = calculate_ema(macd, SIGNAL_PERIOD)
+    histogram = macd - signal
+
+    return {
+        "ema": ema,
+        "macd": macd,
+        "signal": signal,
+        "histogram": histogram,
+    }
+
+
+def calculate(market_cap, foreign_5d, institution_5d):
+    """
+    전체 지표 계산 (OscillatorCalculator.calculate 대응)
+
+    Returns:
+        dict: {"oscillator", "ema", "macd", "signal", "histogram"} → float64 배열
+    """
+    oscillator = calculate_oscillator(market_cap, foreign_5d, institution_5d)
+    result = {"oscillator": oscillator}
+    result.update(calculate_indicators(oscillator))
+    return result
+
+
+def calculate_from_stock_data(data):
+    """get_stock_data 결과 dict에서 전체 지표 계산"""
+    return calculate(data["market_cap"], data["foreign_5d"], data["institution_5d"])
+
+
+class _EmaState:
+    """EMA 누적 상태 (calculate_ema와 같은 시드/패딩 규칙을 한 값씩 적용)"""
+
+    def __init__(self, period, count=0, seed_sum=0.0, value=0.0):
+        self.period = period
+        self.multiplier = 2.0 / (period + 1)
+        self.count = count
+        self.seed_sum = seed_sum
+        self.value = value
+
+    def update(self, x):
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += x
+            return 0.0
+        if self.count == self.period:
+            self.seed_sum += x
+            self.value = self.seed_sum / self.period
+            return self.value
+        self.value = (x - self.value) * self.multiplier + self.value
+        return self.value
+
+    def to_dict(self):
+        return {"period": self.period, "count": self.count,
+                "seed_sum": self.seed_sum, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["period"], d["count"], d["seed_sum"], d["value"])
+
+
+class IncrementalOscillator:
+    """
+    거래일 단위로 한 건씩 추가하는 지표 상태 (추가 1건당 O(1))
+
+    get_stock_data와 같이 외국인/기관 일별 순매수의 5일 합계를 유지하고,
+    EMA12/EMA26/Signal 상태를 이어서 갱신합니다.
+    같은 시작일부터 전체를 다시 계산한 calculate() 결과와 같은 값을 냅니다.
+
+    - 5일 합계가 채워지기 전(처음 4일)은 get_stock_data의 dropna처럼 결과 없음
+    - 장중 값이 바뀐 마지막 날은 replace_last()로 교체
+    - to_dict()/from_dict()로 캐시와 함께 저장 가능
+    """
+
+    def __init__(self):
+        self.last_date = None
+        self.bars = 0
+        self._foreign = deque(maxlen=ROLLING_DAYS)
+        self._institution = deque(maxlen=ROLLING_DAYS)
+        self._foreign_sum = 0
+        self._institution_sum = 0
+        self._ema_fast = _EmaState(MACD_FAST)
+        self._ema = self._ema_fast if EMA_PERIOD == MACD_FAST else _EmaState(EMA_PERIOD)
+        self._ema_slow = _EmaState(MACD_SLOW)
+        self._signal = _EmaState(SIGNAL_PERIOD)
+        self._checkpoint = None
+
+    def _snapshot(self):
+        """체크포인트를 제외한 현재 상태 (고정 크기)"""
+        return {
+            "last_date": self.last_date,
+            "bars": self.bars,
+            "foreign": list(self._foreign),
+            "institution": list(self._institution),
+            "ema": None if self._ema is self._ema_fast else self._ema.to_dict(),
+            "ema_fast": self._ema_fast.to_dict(),
+            "ema_slow": self._ema_slow.to_dict(),
+            "signal": self._signal.to_dict(),
+        }
+
+    def append(self, date, market_cap, foreign, institution):
+        """
+        새 거래일 추가
+
+        Args:
+            date: 날짜 문자열 (YYYY-MM-DD)
+            market_cap: 시가총액
+            foreign: 외국인합계 일별 순매수 (5일 합계 아님)
+            institution: 기관합계 일별 순매수
+
+        Returns:
+            dict 또는 None: {"date", "market_cap", "foreign_5d", "institution_5d",
+                             "oscillator", "ema", "macd", "signal", "histogram"}
+        """
+        self._checkpoint = self._snapshot()
+
+        if len(self._foreign) == ROLLING_DAYS:
+            self._foreign_sum -= self._foreign[0]
+            self._institution_sum -= self._institution[0]
+        self._foreign.append(foreign)
+        self._institution.append(institution)
+        self._foreign_sum += foreign
+        self._institution_sum += institution
+        self.last_date = date
+
+        if len(self._foreign) < ROLLING_DAYS:
+            return None
+
+        mcap = float(market_cap)
+        foreign_5d = float(self._foreign_sum)
+        institution_5d = float(self._institution_sum)
+        osc = ((foreign_5d + institution_5d) / mcap) * 100.0 if mcap > 0 else 0.0
+
+        ema_fast = self._ema_fast.update(osc)
+        ema = ema_fast if self._ema is self._ema_fast else self._ema.update(osc)
+        macd = ema_fast - self._ema_slow.update(osc)
+        signal = self._signal.update(macd)
+        self.bars += 1
+
+        return {
+            "date": date,
+            "market_cap": market_cap,
+            "foreign_5d": foreign_5d,
+            "institution_5d": institution_5d,
+            "oscillator": osc,
+            "ema": ema,
+            "macd": macd,
+            "signal": signal,
+            "histogram": macd - signal,
+        }
+
+    def replace_last(self, date, market_cap, foreign, institution):
+        """마지막으로 추가한 거래일 값을 교체 (장중 → 종가 갱신)"""
+        if self._checkpoint is None:
+            raise ValueError("교체할 마지막 거래일이 없습니다")
+        self._restore(self._checkpoint)
+        return self.append(date, market_cap, foreign, institution)
+
+    def to_dict(self):
+        """JSON 직렬화 가능한 상태"""
+        state = self._snapshot()
+        state["checkpoint"] = copy.deepcopy(self._checkpoint)
+        return state
+
+    def _restore(self, state):
+        self.last_date = state["last_date"]
+        self.bars = state["bars"]
+        self._foreign = deque(state["foreign"], maxlen=ROLLING_DAYS)
+        self._institution = deque(state["institution"], maxlen=ROLLING_DAYS)
+        self._foreign_sum = sum(self._foreign)
+        self._institution_sum = sum(self._institution)
+        self._ema_fast = _EmaState.from_dict(state["ema_fast"])
+        self._ema = self._ema_fast if state["ema"] is None else _EmaState.from_dict(state["ema"])
+        self._ema_slow = _EmaState.from_dict(state["ema_slow"])
+        self._signal = _EmaState.from_dict(state["signal"])
+        self._checkpoint = copy.deepcopy(state.get("checkpoint"))
+
+    @classmethod
+    def from_dict(cls, state):
+        """to_dict() 결과로 상태 복원"""
+        instance = cls()
+        instance._restore(state)
+        return instance
@@ -0,0 +1,284 @@
+"""
+백그라운드 미리 받기(prefetch) 스케줄러
+관심종목/최근 검색 종목과 증시 자금 데이터를 장 마감 후(데이터 확정 후) 미리 받아
+로컬 캐시(timeseries_cache, deposit_store)를 채워 둡니다.
+
+- 작업은 우선순위(숫자가 작을수록 먼저) 순서로 최대 max_workers개 스레드에서 실행
+- 같은 키의 작업은 한 번만 대기열에 두고, 더 높은 우선순위로 다시 넣으면 우선순위만 올림
+- 작업마다 start_at 이전에는 시작하지 않음 (after_close: 오늘 거래일 데이터 확정 시각까지 대기)
+  시작 시각이 지난 작업끼리 우선순위 순서로 실행
+- 작업 스레드는 대기열이 비고 IDLE_TIMEOUT이 지나면 종료
+- status()로 진행 상황 확인
+"""
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+from datetime import datetime
+
+import trading_calendar
+
+MAX_WORKERS = 3
+IDLE_TIMEOUT = 30.0
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_WATCHLIST = 0
+PRIORITY_RECENT = 10
+PRIORITY_MARKET = 50
+
+# status()에 남길 최근 오류 수
+MAX_ERRORS = 20
+
+WHEN = ("now", "after_close")
+
+
+def next_run_time(when="after_close", now=None):
+    """
+    작업 시작 시각 (epoch 초)
+
+    after_close: 오늘이 거래일이고 데이터 확정 전(DATA_SETTLED)이면 확정 시각,
+                 아니면(장 시작 전, 휴장일, 확정 후) 바로 시작 (직전 거래일 데이터는 이미 확정)
+    """
+    now = now or datetime.now()
+    if when == "now":
+        return now.timestamp()
+    if when != "after_close":
+        raise ValueError(f"유효하지 않은 실행 시점입니다: {when} ({', '.join(WHEN)})")
+
+    settle_at = datetime.combine(now.date(), trading_calendar.DATA_SETTLED)
+    if trading_calendar.last_trading_day(now) == now.date() and now < settle_at:
+        return settle_at.timestamp()
+    return now.timestamp()
+
+
+class _Task:
+    __slots__ = ("key", "label", "fn", "priority", "start_at", "seq")
+
+    def __init__(self, key, label, fn, priority, start_at, seq):
+        self.key = key
+        self.label = label
+        self.fn = fn
+        self.priority = priority
+        self.start_at = start_at
+        self.seq = seq
+
+
+class PrefetchScheduler:
+    """우선순위 대기열 + 제한된 수의 작업 스레드"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self._cond = threading.Condition()
+        self._heap = []          # (priority, seq, key) 시작 시각이 지난 작업
+        self._delayed = []       # (start_at, seq, key) 시작 시각 전 작업
+        self._tasks = {}         # key -> _Task (대기 중)
+        self._running = {}       # key -> 라벨
+        self._seq = itertools.count()
+        self._workers = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._total = 0
+        self._completed = 0
+        self._skipped = 0
+        self._failed = 0
+        self._errors = []
+        self._started_at = None
+        self._finished_at = None
+
+    def submit(self, key, fn, priority=PRIORITY_RECENT, label=None, start_at=0.0):
+        """
+        작업 추가
+
+        Args:
+            key: 중복 확인용 키 (같은 키가 대기 중이면 우선순위/시작 시각만 앞당김)
+            fn: 인자 없는 함수. False를 반환하면 "이미 캐시됨"(건너뜀)으로 집계
+            priority: 작을수록 먼저
+            start_at: 이 시각(epoch 초) 이전에는 시작하지 않음 (next_run_time 참고)
+
+        Returns:
+            bool: 새로 추가했으면 True
+        """
+        with self._cond:
+            if key in self._running:
+                return False
+            task = self._tasks.get(key)
+            if task is not None:
+                if priority < task.priority or start_at < task.start_at:
+                    task.priority = min(priority, task.priority)
+                    task.start_at = min(start_at, task.start_at)
+                    task.seq = next(self._seq)
+                    self._push(task)
+                    self._cond.notify_all()
+                return False
+
+            if not self._tasks and not self._running:
+                self._reset_stats()
+            task = _Task(key, label or str(key), fn, priority, start_at, next(self._seq))
+            self._tasks[key] = task
+            self._push(task)
+            self._total += 1
+            self._spawn()
+            self._cond.notify()
+            return True
+
+    def _push(self, task):
+        """작업을 시작 시각에 따라 대기열에 넣음 (잠금 안에서 호출, 이전 항목은 seq로 무시)"""
+        if task.start_at > time.time():
+            heapq.heappush(self._delayed, (task.start_at, task.seq, task.key))
+        else:
+            heapq.heappush(self._heap, (task.priority, task.seq, task.key))
+
+    def cancel(self):
+        """
+        대기 중인 작업 취소 (실행 중인 작업은 끝까지 실행)
+
+        Returns:
+            int: 취소한 작업 수
+        """
+        with self._cond:
+            cancelled = len(self._tasks)
+            self._tasks.clear()
+            self._heap.clear()
+            self._delayed.clear()
+            self._total -= cancelled
+            self._cond.notify_all()
+            return cancelled
+
+    def wait(self, timeout=None):
+        """대기열과 실행 중 작업이 모두 끝날 때까지 대기 (끝났으면 True)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._tasks or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def status(self):
+        """
+        진행 상황
+
+        Returns:
+            dict: {"state": "idle"|"waiting"|"running", "start_at", "total", "completed",
+                   "skipped", "failed", "queued", "running", "progress", "started_at",
+                   "finished_at", "errors": [{"task", "error"}]}
+        """
+        with self._cond:
+            queued = len(self._tasks)
+            now = time.time()
+            delayed = [task.start_at for task in self._tasks.values() if task.start_at > now]
+            if self._running or len(delayed) < queued:
+                state = "running"
+            elif queued:
+                state = "waiting"
+            else:
+                state = "idle"
+            done = self._completed + self._skipped + self._failed
+            return {
+                "state": state,
+                "start_at": _iso(min(delayed)) if delayed else None,  # 시작 전 작업 중 가장 이른 시각
+                "total": self._total,
+                "completed": self._completed,
+                "skipped": self._skipped,
+                "failed": self._failed,
+                "queued": queued,
+                "running": sorted(self._running.values()),
+                "progress": done / self._total if self._total else 1.0,
+                "started_at": _iso(self._started_at),
+                "finished_at": _iso(self._finished_at),
+                "errors": list(self._errors),
+            }
+
+    # --- 작업 스레드 ---
+
+    def _spawn(self):
+        """필요하면 작업 스레드 추가 (잠금 안에서 호출)"""
+        if self._workers < self.max_workers and self._workers < len(self._tasks) + len(self._running):
+            self._workers += 1
+            threading.Thread(target=self._worker, name="prefetch", daemon=True).start()
+
+    def _next_task(self):
+        """실행할 작업 (없으면 IDLE_TIMEOUT 동안 기다린 뒤 None) (잠금 안에서 호출)"""
+        idle_since = time.monotonic()
+        while True:
+            # 시작 시각이 지난 작업을 우선순위 대기열로 옮김
+            now = time.time()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, seq, key = heapq.heappop(self._delayed)
+                task = self._tasks.get(key)
+                if task is not None and task.seq == seq:
+                    heapq.heappush(self._heap, (task.priority, seq, key))
+
+            if self._heap:
+                _, seq, key = heapq.heappop(self._heap)
+                task = self._tasks.get(key)
+                if task is None or task.seq != seq:
+                    continue  # 우선순위/시작 시각이 바뀌었거나 취소된 항목
+                del self._tasks[key]
+                return task
+
+            if self._delayed:
+                self._cond.wait(self._delayed[0][0] - now)
+            else:
+                remaining = IDLE_TIMEOUT - (time.monotonic() - idle_since)
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                if task is None:
+                    self._workers -= 1
+                    return
+                self._running[task.key] = task.label
+                if self._started_at is None:
+                    self._started_at = time.time()
+
+            error = None
+            fetched = True
+            try:
+                fetched = task.fn() is not False
+            except Exception as e:
+                error = e
+                print(f"[prefetch_scheduler] {task.label} 실패: {e}", file=sys.stderr)
+
+            with self._cond:
+                del self._running[task.key]
+                if error is not None:
+                    self._failed += 1
+                    self._errors.append({"task": task.label, "error": str(error)})
+                    del self._errors[:-MAX_ERRORS]
+                elif fetched:
+                    self._completed += 1
+                else:
+                    self._skipped += 1
+                if not self._tasks and not self._running:
+                    self._finished_at = time.time()
+                    print(f"[prefetch_scheduler] 완료: 수집 {self._completed}, 캐시 {self._skipped}, "
+                          f"실패 {self._failed}", file=sys.stderr)
+                self._cond.notify_all()
+
+
+def _iso(timestamp):
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 공용 스케줄러"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrefetchScheduler()
+        return _scheduler
@@ -0,0 +1,134 @@
+"""
+요청 병합(single-flight) 및 짧은 TTL 결과 캐시 모듈
+같은 요청이 몇 초 안에 여러 번 들어와도(두 ViewModel, 재탭 등) 실제 수집은 한 번만 수행합니다.
+
+- SingleFlight: 같은 키로 동시에 들어온 호출은 먼저 시작한 호출의 결과를 함께 받음
+- ResultCache:  키별 결과를 ttl초 동안 보관, 최대 maxsize개 (LRU 제거)
+
+키에는 거래일(trading_date)을 포함하여 날짜가 바뀌면 이전 결과를 쓰지 않습니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import trading_calendar
+
+MISSING = object()
+
+
+def trading_date():
+    """캐시 키용 거래일 (YYYYMMDD, 휴장일에는 직전 거래일)"""
+    return trading_calendar.trading_date_key()
+
+
+class ResultCache:
+    """TTL + LRU 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize=64, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """저장된 값 또는 MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def items(self):
+        """만료되지 않은 (키, 값) 목록"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, entry[1]) for key, entry in self._entries.items() if entry[0] >= now]
+
+    def clear(self, predicate=None):
+        """전체 또는 predicate(key)가 참인 항목 삭제"""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """동일 키 동시 호출 병합"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        key로 진행 중인 호출이 있으면 그 결과를, 없으면 fn()을 실행하여 반환
+
+        Returns:
+            tuple: (결과, 다른 호출의 결과를 공유했는지 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            return self._wait(call), True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def wait_any(self, predicate):
+        """
+        predicate(key)가 참인 진행 중 호출이 있으면 끝날 때까지 기다려 (키, 결과) 반환
+
+        Returns:
+            tuple 또는 MISSING
+        """
+        with self._lock:
+            matches = [(key, call) for key, call in self._calls.items() if predicate(key)]
+        if not matches:
+            return MISSING
+        key, call = matches[0]
+        return key, self._wait(call)
+
+    @staticmethod
+    def _wait(call):
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
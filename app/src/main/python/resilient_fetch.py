@@ -0,0 +1,395 @@
+"""
+외부 서비스 호출 공용 계층 (재시도, 백오프, 헤지 요청, 서킷 브레이커)
+네이버 증권 페이지 요청과 pykrx(KRX) 호출을 호스트별 정책으로 감쌉니다.
+
+- 호스트별 동시 요청 수 제한 (세마포어)
+- 일시적 오류는 지터를 넣은 지수 백오프로 재시도 (full jitter, 전체 시간 한도 안에서)
+- 헤지 요청: 첫 시도가 최근 응답 시간 분포(p90)보다 늦으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 요청을 보내지 않고 바로 실패(CircuitOpenError)
+  → 호출자는 fallback으로 저장된(오래된) 데이터를 제공
+- 결과는 instrumentation 카운터 "fetch.<호스트>"에 ok/retry/hedge/hedge_win/failed/open/stale로 기록
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from instrumentation import count
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 요청을 보내지 않음"""
+
+
+class RetryableStatus(Exception):
+    """재시도할 HTTP 상태 코드 (429, 5xx)"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class Policy:
+    """
+    호스트별 호출 정책
+
+    Args:
+        max_concurrency: 동시 요청 수
+        retries: 첫 시도 이후 재시도 횟수
+        backoff_base / backoff_cap: 재시도 대기 상한 = min(cap, base * 2^시도) (0~상한에서 무작위)
+        deadline: 호출 하나의 전체 시간 한도 (초, 재시도 포함)
+        timeout: HTTP 요청 timeout (connect, read)
+        hedge: 헤지 요청 사용 여부
+        hedge_min / hedge_max: 헤지 지연 범위 (초), 그 사이에서 최근 응답 시간 p90 사용
+        failure_threshold: 서킷을 여는 연속 실패 호출 수 (재시도까지 모두 실패한 호출)
+        open_seconds: 서킷을 열어 두는 시간 (이후 한 번 시험 요청)
+    """
+
+    def __init__(self, max_concurrency=4, retries=2, backoff_base=0.25, backoff_cap=4.0,
+                 deadline=20.0, timeout=(3.05, 8.0), hedge=False, hedge_min=0.3, hedge_max=3.0,
+                 failure_threshold=5, open_seconds=30.0):
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.deadline = deadline
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_min = hedge_min
+        self.hedge_max = hedge_max
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+
+
+DEFAULT_POLICIES = {
+    # 네이버 증권: 페이지 단위, 헤지 사용 (같은 페이지 GET은 멱등)
+    "naver": Policy(max_concurrency=5, retries=3, deadline=15.0, timeout=(3.05, 6.0), hedge=True),
+    # KRX(pykrx): 요청 하나가 무겁고 서버 제한이 엄격하므로 헤지 없이 재시도만
+    "krx": Policy(max_concurrency=6, retries=2, backoff_base=0.5, deadline=30.0, timeout=(3.05, 12.0)),
+}
+
+# 응답 시간 기록 개수 (헤지 지연 계산용)
+LATENCY_WINDOW = 64
+MIN_LATENCY_SAMPLES = 10
+
+
+class CircuitBreaker:
+    """closed → (연속 실패) → open → (open_seconds 후) half_open → 성공 시 closed / 실패 시 open"""
+
+    def __init__(self, failure_threshold=5, open_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """요청을 보내도 되는지 (half_open에서는 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """
+        Returns:
+            bool: 이번 실패로 서킷이 열렸으면 True
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def retry_in(self):
+        """다시 시험 요청을 보낼 수 있을 때까지 남은 시간 (초)"""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+
+class _Host:
+    """호스트별 상태 (세마포어, 브레이커, 최근 응답 시간)"""
+
+    def __init__(self, name, policy):
+        self.name = name
+        self.policy = policy
+        self.semaphore = threading.BoundedSemaphore(policy.max_concurrency)
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.open_seconds)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.lock = threading.Lock()
+        self.rate_limiter = None
+
+    def hedge_delay(self):
+        """최근 성공 응답 시간 p90 (범위 제한, 기록이 적으면 hedge_max)"""
+        with self.lock:
+            samples = sorted(self.latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return self.policy.hedge_max
+        p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+        return min(self.policy.hedge_max, max(self.policy.hedge_min, p90))
+
+    def record_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+# 헤지 요청용 스레드 (느린 첫 시도는 끝날 때까지 이 풀에서 계속 실행)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_host(name):
+    with _hosts_lock:
+        host = _hosts.get(name)
+        if host is None:
+            host = _hosts[name] = _Host(name, DEFAULT_POLICIES.get(name) or Policy())
+        return host
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fetch")
+        return _executor
+
+
+def configure(name, policy):
+    """호스트 정책 변경 (상태 초기화)"""
+    with _hosts_lock:
+        DEFAULT_POLICIES[name] = policy
+        _hosts.pop(name, None)
+
+
+def set_rate_limiter(name, limiter):
+    """
+    호스트 요청 속도 제한 설정 (시도마다 limiter.acquire() 호출, None이면 해제)
+
+    재시도와 헤지 요청도 각각 한 번의 요청으로 셉니다.
+    """
+    _get_host(name).rate_limiter = limiter
+
+
+def reset():
+    """모든 호스트 상태 초기화 (브레이커 닫힘, 응답 시간 기록 삭제)"""
+    with _hosts_lock:
+        _hosts.clear()
+
+
+def status():
+    """
+    호스트별 상태
+
+    Returns:
+        dict: {호스트: {"state", "failures", "retry_in", "hedge_delay"}}
+    """
+    with _hosts_lock:
+        hosts = list(_hosts.values())
+    return {
+        host.name: {
+            "state": host.breaker.state,
+            "failures": host.breaker.failures,
+            "retry_in": round(host.breaker.retry_in(), 1),
+            "hedge_delay": round(host.hedge_delay(), 3) if host.policy.hedge else None,
+        }
+        for host in hosts
+    }
+
+
+def timeout(host_name):
+    """호스트 정책의 HTTP 요청 timeout (connect, read)"""
+    return _get_host(host_name).policy.timeout
+
+
+def _is_retryable(error):
+    """재시도할 오류인지 (요청 형식 오류 등은 재시도하지 않음)"""
+    if isinstance(error, RetryableStatus):
+        return True
+    try:
+        import requests
+    except ImportError:
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is None or response.status_code == 429 or response.status_code >= 500
+    return not isinstance(error, (TypeError, AttributeError, NotImplementedError))
+
+
+def _attempt(host, fn):
+    """동시 요청 수 제한 안에서 한 번 시도 (성공 시 응답 시간 기록)"""
+    if host.rate_limiter is not None:
+        host.rate_limiter.acquire()
+    with host.semaphore:
+        start = time.monotonic()
+        result = fn()
+        host.record_latency(time.monotonic() - start)
+        return result
+
+
+def _hedged(host, fn, deadline):
+    """
+    첫 시도가 hedge_delay 안에 끝나지 않으면 두 번째 시도를 보내 먼저 성공한 결과 사용
+
+    두 번째 시도는 동시 요청 한도에 여유가 있을 때만 보냅니다 (포화 상태에서 부하를 늘리지 않음).
+    """
+    executor = _get_executor()
+    first = executor.submit(_attempt, host, fn)
+    done, _ = wait([first], timeout=min(host.hedge_delay(), max(0.0, deadline - time.monotonic())))
+    if done:
+        return first.result()
+
+    if not host.semaphore.acquire(blocking=False):
+        return first.result(timeout=max(0.0, deadline - time.monotonic()))
+    host.semaphore.release()
+
+    count(f"fetch.{host.name}", "hedge")
+    second = executor.submit(_attempt, host, fn)
+    pending = {first, second}
+    error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is second:
+                    count(f"fetch.{host.name}", "hedge_win")
+                return future.result()
+            error = future.exception()
+    raise error or TimeoutError(f"{host.name} 응답 시간 초과")
+
+
+def call(host_name, fn, fallback=None, hedge=None):
+    """
+    fn()을 호스트 정책에 따라 호출
+
+    Args:
+        host_name: "naver", "krx" 등 (정책/브레이커 단위)
+        fn: 인자 없는 함수 (멱등이어야 함: 재시도/헤지로 여러 번 실행될 수 있음)
+        fallback: 실패(서킷 열림 포함) 시 대신 반환할 값을 만드는 함수 (예: 저장된 데이터)
+                  None을 반환하면 원래 오류를 그대로 발생
+        hedge: 헤지 사용 여부 (None이면 정책 기본값)
+
+    Raises:
+        CircuitOpenError: 서킷이 열려 있고 fallback 결과가 없음
+        Exception: 재시도 후에도 실패하고 fallback 결과가 없음
+    """
+    host = _get_host(host_name)
+    policy = host.policy
+    hedge = policy.hedge if hedge is None else hedge
+    deadline = time.monotonic() + policy.deadline
+    counter = f"fetch.{host_name}"
+
+    if not host.breaker.allow():
+        count(counter, "open")
+        return _fall_back(counter, fallback, CircuitOpenError(
+            f"{host_name} 서킷 열림 ({host.breaker.retry_in():.0f}초 후 재시도)"
+        ))
+
+    error = None
+    for attempt in range(policy.retries + 1):
+        try:
+            result = _hedged(host, fn, deadline) if hedge else _attempt(host, fn)
+            host.breaker.record_success()
+            count(counter, "ok")
+            return result
+        except Exception as e:
+            error = e
+            if not _is_retryable(e) or attempt == policy.retries:
+                break
+
+            wait_for = random.uniform(0, min(policy.backoff_cap, policy.backoff_base * (2 ** attempt)))
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after:
+                wait_for = max(wait_for, retry_after)
+            if time.monotonic() + wait_for >= deadline:
+                break
+            count(counter, "retry")
+            print(f"[resilient_fetch] {host_name} 재시도 {attempt + 1}/{policy.retries} "
+                  f"({wait_for:.2f}초 후): {e}", file=sys.stderr)
+            time.sleep(wait_for)
+
+    # 브레이커는 시도 단위가 아닌 호출 단위(재시도 후 최종 결과)로 실패를 셈
+    if host.breaker.record_failure():
+        print(f"[resilient_fetch] {host_name} 서킷 열림: {error}", file=sys.stderr)
+    count(counter, "failed")
+    return _fall_back(counter, fallback, error)
+
+
+def _fall_back(counter, fallback, error):
+    if fallback is not None:
+        value = fallback()
+        if value is not None:
+            count(counter, "stale")
+            print(f"[resilient_fetch] 저장된 데이터로 대체: {error}", file=sys.stderr)
+            return value
+    raise error
+
+
+def get(url, host_name="naver", session=None, fallback=None, **kwargs):
+    """
+    HTTP GET (call()로 감싼 요청)
+
+    429/5xx 응답은 RetryableStatus로 재시도하며, 304 등 그 밖의 응답은 그대로 반환합니다.
+    timeout을 지정하지 않으면 정책의 (connect, read) timeout을 사용합니다.
+    """
+    if session is None:
+        from http_session import get_session
+        session = get_session()
+    kwargs.setdefault("timeout", timeout(host_name))
+
+    def request():
+        return check_status(session.get(url, **kwargs))
+
+    return call(host_name, request, fallback=fallback)
+
+
+def check_status(response):
+    """429/5xx 응답이면 RetryableStatus 발생 (Retry-After 헤더 반영), 아니면 response 그대로 반환"""
+    if response.status_code == 429 or response.status_code >= 500:
+        retry_after = response.headers.get("Retry-After")
+        raise RetryableStatus(
+            response.status_code,
+            float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+    return response
+
+
+def krx(fn, *args, fallback=None, **kwargs):
+    """
+    pykrx 함수 호출 (예: krx(stock.get_market_cap, "20240102", market="KOSPI"))
+
+    처음 호출할 때 pykrx가 공용 연결 풀과 기본 timeout을 쓰도록 설정합니다
+    (헤지 없는 시도는 호출 스레드에서 실행되므로 요청 timeout이 없으면 deadline으로 끊을 수 없음).
+    """
+    from http_session import install_pykrx_session
+
+    install_pykrx_session()
+    return call("krx", lambda: fn(*args, **kwargs), fallback=fallback)
@@ -5,39 +5,159 @@ deposit_scraper와 stock_data_fetcher를 통합하여 사용
 ✅ 개선사항 (3단계):
 - import 실패 시 조기 종료하여 후속 에러 방지
 - 더 명확한 에러 메시지
+
+✅ 개선사항 (콜드 스타트):
+- pandas/pykrx/requests 등 무거운 모듈은 각 함수가 처음 호출될 때 import
+- warm_up()으로 백그라운드 스레드에서 미리 불러오기
+- get_import_report()로 import 시간 확인
+- import 실패는 조기 종료 대신 해당 함수의 오류 JSON으로 반환
 """
 
 import json
 import sys
 import traceback
+from datetime import datetime, timedelta
+
+from import_timer import load_module, warm_up as _warm_up, report as _import_report
+from instrumentation import (
+    count,
+    entry_point,
+    span,
+    set_rows,
+    set_mode as _set_metrics_mode,
+    snapshot as _metrics_snapshot,
+    reset as _reset_metrics
+)
+from request_cache import MISSING, ResultCache, SingleFlight, trading_date
+
+# 배치 분석 시 동시 수집 스레드 수 / 최대 종목 수
+MAX_BATCH_WORKERS = 8
+MAX_BATCH_TICKERS = 100
+
+# 반환 형식: JSON 문자열(기본) 또는 bridge_codec 바이너리(bytes)
+FORMATS = ("json", "binary")
+
+# 같은 요청 결과 재사용 시간(초) / 최대 보관 수
+RESULT_TTL = 60
+RESULT_CACHE_SIZE = 64
+
+# warm_up()에서 미리 불러올 모듈 (앱에서 먼저 쓰이는 순서)
+WARM_UP_MODULES = (
+    "stock_search",
+    "deposit_store",
+    "stock_data_fetcher",
+    "bridge_codec",
+    "oscillator_engine",
+    "http_session",
+    "market_scanner",
+)
+
+_results = ResultCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_TTL)
+_in_flight = SingleFlight()
+
+
+def _coalesced(name, args, compute, covers=None, narrow=None):
+    """
+    요청 병합 + 짧은 TTL 캐시
+
+    1. 같은 (name, args, 거래일) 결과가 캐시에 있으면 사용
+    2. covers(다른 args, args)가 참인 더 넓은 결과가 캐시에 있으면 narrow(다른 args, 결과)로 잘라서 사용
+    3. 캐시된 결과로 만들 수 없을 때만 진행 중인 더 넓은 요청을 기다려 잘라서 사용
+    4. 같은 요청이 진행 중이면 그 결과를 기다리고, 없으면 compute() 실행
+
+    None 결과(수집 실패)는 캐시하지 않습니다.
+
+    Returns:
+        dict 또는 None: 호출자가 키를 추가해도 되도록 얕은 복사본
+    """
+    date = trading_date()
+    key = (name, args, date)
+
+    value = _results.get(key)
+    if value is not MISSING:
+        count("request_cache", "hit")
+        return dict(value)
+
+    if covers is not None:
+        def is_wider(other):
+            return other[0] == name and other[2] == date and covers(other[1], args)
+
+        def narrowed(found):
+            if found is MISSING or found[1] is None:
+                return None
+            return narrow(found[0][1], found[1])
+
+        # 캐시된 결과로 충분하면 진행 중인(느린) 더 넓은 요청을 기다리지 않음
+        value = None
+        wider = sorted(((k, v) for k, v in _results.items() if is_wider(k)), key=lambda item: item[0])
+        for found in wider:
+            value = narrowed(found)
+            if value is not None:
+                break
+        if value is None:
+            try:
+                value = narrowed(_in_flight.wait_any(is_wider))
+            except Exception:
+                pass  # 더 넓은 요청이 실패하면 직접 수집
+        if value is not None:
+            count("request_cache", "window")
+            _results.put(key, value)
+            return dict(value)
+
+    value, shared = _in_flight.do(key, compute)
+    count("request_cache", "coalesced" if shared else "miss")
+    if value is None:
+        return None
+    if not shared:
+        _results.put(key, value)
+    return dict(value)
+
+
+def _load_stock_data(ticker, days):
+    """get_stock_data (동일 요청 병합, 더 긴 기간 결과 재사용)"""
+    fetcher = load_module("stock_data_fetcher")
+    return _coalesced(
+        "get_stock_data", (ticker, days),
+        lambda: fetcher.get_stock_data(ticker, days),
+        covers=lambda other, args: other[0] == args[0] and other[1] > args[1],
+        narrow=lambda other, data: fetcher.slice_stock_data(data, days)
+    )
+
+
+def _load_stock_chunk(ticker, chunk_start, chunk_end, start):
+    """iter_stock_data 조각 하나 (동일 요청 병합, 짧은 TTL 캐시)"""
+    fetcher = load_module("stock_data_fetcher")
+    return _coalesced(
+        "get_stock_chunk", (ticker, chunk_start, chunk_end, start),
+        lambda: fetcher.get_stock_chunk(ticker, chunk_start, chunk_end, start)
+    )
 
-# 명시적으로 모듈 import - 실패 시 프로그램 종료
-try:
-    from deposit_scraper import scrape_deposit_data, get_latest_data
-    from stock_data_fetcher import (
-        search_stock,
-        get_stock_data,
-        get_stock_name,
-        get_all_stocks
+
+def _load_deposit_data(num_pages):
+    """get_deposit_data (동일 요청 병합, 더 많은 페이지 결과 재사용)"""
+    store = load_module("deposit_store")
+    return _coalesced(
+        "get_deposit_data", (num_pages,),
+        lambda: store.get_deposit_data(num_pages),
+        covers=lambda other, args: other[0] > args[0],
+        narrow=lambda other, data: store.slice_pages(data, num_pages)
     )
-    print("[stock_analyzer] 모든 모듈 import 성공", file=sys.stderr)
-except ImportError as e:
-    # ✅ 개선: 치명적 오류로 처리하고 조기 종료
-    error_msg = f"CRITICAL: 필수 모듈을 불러올 수 없습니다: {e}"
-    print(error_msg, file=sys.stderr)
-    traceback.print_exc(file=sys.stderr)
-    # 모듈이 없으면 앱이 제대로 작동하지 않으므로 조기 종료
-    # Android에서 Python 프로세스 실패를 감지할 수 있도록 명확한 에러 출력
-    print(json.dumps({"error": "모듈 import 실패", "details": str(e)}, ensure_ascii=False))
-    sys.exit(1)
-except Exception as e:
-    error_msg = f"CRITICAL: 예상치 못한 오류: {e}"
-    print(error_msg, file=sys.stderr)
-    traceback.print_exc(file=sys.stderr)
-    print(json.dumps({"error": "초기화 실패", "details": str(e)}, ensure_ascii=False))
-    sys.exit(1)
 
 
+def _respond(data, rows, encode=None):
+    """
+    성공 응답 직렬화 (반환 행 수와 직렬화 시간 기록)
+
+    encode가 없으면 JSON 문자열로 직렬화합니다.
+    """
+    set_rows(rows)
+    with span("serialize"):
+        if encode is not None:
+            return encode(data)
+        return json.dumps(data, ensure_ascii=False)
+
+
+@entry_point("search_stock_wrapper")
 def search_stock_wrapper(query):
     """
     종목 검색
@@ -57,13 +177,14 @@ def search_stock_wrapper(query):
         if not query or not query.strip():
             return json.dumps({"error": "검색어를 입력해주세요"}, ensure_ascii=False)
 
-        matches = search_stock(query)
+        matches = load_module("stock_search").search_top_k(query, limit=1)
 
         if not matches:
             return json.dumps({"error": "종목을 찾을 수 없습니다"}, ensure_ascii=False)
 
         # 가장 관련성 높은 종목 반환
-        return json.dumps(matches[0], ensure_ascii=False)
+        best = matches[0]
+        return json.dumps({"ticker": best["ticker"], "name": best["name"]}, ensure_ascii=False)
 
     except Exception as e:
         error_msg = f"검색 오류: {str(e)}\n{traceback.format_exc()}"
@@ -71,7 +192,41 @@ def search_stock_wrapper(query):
         return json.dumps({"error": f"검색 중 오류 발생: {str(e)}"}, ensure_ascii=False)
 
 
-def get_stock_analysis(ticker, days=180):
+@entry_point("search_stocks_autocomplete")
+def search_stocks_autocomplete(query, limit=20):
+    """
+    종목 자동완성 검색 (관련도 순 상위 k개)
+
+    Parameters:
+    -----------
+    query : str
+        검색어 (종목명, 코드, 초성)
+    limit : int
+        최대 결과 수
+
+    Returns:
+    --------
+    str
+        JSON 문자열: [{"ticker": "005930", "name": "삼성전자", "rank": 1}, ...]
+    """
+    try:
+        if not query or not query.strip():
+            return json.dumps([], ensure_ascii=False)
+
+        if limit <= 0 or limit > 100:
+            return json.dumps({"error": "유효하지 않은 결과 수입니다 (1-100)"}, ensure_ascii=False)
+
+        matches = load_module("stock_search").search_top_k(query, limit=limit)
+        return _respond(matches, len(matches))
+
+    except Exception as e:
+        error_msg = f"자동완성 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"자동완성 검색 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_stock_analysis")
+def get_stock_analysis(ticker, days=180, fmt="json"):
     """
     종목의 시가총액 및 투자자별 거래 데이터 수집
 
@@ -81,24 +236,31 @@ def get_stock_analysis(ticker, days=180):
         종목 코드
     days : int
         분석 기간 (일)
+    fmt : str
+        "json" 또는 "binary"
 
     Returns:
     --------
-    str
-        JSON 문자열
+    str or bytes
+        JSON 문자열 (fmt="binary"면 bridge_codec 종목 페이로드, 오류는 항상 JSON 문자열)
     """
     try:
         # 입력 검증
         if not ticker or not ticker.strip():
             return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
 
+        if fmt not in FORMATS:
+            return json.dumps({"error": "유효하지 않은 형식입니다 (json, binary)"}, ensure_ascii=False)
+
         if days <= 0 or days > 3650:  # 최대 10년
             return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
 
         print(f"[stock_analyzer] 종목 분석 시작: {ticker}, {days}일", file=sys.stderr)
 
-        # 종목 데이터 수집
-        data = get_stock_data(ticker, days)
+        fetcher = load_module("stock_data_fetcher")
+
+        # 종목 데이터 수집 (동시/반복 요청은 한 번만 수집)
+        data = _load_stock_data(ticker, days)
 
         if data is None:
             return json.dumps({
@@ -106,12 +268,14 @@ def get_stock_analysis(ticker, days=180):
             }, ensure_ascii=False)
 
         # 종목명 추가
-        stock_name = get_stock_name(ticker)
+        stock_name = fetcher.get_stock_name(ticker)
         data["ticker"] = ticker
         data["name"] = stock_name or ticker
 
         print(f"[stock_analyzer] 종목 분석 완료: {data['name']}, {len(data.get('dates', []))}개 데이터", file=sys.stderr)
-        return json.dumps(data, ensure_ascii=False)
+        if fmt == "binary":
+            return _respond(data, len(data["dates"]), load_module("bridge_codec").encode_stock_data)
+        return _respond(data, len(data["dates"]))
 
     except Exception as e:
         error_msg = f"분석 오류: {str(e)}\n{traceback.format_exc()}"
@@ -119,6 +283,390 @@ def get_stock_analysis(ticker, days=180):
         return json.dumps({"error": f"분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
 
 
+@entry_point("get_stock_indicators")
+def get_stock_indicators(ticker, days=180):
+    """
+    종목 데이터 + 수급 오실레이터/MACD 지표 (Python 쪽에서 계산)
+
+    Parameters:
+    -----------
+    ticker : str
+        종목 코드
+    days : int
+        분석 기간 (일)
+
+    Returns:
+    --------
+    str
+        JSON 문자열: get_stock_analysis 결과에
+        "oscillator", "ema", "macd", "signal", "histogram" 추가
+    """
+    try:
+        # 입력 검증
+        if not ticker or not ticker.strip():
+            return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
+
+        if days <= 0 or days > 3650:  # 최대 10년
+            return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
+
+        fetcher = load_module("stock_data_fetcher")
+        data = _load_stock_data(ticker, days)
+
+        if data is None:
+            return json.dumps({"error": "데이터를 가져올 수 없습니다"}, ensure_ascii=False)
+
+        data["ticker"] = ticker
+        data["name"] = fetcher.get_stock_name(ticker) or ticker
+
+        with span("indicators"):
+            indicators = load_module("oscillator_engine").calculate_from_stock_data(data)
+            for key, values in indicators.items():
+                data[key] = values.tolist()
+
+        print(f"[stock_analyzer] 지표 계산 완료: {data['name']}, {len(data['dates'])}개 데이터", file=sys.stderr)
+        return _respond(data, len(data["dates"]))
+
+    except Exception as e:
+        error_msg = f"지표 계산 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"지표 계산 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+def _latest_indicators(ticker):
+    """
+    단일 종목 증분 지표 갱신 (get_latest_indicators용)
+
+    Returns:
+        tuple: (마지막 거래일 지표 dict 또는 None, 오류 메시지 또는 None)
+    """
+    try:
+        fetcher = load_module("stock_data_fetcher")
+        bar = fetcher.update_indicator_state(ticker)
+        if bar is None:
+            return None, "데이터를 가져올 수 없습니다"
+
+        bar["ticker"] = ticker
+        bar["name"] = fetcher.get_stock_name(ticker) or ticker
+        return bar, None
+
+    except Exception as e:
+        print(f"[stock_analyzer] 증분 지표 갱신 실패 ({ticker}): {e}", file=sys.stderr)
+        return None, f"지표 계산 중 오류 발생: {str(e)}"
+
+
+@entry_point("get_latest_indicators")
+def get_latest_indicators(tickers):
+    """
+    여러 종목의 최신 거래일 지표 (관심종목 새로고침용, 증분 계산)
+
+    종목마다 저장된 IncrementalOscillator 상태에 새 거래일만 추가하므로
+    처음 한 번 이후에는 전체 구간을 다시 계산하지 않습니다.
+    (시작일은 stock_data_fetcher.indicator_start_date, 미리 받기 작업도 같은 상태를 갱신)
+
+    Parameters:
+    -----------
+    tickers : str or list
+        종목 코드 리스트 (JSON 배열 문자열 또는 리스트)
+
+    Returns:
+    --------
+    str
+        JSON 문자열:
+        {
+            "results": {"005930": {"ticker", "name", "date", "market_cap", "foreign_5d",
+                                   "institution_5d", "oscillator", "ema", "macd",
+                                   "signal", "histogram"}, ...},
+            "errors": {"000000": "데이터를 가져올 수 없습니다", ...}
+        }
+    """
+    try:
+        if isinstance(tickers, str):
+            tickers = json.loads(tickers)
+
+        # 입력 검증 (공백 제거, 중복 제거, 순서 유지)
+        tickers = list(dict.fromkeys(str(t).strip() for t in tickers if t and str(t).strip()))
+
+        if not tickers:
+            return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
+
+        if len(tickers) > MAX_BATCH_TICKERS:
+            return json.dumps({
+                "error": f"한 번에 조회할 수 있는 종목 수를 초과했습니다 (최대 {MAX_BATCH_TICKERS}개)"
+            }, ensure_ascii=False)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # 스레드마다 import하지 않도록 먼저 불러오기
+        load_module("stock_data_fetcher")
+
+        results = {}
+        errors = {}
+        workers = min(MAX_BATCH_WORKERS, len(tickers))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for ticker, (bar, error) in zip(tickers, executor.map(_latest_indicators, tickers)):
+                if error is None:
+                    results[ticker] = bar
+                else:
+                    errors[ticker] = error
+
+        return _respond({"results": results, "errors": errors}, len(results))
+
+    except Exception as e:
+        error_msg = f"증분 지표 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"지표 계산 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_signal_backtest")
+def get_signal_backtest(ticker, days=730, params=None):
+    """
+    매매 신호(analyzeSignal 점수) 백테스트
+
+    Parameters:
+    -----------
+    ticker : str
+        종목 코드
+    days : int
+        백테스트 기간 (일)
+    params : str
+        JSON 문자열: backtest.DEFAULT_PARAMS 중 바꿀 항목 (예: {"weak_threshold": 0.3})
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"ticker", "name", "dates", "score", "signals",
+                      "params", "summary", "buckets"}
+    """
+    try:
+        # 입력 검증
+        if not ticker or not ticker.strip():
+            return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
+
+        if days <= 0 or days > 3650:  # 최대 10년
+            return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
+
+        try:
+            overrides = json.loads(params) if params else None
+        except json.JSONDecodeError:
+            return json.dumps({"error": "파라미터 형식이 올바르지 않습니다 (JSON 객체)"}, ensure_ascii=False)
+
+        backtest = load_module("backtest")
+        try:
+            backtest.resolve_params(overrides)
+        except (TypeError, ValueError) as e:
+            return json.dumps({"error": str(e)}, ensure_ascii=False)
+
+        data = _load_stock_data(ticker, days)
+        if data is None:
+            return json.dumps({"error": "데이터를 가져올 수 없습니다"}, ensure_ascii=False)
+
+        with span("backtest"):
+            result = backtest.run(data, overrides, include_series=True)
+
+        result["ticker"] = ticker
+        result["name"] = load_module("stock_data_fetcher").get_stock_name(ticker) or ticker
+        result["dates"] = data["dates"]
+
+        summary = result["summary"]
+        print(f"[stock_analyzer] 백테스트 완료: {result['name']}, 거래 {summary['trades']}회", file=sys.stderr)
+        return _respond(result, len(data["dates"]))
+
+    except Exception as e:
+        error_msg = f"백테스트 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"백테스트 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_supply_analytics")
+def get_supply_analytics(ticker, days=180, windows=None):
+    """
+    투자자별 수급 분석 (모든 투자자 컬럼, 기간별 누적 순매수와 오실레이터)
+
+    Parameters:
+    -----------
+    ticker : str
+        종목 코드
+    days : int
+        분석 기간 (일)
+    windows : str
+        JSON 배열 문자열: 누적 기간 목록 (거래일, 기본 [5, 20, 60])
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"ticker", "name", "dates", "market_cap", "investors", "windows",
+                      "net", "oscillator", "summary"}
+    """
+    try:
+        # 입력 검증
+        if not ticker or not ticker.strip():
+            return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
+
+        if days <= 0 or days > 3650:  # 최대 10년
+            return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
+
+        analytics = load_module("supply_analytics")
+        try:
+            resolved = analytics.resolve_windows(json.loads(windows) if windows else None)
+        except (TypeError, ValueError) as e:
+            return json.dumps({"error": f"누적 기간 형식이 올바르지 않습니다: {e}"}, ensure_ascii=False)
+
+        with span("supply_analytics"):
+            result = analytics.get_supply_analytics(ticker, days, resolved)
+        if result is None:
+            return json.dumps({"error": "데이터를 가져올 수 없습니다"}, ensure_ascii=False)
+
+        result["ticker"] = ticker
+        result["name"] = load_module("stock_data_fetcher").get_stock_name(ticker) or ticker
+
+        print(f"[stock_analyzer] 수급 분석 완료: {result['name']}, 투자자 {len(result['investors'])}개, "
+              f"{len(result['dates'])}일", file=sys.stderr)
+        return _respond(result, len(result["dates"]))
+
+    except Exception as e:
+        error_msg = f"수급 분석 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"수급 분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+def _analyze_ticker(ticker, days):
+    """
+    단일 종목 데이터 수집 (배치용)
+
+    Returns:
+        tuple: (데이터 dict 또는 None, 오류 메시지 또는 None)
+    """
+    try:
+        fetcher = load_module("stock_data_fetcher")
+        data = _load_stock_data(ticker, days)
+        if data is None:
+            return None, "데이터를 가져올 수 없습니다"
+
+        data["ticker"] = ticker
+        data["name"] = fetcher.get_stock_name(ticker) or ticker
+        return data, None
+
+    except Exception as e:
+        print(f"[stock_analyzer] 배치 분석 실패 ({ticker}): {e}", file=sys.stderr)
+        return None, f"분석 중 오류 발생: {str(e)}"
+
+
+@entry_point("get_stock_analysis_batch")
+def get_stock_analysis_batch(tickers, days=180, fmt="json"):
+    """
+    여러 종목 데이터를 병렬로 수집 (관심종목 새로고침용)
+
+    Parameters:
+    -----------
+    tickers : str or list
+        종목 코드 리스트 (JSON 배열 문자열 또는 리스트)
+    days : int
+        분석 기간 (일)
+    fmt : str
+        "json" 또는 "binary"
+
+    Returns:
+    --------
+    str or bytes
+        JSON 문자열:
+        {
+            "results": {"005930": {...get_stock_analysis와 동일...}, ...},
+            "errors": {"000000": "데이터를 가져올 수 없습니다", ...}
+        }
+        (fmt="binary"면 bridge_codec 배치 페이로드, 오류는 항상 JSON 문자열)
+    """
+    try:
+        if fmt not in FORMATS:
+            return json.dumps({"error": "유효하지 않은 형식입니다 (json, binary)"}, ensure_ascii=False)
+
+        if isinstance(tickers, str):
+            tickers = json.loads(tickers)
+
+        # 입력 검증 (공백 제거, 중복 제거, 순서 유지)
+        tickers = list(dict.fromkeys(str(t).strip() for t in tickers if t and str(t).strip()))
+
+        if not tickers:
+            return json.dumps({"error": "종목 코드가 필요합니다"}, ensure_ascii=False)
+
+        if len(tickers) > MAX_BATCH_TICKERS:
+            return json.dumps({
+                "error": f"한 번에 조회할 수 있는 종목 수를 초과했습니다 (최대 {MAX_BATCH_TICKERS}개)"
+            }, ensure_ascii=False)
+
+        if days <= 0 or days > 3650:  # 최대 10년
+            return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
+
+        print(f"[stock_analyzer] 배치 분석 시작: {len(tickers)}개 종목, {days}일", file=sys.stderr)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # 스레드마다 import하지 않도록 먼저 불러오기
+        load_module("stock_data_fetcher")
+
+        results = {}
+        errors = {}
+        workers = min(MAX_BATCH_WORKERS, len(tickers))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(lambda t: _analyze_ticker(t, days), tickers)
+            for ticker, (data, error) in zip(tickers, outcomes):
+                if error is None:
+                    results[ticker] = data
+                else:
+                    errors[ticker] = error
+
+        print(f"[stock_analyzer] 배치 분석 완료: 성공 {len(results)}개, 실패 {len(errors)}개", file=sys.stderr)
+        rows = sum(len(data["dates"]) for data in results.values())
+        if fmt == "binary":
+            return _respond(results, rows, lambda r: load_module("bridge_codec").encode_batch(r, errors))
+        return _respond({"results": results, "errors": errors}, rows)
+
+    except Exception as e:
+        error_msg = f"배치 분석 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"배치 분석 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_market_scan")
+def get_market_scan(market="ALL", top_n=20):
+    """
+    시장 전체 수급 오실레이터 스캔 (순유입/순유출 상위 종목)
+
+    Parameters:
+    -----------
+    market : str
+        "KOSPI", "KOSDAQ" 또는 "ALL"
+    top_n : int
+        상위/하위 종목 수
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"date": ..., "count": ..., "top": [...], "bottom": [...]}
+    """
+    try:
+        # 입력 검증
+        if market not in ("ALL", "KOSPI", "KOSDAQ"):
+            return json.dumps({"error": "유효하지 않은 시장입니다 (ALL, KOSPI, KOSDAQ)"}, ensure_ascii=False)
+
+        if top_n <= 0 or top_n > 200:
+            return json.dumps({"error": "유효하지 않은 종목 수입니다 (1-200)"}, ensure_ascii=False)
+
+        print(f"[stock_analyzer] 시장 스캔 시작: {market}, 상위 {top_n}개", file=sys.stderr)
+
+        result = load_module("market_scanner").scan_market(market, top_n)
+
+        print(f"[stock_analyzer] 시장 스캔 완료: {result['count']}개 종목 ({result['date']})", file=sys.stderr)
+        return _respond(result, result["count"])
+
+    except Exception as e:
+        error_msg = f"시장 스캔 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"시장 스캔 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_market_deposit_data")
 def get_market_deposit_data(num_pages=5):
     """
     증시 자금 동향 데이터 수집 (고객예탁금, 신용잔고)
@@ -140,8 +688,8 @@ def get_market_deposit_data(num_pages=5):
 
         print(f"[stock_analyzer] 증시 자금 동향 수집 시작: {num_pages}페이지", file=sys.stderr)
 
-        # deposit_scraper 함수 호출
-        data = scrape_deposit_data(num_pages)
+        # 로컬 저장소에서 조회 (새 날짜만 수집하여 갱신)
+        data = _load_deposit_data(num_pages)
 
         print(f"[stock_analyzer] 데이터 수집 결과: {type(data)}", file=sys.stderr)
 
@@ -172,7 +720,7 @@ def get_market_deposit_data(num_pages=5):
             return json.dumps({"error": error_msg}, ensure_ascii=False)
 
         print(f"[stock_analyzer] 데이터 수집 성공: {len(data['dates'])}개", file=sys.stderr)
-        return json.dumps(data, ensure_ascii=False)
+        return _respond(data, len(data["dates"]))
 
     except Exception as e:
         error_msg = f"증시 데이터 수집 오류: {str(e)}\n{traceback.format_exc()}"
@@ -180,6 +728,7 @@ def get_market_deposit_data(num_pages=5):
         return json.dumps({"error": f"증시 데이터 수집 중 오류 발생: {str(e)}"}, ensure_ascii=False)
 
 
+@entry_point("get_latest_market_data")
 def get_latest_market_data():
     """
     최신 증시 자금 동향 (1페이지)
@@ -192,7 +741,7 @@ def get_latest_market_data():
     try:
         print("[stock_analyzer] 최신 증시 자금 동향 수집 시작", file=sys.stderr)
 
-        data = get_latest_data()
+        data = _load_deposit_data(1)
 
         if data is None or not data:
             return json.dumps({
@@ -200,7 +749,7 @@ def get_latest_market_data():
             }, ensure_ascii=False)
 
         print(f"[stock_analyzer] 최신 데이터 수집 성공: {len(data.get('dates', []))}개", file=sys.stderr)
-        return json.dumps(data, ensure_ascii=False)
+        return _respond(data, len(data.get("dates", [])))
 
     except Exception as e:
         error_msg = f"최신 데이터 오류: {str(e)}\n{traceback.format_exc()}"
@@ -208,6 +757,7 @@ def get_latest_market_data():
         return json.dumps({"error": f"최신 데이터 수집 중 오류 발생: {str(e)}"}, ensure_ascii=False)
 
 
+@entry_point("get_all_stocks_list")
 def get_all_stocks_list():
     """
     전체 종목 리스트 가져오기 (자동완성용)
@@ -220,10 +770,10 @@ def get_all_stocks_list():
     try:
         print("[stock_analyzer] 전체 종목 리스트 수집 시작", file=sys.stderr)
 
-        stocks = get_all_stocks()
+        stocks = load_module("stock_data_fetcher").get_all_stocks()
 
         print(f"[stock_analyzer] 종목 리스트 수집 완료: {len(stocks)}개", file=sys.stderr)
-        return json.dumps(stocks, ensure_ascii=False)
+        return _respond(stocks, len(stocks))
 
     except Exception as e:
         error_msg = f"종목 리스트 오류: {str(e)}\n{traceback.format_exc()}"
@@ -231,6 +781,383 @@ def get_all_stocks_list():
         return json.dumps({"error": f"종목 리스트 수집 중 오류 발생: {str(e)}"}, ensure_ascii=False)
 
 
+def _stream(name, chunks, prepare, encode=None):
+    """
+    조각 iterator → 응답 generator (조각마다 "<name>.chunk" 구간 기록)
+
+    진입점 구간은 generator를 만들 때(입력 확인, 첫 준비)만 측정하므로 조각은 따로 기록합니다.
+    generator는 yield 사이에 다른 호출이 끼어들 수 있으므로 구간은 조각 하나를 만드는 동안만 엽니다.
+    조각이 하나도 없거나 도중 오류가 나면 오류 JSON 하나를 yield하고 끝냅니다.
+    """
+    index = 0
+    while True:
+        try:
+            with span(f"{name}.chunk"):
+                chunk = next(chunks, None)
+                if chunk is None and index == 0:
+                    payload = json.dumps({"error": "데이터를 가져올 수 없습니다"}, ensure_ascii=False)
+                elif chunk is None:
+                    return
+                else:
+                    payload = _respond(prepare(chunk, index), len(chunk["dates"]), encode)
+        except Exception as e:
+            print(f"[stock_analyzer] {name} 조각 {index} 오류: {e}\n{traceback.format_exc()}", file=sys.stderr)
+            yield json.dumps({"error": f"데이터 수집 중 오류 발생: {str(e)}", "chunk": index}, ensure_ascii=False)
+            return
+        yield payload
+        if chunk is None:
+            return
+        index += 1
+
+
+def _stream_error(message):
+    """오류 JSON 하나만 yield (입력 오류도 다른 응답과 같은 generator로 반환)"""
+    yield json.dumps({"error": message}, ensure_ascii=False)
+
+
+@entry_point("stream_stock_analysis")
+def stream_stock_analysis(ticker, days=3650, chunk_days=180, fmt="json"):
+    """
+    긴 기간 종목 데이터를 기간 조각으로 나누어 최근 조각부터 반환 (단계적 표시용)
+
+    Parameters:
+    -----------
+    ticker : str
+        종목 코드
+    days : int
+        전체 기간 (일, 최대 3650)
+    chunk_days : int
+        조각 길이 (일)
+    fmt : str
+        "json" 또는 "binary"
+
+    Returns:
+    --------
+    generator
+        조각마다 get_stock_analysis와 같은 형식의 응답 (JSON에는 "chunk" 순번 추가)
+        조각은 날짜 오름차순이며, 다음 조각은 이전 조각보다 과거 구간
+        입력 오류나 수집 실패 시 오류 JSON 하나만 반환
+    """
+    if not ticker or not ticker.strip():
+        return _stream_error("종목 코드가 필요합니다")
+    if fmt not in FORMATS:
+        return _stream_error("유효하지 않은 형식입니다 (json, binary)")
+    if days <= 0 or days > 3650:
+        return _stream_error("유효하지 않은 기간입니다 (1-3650일)")
+    if chunk_days <= 0:
+        return _stream_error("유효하지 않은 조각 길이입니다")
+
+    print(f"[stock_analyzer] 종목 단계적 조회 시작: {ticker}, {days}일 ({chunk_days}일 단위)", file=sys.stderr)
+
+    try:
+        fetcher = load_module("stock_data_fetcher")
+        name = fetcher.get_stock_name(ticker) or ticker
+    except Exception as e:
+        print(f"[stock_analyzer] 단계적 조회 오류: {e}", file=sys.stderr)
+        return _stream_error(f"분석 중 오류 발생: {str(e)}")
+
+    def prepare(chunk, index):
+        chunk["ticker"] = ticker
+        chunk["name"] = name
+        if fmt == "json":
+            chunk["chunk"] = index
+        return chunk
+
+    encode = load_module("bridge_codec").encode_stock_data if fmt == "binary" else None
+    chunks = fetcher.iter_stock_data(ticker, days, chunk_days, load=_load_stock_chunk)
+    return _stream("stream_stock_analysis", chunks, prepare, encode)
+
+
+@entry_point("stream_market_deposit_data")
+def stream_market_deposit_data(num_pages=50, chunk_pages=5):
+    """
+    증시 자금 동향을 페이지 묶음으로 나누어 최근 묶음부터 반환 (단계적 표시용)
+
+    Parameters:
+    -----------
+    num_pages : int
+        전체 페이지 수 (최대 50)
+    chunk_pages : int
+        묶음당 페이지 수
+
+    Returns:
+    --------
+    generator
+        묶음마다 get_market_deposit_data와 같은 형식의 JSON 문자열 ("chunk" 순번 추가)
+        입력 오류나 수집 실패 시 오류 JSON 하나만 반환
+    """
+    if num_pages <= 0 or num_pages > 50:
+        return _stream_error("유효하지 않은 페이지 수입니다 (1-50)")
+    if chunk_pages <= 0:
+        return _stream_error("유효하지 않은 묶음 크기입니다")
+
+    print(f"[stock_analyzer] 증시 자금 동향 단계적 조회 시작: {num_pages}페이지 ({chunk_pages}페이지 단위)",
+          file=sys.stderr)
+
+    try:
+        store = load_module("deposit_store")
+    except Exception as e:
+        print(f"[stock_analyzer] 단계적 조회 오류: {e}", file=sys.stderr)
+        return _stream_error(f"증시 데이터 수집 중 오류 발생: {str(e)}")
+
+    def prepare(chunk, index):
+        chunk["chunk"] = index
+        return chunk
+
+    return _stream("stream_market_deposit_data", store.iter_deposit_data(num_pages, chunk_pages), prepare)
+
+
+def _prefetch_stock(ticker, days):
+    """
+    종목 데이터 미리 받기 (캐시만으로 응답 가능하면 건너뜀)
+
+    같은 요청이 진행 중이면 병합하며, 결과 캐시(_results)에는 넣지 않습니다.
+    받은 뒤(또는 이미 캐시에 있어도) 증분 지표 상태를 최신 거래일까지 이어서 갱신합니다.
+
+    Returns:
+        bool: 새로 받았으면 True
+    """
+    fetcher = load_module("stock_data_fetcher")
+    end = datetime.now()
+    fetched = not load_module("timeseries_cache").is_cached(ticker, end - timedelta(days=days), end)
+    if fetched:
+        _in_flight.do(("get_stock_data", (ticker, days), trading_date()),
+                      lambda: fetcher.get_stock_data(ticker, days))
+    fetcher.update_indicator_state(ticker)
+    return fetched
+
+
+def _prefetch_deposit(num_pages):
+    """증시 자금 데이터 미리 받기 (deposit_store가 저장된 페이지 재사용 여부를 판단)"""
+    store = load_module("deposit_store")
+    _in_flight.do(("get_deposit_data", (num_pages,), trading_date()),
+                  lambda: store.get_deposit_data(num_pages))
+
+
+@entry_point("schedule_prefetch")
+def schedule_prefetch(items, days=180, when="after_close", deposit_pages=5):
+    """
+    관심종목/최근 검색 종목과 증시 자금 데이터를 백그라운드에서 미리 받기
+
+    Parameters:
+    -----------
+    items : str or list
+        JSON 배열 문자열 또는 리스트:
+        ["005930", ...] (앞쪽이 먼저) 또는 [{"ticker": "005930", "priority": 0}, ...]
+        (priority는 작을수록 먼저, 관심종목 0 / 최근 검색 10 권장)
+    days : int
+        미리 받을 기간 (일, 화면에서 조회하는 기간 이상)
+    when : str
+        "after_close" (오늘 거래일 데이터 확정 후 시작) 또는 "now"
+    deposit_pages : int
+        증시 자금 데이터 페이지 수 (0이면 받지 않음)
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"scheduled": 새로 추가한 작업 수, "status": get_prefetch_status와 동일}
+    """
+    try:
+        if isinstance(items, str):
+            items = json.loads(items)
+
+        if days <= 0 or days > 3650:  # 최대 10년
+            return json.dumps({"error": "유효하지 않은 기간입니다 (1-3650일)"}, ensure_ascii=False)
+
+        if deposit_pages < 0 or deposit_pages > 50:
+            return json.dumps({"error": "유효하지 않은 페이지 수입니다 (0-50)"}, ensure_ascii=False)
+
+        prefetch = load_module("prefetch_scheduler")
+
+        # 입력 정리 (공백/중복 제거, 우선순위 없는 항목은 순서대로)
+        entries = {}
+        for i, item in enumerate(items):
+            if isinstance(item, dict):
+                ticker = str(item.get("ticker") or "").strip()
+                priority = int(item.get("priority", prefetch.PRIORITY_RECENT + i))
+            else:
+                ticker = str(item or "").strip()
+                priority = prefetch.PRIORITY_RECENT + i
+            if ticker and (ticker not in entries or priority < entries[ticker]):
+                entries[ticker] = priority
+
+        if len(entries) > MAX_BATCH_TICKERS:
+            return json.dumps({
+                "error": f"한 번에 예약할 수 있는 종목 수를 초과했습니다 (최대 {MAX_BATCH_TICKERS}개)"
+            }, ensure_ascii=False)
+
+        scheduler = prefetch.get_scheduler()
+        start_at = prefetch.next_run_time(when)
+
+        # 종목명 조회(get_stock_name)에 쓰는 종목 인덱스를 먼저 준비
+        scheduled = scheduler.submit(
+            ("ticker_index",), load_module("ticker_index").get_ticker_index,
+            prefetch.PRIORITY_WATCHLIST, label="ticker_index", start_at=start_at
+        )
+        for ticker, priority in entries.items():
+            scheduled += scheduler.submit(
+                ("stock", ticker, days),
+                lambda t=ticker: _prefetch_stock(t, days),
+                priority, label=f"stock:{ticker}", start_at=start_at
+            )
+        if deposit_pages:
+            scheduled += scheduler.submit(
+                ("deposit", deposit_pages),
+                lambda: _prefetch_deposit(deposit_pages),
+                prefetch.PRIORITY_MARKET, label=f"deposit:{deposit_pages}", start_at=start_at
+            )
+
+        status = scheduler.status()
+        print(f"[stock_analyzer] 미리 받기 예약: {scheduled}개 ({status['state']}, "
+              f"시작 {status['start_at']})", file=sys.stderr)
+        return json.dumps({"scheduled": scheduled, "status": status}, ensure_ascii=False)
+
+    except Exception as e:
+        error_msg = f"미리 받기 예약 오류: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg, file=sys.stderr)
+        return json.dumps({"error": f"미리 받기 예약 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_prefetch_status")
+def get_prefetch_status():
+    """
+    미리 받기 진행 상황
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"state": "idle"|"waiting"|"running", "total", "completed", "skipped",
+                      "failed", "queued", "running", "progress", "start_at", ...}
+    """
+    try:
+        return json.dumps(load_module("prefetch_scheduler").get_scheduler().status(), ensure_ascii=False)
+
+    except Exception as e:
+        print(f"미리 받기 상태 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"미리 받기 상태 조회 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("cancel_prefetch")
+def cancel_prefetch():
+    """
+    대기 중인 미리 받기 작업 취소 (실행 중인 작업은 끝까지 실행)
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"cancelled": 취소한 작업 수}
+    """
+    try:
+        cancelled = load_module("prefetch_scheduler").get_scheduler().cancel()
+        return json.dumps({"cancelled": cancelled}, ensure_ascii=False)
+
+    except Exception as e:
+        print(f"미리 받기 취소 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"미리 받기 취소 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("warm_up")
+def warm_up(background=True):
+    """
+    무거운 모듈을 미리 불러오기 (앱 시작 직후 호출)
+
+    Parameters:
+    -----------
+    background : bool
+        True면 데몬 스레드에서 불러오고 바로 반환
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"started": true, "modules": [...]}
+    """
+    try:
+        _warm_up(WARM_UP_MODULES, background=background)
+        return json.dumps({"started": True, "modules": list(WARM_UP_MODULES)}, ensure_ascii=False)
+
+    except Exception as e:
+        print(f"미리 불러오기 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"미리 불러오기 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_import_report")
+def get_import_report(limit=30):
+    """
+    모듈 import 시간 보고서 (load_module 호출별 소요 시간, 새로 불러온 최상위 패키지)
+
+    Parameters:
+    -----------
+    limit : int
+        소요 시간 기준 상위 모듈 수
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"loads": [...], "slowest": [...], "total_seconds": ...}
+    """
+    try:
+        return json.dumps(_import_report(limit), ensure_ascii=False)
+
+    except Exception as e:
+        print(f"import 보고서 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"import 보고서 생성 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("set_metrics_mode")
+def set_metrics_mode(mode="sample", sample_rate=None):
+    """
+    계측 모드 변경
+
+    Parameters:
+    -----------
+    mode : str
+        "off", "sample" 또는 "profile" (cProfile, 개발용)
+    sample_rate : float
+        sample 모드에서 기록할 호출 비율 (0~1)
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"mode": ..., "sample_rate": ...}
+    """
+    try:
+        _set_metrics_mode(mode, sample_rate)
+        metrics = _metrics_snapshot(profile_top=0)
+        return json.dumps({"mode": metrics["mode"], "sample_rate": metrics["sample_rate"]}, ensure_ascii=False)
+
+    except Exception as e:
+        print(f"계측 모드 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"계측 모드 변경 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
+@entry_point("get_metrics")
+def get_metrics(reset=False):
+    """
+    진입점/구간별 시간 백분위수, 캐시 히트/미스 카운터, cProfile 상위 함수
+
+    Parameters:
+    -----------
+    reset : bool
+        True면 반환 후 측정 결과 초기화
+
+    Returns:
+    --------
+    str
+        JSON 문자열: {"mode", "sample_rate", "spans": {...}, "counters": {...}, "profile": [...],
+                      "hosts": {호스트: {"state", "failures", "retry_in", "hedge_delay"}}}
+    """
+    try:
+        metrics = _metrics_snapshot()
+        metrics["hosts"] = load_module("resilient_fetch").status()
+        if reset:
+            _reset_metrics()
+        return json.dumps(metrics, ensure_ascii=False)
+
+    except Exception as e:
+        print(f"계측 결과 오류: {str(e)}", file=sys.stderr)
+        return json.dumps({"error": f"계측 결과 조회 중 오류 발생: {str(e)}"}, ensure_ascii=False)
+
+
 # 테스트용 메인
 if __name__ == "__main__":
     print("=== 주식 분석 통합 모듈 테스트 ===\n")
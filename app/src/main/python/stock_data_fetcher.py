@@ -1,30 +1,31 @@
 """
 주식 데이터 수집 모듈 (pykrx 사용)
 """
+from bisect import bisect_left
 from datetime import datetime, timedelta
 import pandas as pd
 from pykrx import stock
 
+from instrumentation import set_rows, span
+from oscillator_engine import IncrementalOscillator
+from stock_search import get_search_engine
+from timeseries_cache import get_daily_frames, load_indicator_state, save_indicator_state
+from ticker_index import get_ticker_index
 
-def search_stock(name):
-    """종목명으로 코드 검색"""
-    try:
-        today = datetime.now().strftime("%Y%m%d")
-        tickers = stock.get_market_ticker_list(today, market="KOSPI") + \
-                  stock.get_market_ticker_list(today, market="KOSDAQ")
-    except:
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-        tickers = stock.get_market_ticker_list(yesterday, market="KOSPI") + \
-                  stock.get_market_ticker_list(yesterday, market="KOSDAQ")
+# 수급 누적 기간 (거래일)
+ROLLING_DAYS = 5
+
+# 조각 단위 조회 시 앞 조각 경계의 누적 계산에 쓰는 이전 구간 (달력 일, 보통 ROLLING_DAYS - 1 거래일 이상)
+# 연휴 등으로 모자라면 get_stock_chunk가 두 배씩 늘림
+LOOKBACK_DAYS = 14
 
-    # 검색
-    matches = []
-    for t in tickers:
-        ticker_name = stock.get_market_ticker_name(t)
-        if name.upper() in ticker_name.upper() or ticker_name.upper() in name.upper():
-            matches.append({"ticker": t, "name": ticker_name})
 
-    return matches
+def search_stock(name):
+    """종목명으로 코드 검색 (관련도 순 정렬, 가장 관련성 높은 종목이 첫 번째)"""
+    return [
+        {"ticker": hit["ticker"], "name": hit["name"]}
+        for hit in get_search_engine().search(name, limit=None, fuzzy=False)
+    ]
 
 
 def get_stock_data(ticker, days=180):
@@ -51,43 +52,188 @@ def get_stock_data(ticker, days=180):
     end = datetime.now()
     start = end - timedelta(days=days)
 
-    start_str = start.strftime("%Y%m%d")
-    end_str = end.strftime("%Y%m%d")
+    # 시가총액 / 투자자 거래 데이터 (로컬 캐시 우선, 부족한 구간만 수집)
+    mcap, inv = get_daily_frames(ticker, start, end)
 
-    # 시가총액 데이터
-    mcap = stock.get_market_cap(start_str, end_str, ticker)
+    if mcap.empty or inv.empty:
+        return None
 
-    # 투자자 거래 데이터
-    inv = stock.get_market_trading_value_by_date(start_str, end_str, ticker)
+    return _to_result(mcap, inv)
 
-    if mcap.empty or inv.empty:
+
+def _to_result(mcap, inv, since=None):
+    """
+    원본 일별 데이터 → get_stock_data 결과 형식 (5일 누적, 누적이 불완전한 앞부분 제거)
+
+    since가 주어지면 그 날짜 이전 행(누적 계산용 이전 구간)도 제거합니다.
+    """
+    with span("stock_data.transform"):
+        # 5일 누적 계산
+        foreign_5d = inv["외국인합계"].rolling(ROLLING_DAYS).sum()
+        institution_5d = inv["기관합계"].rolling(ROLLING_DAYS).sum()
+
+        # NaN 제거
+        df = pd.DataFrame({
+            "market_cap": mcap["시가총액"],
+            "foreign_5d": foreign_5d,
+            "institution_5d": institution_5d
+        }).dropna()
+        if since is not None:
+            df = df[df.index >= pd.Timestamp(since)]
+
+        # JSON 변환 가능한 형태로 반환
+        result = {
+            "dates": df.index.strftime("%Y-%m-%d").tolist(),
+            "market_cap": df["market_cap"].tolist(),
+            "foreign_5d": df["foreign_5d"].tolist(),
+            "institution_5d": df["institution_5d"].tolist()
+        }
+        set_rows(len(df))
+
+    return result
+
+
+def iter_stock_data(ticker, days=3650, chunk_days=180, now=None, load=None):
+    """
+    get_stock_data를 기간 조각으로 나누어 최근 조각부터 yield (긴 기간 단계적 조회용)
+
+    조각마다 그 구간(+ 누적 계산용 LOOKBACK_DAYS)만 캐시/수집하므로 첫 조각이 바로 나오고
+    메모리 사용량은 전체 기간이 아닌 조각 크기에 비례합니다.
+    모든 조각을 오래된 순으로 이어 붙이면 get_stock_data(ticker, days) 결과와 같습니다.
+
+    상장 전 구간처럼 데이터가 없는 조각을 만나면 끝냅니다.
+
+    Args:
+        load: 조각 하나를 만드는 함수 (get_stock_chunk와 같은 인자/반환, 요청 병합 등에 사용)
+
+    Yields:
+        dict: get_stock_data와 같은 형식 (조각 구간의 행만)
+    """
+    load = load or get_stock_chunk
+    end = (now or datetime.now()).date()
+    start = ((now or datetime.now()) - timedelta(days=days)).date()
+
+    chunk_end = end
+    while chunk_end >= start:
+        chunk_start = max(start, chunk_end - timedelta(days=chunk_days - 1))
+        chunk = load(ticker, chunk_start, chunk_end, start)
+        if chunk is None:
+            return
+        if chunk["dates"]:
+            yield chunk
+        chunk_end = chunk_start - timedelta(days=1)
+
+
+def get_stock_chunk(ticker, chunk_start, chunk_end, start):
+    """
+    iter_stock_data 조각 하나 ([chunk_start, chunk_end] 구간의 행, 전체 기간 시작일은 start)
+
+    Returns:
+        dict 또는 None: 데이터가 없으면(상장 전 구간 등) None
+    """
+    since = pd.Timestamp(chunk_start)
+    lookback = LOOKBACK_DAYS
+    before = -1
+    while True:
+        fetch_start = max(start, chunk_start - timedelta(days=lookback))
+        mcap, inv = get_daily_frames(ticker, fetch_start, chunk_end)
+        if mcap.empty or inv.empty:
+            return None
+        # 긴 연휴/거래정지로 이전 구간의 거래일이 누적 계산에 모자라면 이전 구간을 늘려 다시 읽음
+        # (늘려도 행이 그대로면 상장 전 구간)
+        rows = int((inv.index < since).sum())
+        if rows >= ROLLING_DAYS - 1 or fetch_start == start or rows == before:
+            break
+        before = rows
+        lookback *= 2
+    return _to_result(mcap, inv, since=chunk_start)
+
+
+def slice_stock_data(data, days, now=None):
+    """
+    더 긴 기간의 get_stock_data 결과에서 days 기간 결과를 잘라내기 (네트워크 사용 안 함)
+
+    days 기간 시작일 이후 행만 남긴 뒤, get_stock_data가 누적 계산으로 버리는
+    처음 ROLLING_DAYS - 1 거래일을 같이 버리므로 직접 계산한 결과와 같습니다.
+
+    Returns:
+        dict 또는 None: 원본이 시작일 이전 거래일을 포함하지 않아 만들 수 없으면 None
+    """
+    start = ((now or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+    dates = data["dates"]
+    if not dates or dates[0] > start:
         return None
 
-    # 5일 누적 계산
-    foreign_5d = inv["외국인합계"].rolling(5).sum()
-    institution_5d = inv["기관합계"].rolling(5).sum()
+    first = bisect_left(dates, start) + ROLLING_DAYS - 1
+    return {key: values[first:] for key, values in data.items()
+            if key in ("dates", "market_cap", "foreign_5d", "institution_5d")}
+
+
+def indicator_start_date(now=None):
+    """
+    증분 지표 상태의 기본 시작일 (전년도 1월 1일, YYYY-MM-DD)
+
+    1년에 한 번만 바뀌므로 그 사이의 새로고침은 저장된 상태에 새 거래일만 추가하고,
+    EMA가 수렴할 만큼(1년 이상) 이전 구간을 항상 포함합니다.
+    """
+    return f"{(now or datetime.now()).year - 1}-01-01"
+
+
+def update_indicator_state(ticker, start_date=None):
+    """
+    증분 지표 상태를 최신 거래일까지 갱신 (장마감/장중 새로고침용)
+
+    저장된 상태 이후의 거래일만 캐시에서 읽어 한 건씩 추가하므로
+    종목당 연산량이 새로 추가된 거래일 수에 비례합니다.
+
+    Parameters:
+    -----------
+    ticker : str
+        종목 코드
+    start_date : str
+        지표 계산 시작일 (YYYY-MM-DD), 상태 저장 키로 사용 (기본: indicator_start_date())
+
+    Returns:
+    --------
+    dict or None
+        마지막 거래일 지표 (IncrementalOscillator.append 결과)
+    """
+    start_date = start_date or indicator_start_date()
+    saved = load_indicator_state(ticker, start_date)
+    state = IncrementalOscillator.from_dict(saved) if saved else IncrementalOscillator()
+
+    begin = state.last_date or start_date
+    mcap, inv = get_daily_frames(ticker, datetime.strptime(begin, "%Y-%m-%d"), datetime.now())
+    if mcap.empty or inv.empty:
+        return None
 
-    # NaN 제거
     df = pd.DataFrame({
         "market_cap": mcap["시가총액"],
-        "foreign_5d": foreign_5d,
-        "institution_5d": institution_5d
+        "foreign": inv["외국인합계"],
+        "institution": inv["기관합계"]
     }).dropna()
 
-    # JSON 변환 가능한 형태로 반환
-    result = {
-        "dates": df.index.strftime("%Y-%m-%d").tolist(),
-        "market_cap": df["market_cap"].tolist(),
-        "foreign_5d": df["foreign_5d"].tolist(),
-        "institution_5d": df["institution_5d"].tolist()
-    }
+    bar = None
+    for date, row in zip(df.index.strftime("%Y-%m-%d"), df.itertuples(index=False)):
+        if state.last_date and date < state.last_date:
+            continue
+        values = (date, int(row.market_cap), int(row.foreign), int(row.institution))
+        if date == state.last_date:
+            # 마지막 거래일은 장중 값이었을 수 있으므로 교체
+            bar = state.replace_last(*values)
+        else:
+            bar = state.append(*values)
 
-    return result
+    save_indicator_state(ticker, start_date, state.to_dict())
+    return bar
 
 
 def get_stock_name(ticker):
     """종목 코드로 이름 조회"""
     try:
+        name = get_ticker_index().get_name(ticker)
+        if name:
+            return name
         return stock.get_market_ticker_name(ticker)
     except:
         return None
@@ -102,21 +248,4 @@ def get_all_stocks():
     list
         [{"ticker": "005930", "name": "삼성전자"}, ...]
     """
-    try:
-        today = datetime.now().strftime("%Y%m%d")
-        tickers = stock.get_market_ticker_list(today, market="KOSPI") + \
-                  stock.get_market_ticker_list(today, market="KOSDAQ")
-    except:
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-        tickers = stock.get_market_ticker_list(yesterday, market="KOSPI") + \
-                  stock.get_market_ticker_list(yesterday, market="KOSDAQ")
-
-    stock_list = []
-    for ticker in tickers:
-        try:
-            name = stock.get_market_ticker_name(ticker)
-            stock_list.append({"ticker": ticker, "name": name})
-        except:
-            continue
-
-    return stock_list
\ No newline at end of file
+    return get_ticker_index().all_stocks()
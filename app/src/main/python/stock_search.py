@@ -0,0 +1,274 @@
+"""
+종목 검색 엔진 모듈
+종목명/코드 역색인, 한글 초성 검색, 관련도 순위 정렬을 제공합니다.
+
+순위 (낮을수록 우선):
+    0. 종목명/코드 완전 일치
+    1. 종목명/코드 접두 일치
+    2. 종목명 부분 일치
+    3. 검색어 안에 종목명 포함 (예: "삼성전자 주가")
+    4. 초성 접두 일치 (ㅅㅅㅈㅈ → 삼성전자)
+    5. 초성 부분 일치
+    6. 오타 허용 (편집 거리, 완전/접두 일치가 있으면 생략, 숫자 검색어는 코드만 비교)
+같은 순위에서는 시가총액이 큰 종목, 짧은 이름 순으로 정렬합니다.
+"""
+
+import heapq
+import threading
+
+from ticker_index import get_ticker_index
+
+CHOSUNG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+]
+_CHOSUNG_SET = set(CHOSUNG)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_JUNGSUNG_JONGSUNG = 21 * 28
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+RANK_CONTAINED = 3
+RANK_CHOSUNG_PREFIX = 4
+RANK_CHOSUNG_SUBSTRING = 5
+RANK_FUZZY = 6
+
+DEFAULT_LIMIT = 20
+
+_engine = None
+_engine_source = None
+_engine_lock = threading.Lock()
+
+
+def to_chosung(text):
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로 유지)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            chars.append(CHOSUNG[(code - _HANGUL_BASE) // _JUNGSUNG_JONGSUNG])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def is_chosung_query(text):
+    """검색어에 초성 자음이 포함되어 있는지 여부"""
+    return any(ch in _CHOSUNG_SET for ch in text)
+
+
+def edit_distance(a, b, max_distance):
+    """
+    레벤슈타인 거리 (max_distance 초과 시 조기 종료)
+
+    Returns:
+        int: 거리 (max_distance보다 크면 max_distance + 1)
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, start=1):
+            cost = 0 if ca == cb else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _deletes(text):
+    """한 글자를 지운 변형 + 원문 (편집 거리 1 이내 후보 조회용)"""
+    return {text[:i] + text[i + 1:] for i in range(len(text))} | {text}
+
+
+class StockSearchEngine:
+    """
+    종목 검색 엔진
+
+    이름/코드/초성 문자열의 2-gram 역색인을 만들어 두고,
+    검색 시 후보만 골라 순위를 매깁니다.
+    종목 코드는 한 글자 삭제 변형 색인을 따로 두어 숫자 검색어의 오타를 코드끼리만 비교합니다.
+    """
+
+    def __init__(self, records):
+        """
+        Args:
+            records: [{"ticker": ..., "name": ..., "market_cap": ...}, ...]
+        """
+        self.records = records
+        self._names = [r["name"].upper() for r in records]
+        self._tickers = [r["ticker"].upper() for r in records]
+        self._chosungs = [to_chosung(name) for name in self._names]
+        self._caps = [r.get("market_cap", 0) or 0 for r in records]
+
+        self._by_name = {}
+        self._text_grams = {}
+        self._chosung_grams = {}
+        self._ticker_deletes = {}
+
+        for idx in range(len(records)):
+            self._by_name.setdefault(self._names[idx], []).append(idx)
+            for key in (self._names[idx], self._tickers[idx]):
+                for gram in _bigrams(key) | set(key):
+                    self._text_grams.setdefault(gram, set()).add(idx)
+            for gram in _bigrams(self._chosungs[idx]) | set(self._chosungs[idx]):
+                self._chosung_grams.setdefault(gram, set()).add(idx)
+            for variant in _deletes(self._tickers[idx]):
+                self._ticker_deletes.setdefault(variant, set()).add(idx)
+
+    @staticmethod
+    def _lookup(postings, query):
+        """query의 모든 2-gram을 포함하는 후보 (1글자면 단일 문자 색인)"""
+        grams = _bigrams(query) if len(query) >= 2 else {query}
+        lists = [postings.get(gram) for gram in grams]
+        if not lists or any(p is None for p in lists):
+            return set()
+        lists.sort(key=len)
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def _rank_text(self, idx, query):
+        name = self._names[idx]
+        ticker = self._tickers[idx]
+        if name == query or ticker == query:
+            return RANK_EXACT
+        if name.startswith(query) or ticker.startswith(query):
+            return RANK_PREFIX
+        if query in name or query in ticker:
+            return RANK_SUBSTRING
+        return None
+
+    def _rank_chosung(self, idx, query):
+        chosung = self._chosungs[idx]
+        if chosung.startswith(query):
+            return RANK_CHOSUNG_PREFIX
+        if query in chosung:
+            return RANK_CHOSUNG_SUBSTRING
+        return None
+
+    def _fuzzy(self, query, exclude):
+        """
+        편집 거리 기반 후보
+
+        - 숫자 검색어: 삭제 변형을 공유하는 종목 코드만 비교
+        - 그 외: 2-gram을 하나 이상 공유하는 종목명만 비교
+        """
+        max_distance = max(1, len(query) // 3)
+        if query.isdigit():
+            targets = self._tickers
+            candidates = set()
+            for variant in _deletes(query):
+                candidates |= self._ticker_deletes.get(variant, set())
+        else:
+            targets = self._names
+            candidates = set()
+            for gram in _bigrams(query):
+                candidates |= self._text_grams.get(gram, set())
+        candidates -= exclude
+
+        results = {}
+        for idx in candidates:
+            distance = edit_distance(query, targets[idx], max_distance)
+            if distance <= max_distance:
+                results[idx] = RANK_FUZZY + distance
+        return results
+
+    def search(self, query, limit=DEFAULT_LIMIT, fuzzy=True):
+        """
+        관련도 순 종목 검색
+
+        Args:
+            query: 검색어 (종목명, 코드, 초성)
+            limit: 최대 결과 수 (None이면 전체)
+            fuzzy: 일치 결과가 부족할 때 오타 허용 검색 여부 (완전/접두 일치가 있으면 생략)
+
+        Returns:
+            list: [{"ticker": ..., "name": ..., "rank": ...}, ...]
+        """
+        key = query.strip().upper()
+        if not key:
+            return []
+
+        ranks = {}
+
+        for idx in self._lookup(self._text_grams, key):
+            rank = self._rank_text(idx, key)
+            if rank is not None:
+                ranks[idx] = rank
+
+        # 검색어 안에 포함된 종목명
+        if len(key) >= 2:
+            for start in range(len(key)):
+                for end in range(start + 2, len(key) + 1):
+                    for idx in self._by_name.get(key[start:end], ()):
+                        ranks.setdefault(idx, RANK_CONTAINED)
+
+        if is_chosung_query(key):
+            chosung_key = to_chosung(key)
+            for idx in self._lookup(self._chosung_grams, chosung_key):
+                rank = self._rank_chosung(idx, chosung_key)
+                if rank is not None and rank < ranks.get(idx, RANK_FUZZY):
+                    ranks[idx] = rank
+
+        exact_or_prefix = any(rank <= RANK_PREFIX for rank in ranks.values())
+        if (fuzzy and len(key) >= 2 and not exact_or_prefix
+                and (limit is None or len(ranks) < limit)):
+            for idx, rank in self._fuzzy(key, set(ranks)).items():
+                ranks.setdefault(idx, rank)
+
+        def sort_key(idx):
+            return ranks[idx], -self._caps[idx], len(self._names[idx]), self._tickers[idx]
+
+        if limit is None:
+            ordered = sorted(ranks, key=sort_key)
+        else:
+            ordered = heapq.nsmallest(limit, ranks, key=sort_key)
+
+        return [
+            {
+                "ticker": self.records[idx]["ticker"],
+                "name": self.records[idx]["name"],
+                "rank": ranks[idx]
+            }
+            for idx in ordered
+        ]
+
+
+def get_search_engine():
+    """현재 종목 인덱스 기준 검색 엔진 (인덱스가 바뀌면 다시 생성)"""
+    global _engine, _engine_source
+
+    index = get_ticker_index()
+    with _engine_lock:
+        if _engine is None or _engine_source is not index:
+            _engine = StockSearchEngine(index.records)
+            _engine_source = index
+        return _engine
+
+
+def search_top_k(query, limit=DEFAULT_LIMIT):
+    """
+    자동완성용 상위 k개 검색
+
+    Returns:
+        list: [{"ticker": "005930", "name": "삼성전자", "rank": 1}, ...]
+    """
+    return get_search_engine().search(query, limit=limit)
+
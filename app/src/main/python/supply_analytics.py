@@ -0,0 +1,215 @@
+"""
+투자자별 수급 분석 모듈
+한 번 받은 투자자별 거래대금(timeseries_cache 원본)에서 모든 투자자 컬럼의
+기간별 누적 순매수와 투자자별 오실레이터를 한 번의 벡터 연산으로 계산합니다.
+
+- 누적 순매수: int64 누적합의 차분(C[t] - C[t-w])으로 모든 기간/투자자를 한 번에 계산
+  (정수 연산이라 rolling().sum()과 값이 같고, 기간 수와 무관하게 누적합은 한 번)
+- 오실레이터: 누적 순매수 / 시가총액 * 100 (oscillator_engine과 같은 정의, 시가총액 0 이하면 0)
+- 기간이 덜 찬 앞부분은 None (조회 시 가장 긴 기간만큼 이전 구간을 같이 읽어 채움)
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+DEFAULT_WINDOWS = (5, 20, 60)
+MAX_WINDOW = 250
+
+# 결과 투자자 순서 (없는 컬럼은 건너뛰고, 목록에 없는 컬럼은 뒤에 추가)
+INVESTOR_ORDER = (
+    "개인", "외국인합계", "외국인", "기타외국인", "기관합계",
+    "금융투자", "보험", "투신", "사모", "은행", "기타금융", "연기금", "기타법인",
+)
+# 투자자 합계가 0인 검산용 컬럼
+EXCLUDED_COLUMNS = ("전체",)
+
+# 가장 긴 기간(거래일)을 달력 일로 바꿀 때 곱하는 값 (주말/휴장일 포함) + 여유 일수
+_CALENDAR_RATIO = 1.5
+_CALENDAR_SLACK = 14
+
+
+def resolve_windows(windows=None):
+    """
+    기간 목록 검증 (중복 제거, 오름차순)
+
+    Raises:
+        ValueError: 1~MAX_WINDOW 범위 밖이거나 비어 있음
+    """
+    if windows is None:
+        return DEFAULT_WINDOWS
+    if isinstance(windows, int):
+        windows = (windows,)
+    resolved = sorted({int(w) for w in windows})
+    if not resolved:
+        raise ValueError("기간이 비어 있습니다")
+    if resolved[0] < 1 or resolved[-1] > MAX_WINDOW:
+        raise ValueError(f"기간은 1~{MAX_WINDOW} 거래일이어야 합니다: {resolved}")
+    return tuple(resolved)
+
+
+def investor_matrix(inv):
+    """
+    투자자별 거래대금 DataFrame → (투자자 목록, int64 행렬[날짜, 투자자])
+
+    빈 값(그날 해당 투자자 기록 없음)은 0으로 둡니다.
+    """
+    columns = [c for c in INVESTOR_ORDER if c in inv.columns]
+    columns += [c for c in inv.columns if c not in columns and c not in EXCLUDED_COLUMNS]
+    values = inv[columns].to_numpy(dtype=np.float64, na_value=0.0)
+    return columns, values.astype(np.int64)
+
+
+def rolling_sums(values, windows):
+    """
+    모든 기간의 누적 합계 (누적합 차분)
+
+    Args:
+        values: int64 행렬 [날짜, 투자자]
+        windows: 기간 목록 (거래일)
+
+    Returns:
+        ndarray: float64 [기간, 날짜, 투자자], 기간이 덜 찬 앞부분은 NaN
+    """
+    n, k = values.shape
+    cumsum = np.zeros((n + 1, k), dtype=np.int64)
+    np.cumsum(values, axis=0, out=cumsum[1:])
+
+    sums = np.full((len(windows), n, k), np.nan)
+    for i, w in enumerate(windows):
+        if w <= n:
+            sums[i, w - 1:] = cumsum[w:] - cumsum[:-w]
+    return sums
+
+
+def oscillators(sums, market_cap):
+    """
+    투자자별 오실레이터 (누적 순매수 / 시가총액 * 100)
+
+    Args:
+        sums: rolling_sums 결과 [기간, 날짜, 투자자]
+        market_cap: float64 [날짜]
+
+    Returns:
+        ndarray: sums와 같은 모양 (NaN은 유지, 시가총액 0 이하면 0)
+    """
+    mcap = np.asarray(market_cap, dtype=np.float64)[None, :, None]
+    osc = np.zeros_like(sums)
+    np.divide(sums, mcap, out=osc, where=mcap > 0)
+    osc[np.isnan(sums)] = np.nan
+    return osc * 100.0
+
+
+def streaks(values):
+    """
+    마지막 날까지 연속 순매수(+)/순매도(-) 일수 (투자자별)
+
+    Returns:
+        ndarray: int64 [투자자] (순매수 연속이면 양수, 순매도 연속이면 음수, 마지막 날 0이면 0)
+    """
+    if len(values) == 0:
+        return np.zeros(values.shape[1], dtype=np.int64)
+    sign = np.sign(values)
+    last = sign[-1]
+    # 뒤에서부터 마지막 날과 부호가 다른 첫 위치까지의 길이
+    differs = sign[::-1] != last
+    length = np.where(differs.any(axis=0), differs.argmax(axis=0), len(values))
+    return (length * last).astype(np.int64)
+
+
+def _to_list(array):
+    """NaN → None (JSON 직렬화용)"""
+    return [None if v != v else v for v in array.tolist()]
+
+
+def analyze(mcap, inv, windows=DEFAULT_WINDOWS, since=None):
+    """
+    투자자별 수급 분석
+
+    Args:
+        mcap: 시가총액 DataFrame["시가총액"] (timeseries_cache 원본)
+        inv: 투자자별 거래대금 DataFrame (timeseries_cache 원본, 상세 + 합계 컬럼)
+        windows: 누적 기간 목록 (거래일)
+        since: 이 날짜 이후 행만 반환 (이전 행은 누적 계산에만 사용)
+
+    Returns:
+        dict: {
+            "dates": [...], "market_cap": [...], "investors": [...], "windows": [...],
+            "net": {투자자: {기간: [...]}},          # 기간 누적 순매수
+            "oscillator": {투자자: {기간: [...]}},   # 누적 순매수 / 시가총액 * 100
+            "summary": [{"investor", "streak", "latest": {기간: {"net", "oscillator"}}}, ...]
+        }
+        데이터가 없으면 None
+    """
+    windows = resolve_windows(windows)
+    dates = mcap.index.intersection(inv.index)
+    if len(dates) == 0:
+        return None
+
+    investors, values = investor_matrix(inv.loc[dates])
+    market_cap = mcap.loc[dates, "시가총액"].to_numpy(dtype=np.float64)
+
+    sums = rolling_sums(values, windows)
+    osc = oscillators(sums, market_cap)
+
+    first = 0
+    if since is not None:
+        first = int(dates.searchsorted(np.datetime64(since, "D")))
+    if first >= len(dates):
+        return None
+
+    sums, osc, values = sums[:, first:], osc[:, first:], values[first:]
+    keys = [str(w) for w in windows]
+
+    net = {name: {} for name in investors}
+    oscillator = {name: {} for name in investors}
+    for i, key in enumerate(keys):
+        for j, name in enumerate(investors):
+            net[name][key] = _to_list(sums[i, :, j])
+            oscillator[name][key] = _to_list(osc[i, :, j])
+
+    streak = streaks(values)
+    summary = [
+        {
+            "investor": name,
+            "streak": int(streak[j]),
+            "latest": {
+                key: {"net": net[name][key][-1], "oscillator": oscillator[name][key][-1]}
+                for key in keys
+            },
+        }
+        for j, name in enumerate(investors)
+    ]
+
+    return {
+        "dates": dates[first:].strftime("%Y-%m-%d").tolist(),
+        "market_cap": market_cap[first:].tolist(),
+        "investors": investors,
+        "windows": list(windows),
+        "net": net,
+        "oscillator": oscillator,
+        "summary": summary,
+    }
+
+
+def get_supply_analytics(ticker, days=180, windows=DEFAULT_WINDOWS, now=None):
+    """
+    종목의 투자자별 수급 분석 (캐시 우선, 부족한 구간만 수집)
+
+    가장 긴 기간만큼 이전 구간을 같이 읽어 조회 구간 첫날부터 모든 기간 값을 채웁니다.
+    get_stock_data와 같은 timeseries_cache 원본을 쓰므로 추가 요청은 이전 구간이 캐시에 없을 때만 생깁니다.
+
+    Returns:
+        dict 또는 None: analyze 결과
+    """
+    from timeseries_cache import get_daily_frames
+
+    windows = resolve_windows(windows)
+    end = now or datetime.now()
+    start = end - timedelta(days=days)
+    lookback = timedelta(days=int(windows[-1] * _CALENDAR_RATIO) + _CALENDAR_SLACK)
+
+    mcap, inv = get_daily_frames(ticker, start - lookback, end)
+    if mcap.empty or inv.empty:
+        return None
+    return analyze(mcap, inv, windows, since=start.date())
@@ -0,0 +1,187 @@
+"""
+종목 코드/이름 인덱스 모듈
+거래일마다 한 번 전체 종목 목록을 만들어 SQLite에 저장하고 메모리에 올려 둡니다.
+검색 색인(n-gram, 초성)은 stock_search.StockSearchEngine이 이 목록으로 만듭니다.
+"""
+
+import sys
+import threading
+import time
+
+from local_store import connect
+import resilient_fetch
+import trading_calendar
+
+DB_NAME = "tickers.db"
+MARKETS = ("KOSPI", "KOSDAQ")
+
+# 갱신 실패 후 재시도까지 대기 시간 (초)
+REBUILD_RETRY_INTERVAL = 600
+
+_index = None
+_index_lock = threading.Lock()
+_last_build_attempt = 0.0
+
+
+class TickerIndex:
+    """
+    종목 코드 → 이름 인덱스
+
+    검색은 stock_search.StockSearchEngine이 담당하고, 여기서는 코드 조회와 전체 목록만 제공합니다.
+    """
+
+    def __init__(self, records, built_for):
+        """
+        Args:
+            records: [{"ticker": ..., "name": ..., "market": ..., "market_cap": ...}, ...]
+            built_for: 종목 목록의 기준 거래일 (YYYYMMDD)
+        """
+        self.records = records
+        self.built_for = built_for
+        self._by_ticker = {record["ticker"]: idx for idx, record in enumerate(records)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def get_name(self, ticker):
+        """종목 코드로 이름 조회 (없으면 None)"""
+        idx = self._by_ticker.get(ticker)
+        return self.records[idx]["name"] if idx is not None else None
+
+    def all_stocks(self):
+        """[{"ticker": ..., "name": ...}, ...] 형태의 전체 목록"""
+        return [{"ticker": r["ticker"], "name": r["name"]} for r in self.records]
+
+
+def _fetch_records(date):
+    """
+    pykrx에서 date(거래일, YYYYMMDD) 기준 전체 종목 목록 수집
+
+    시가총액은 검색 결과 정렬(동점 처리)에 쓰이며, 수집 실패 시 0으로 둡니다.
+
+    Returns:
+        list: [{"ticker": ..., "name": ..., "market": ..., "market_cap": ...}, ...]
+    """
+    from pykrx import stock
+
+    records = []
+    for market in MARKETS:
+        try:
+            caps = resilient_fetch.krx(stock.get_market_cap, date, market=market)["시가총액"].to_dict()
+        except Exception:
+            caps = {}
+        for ticker in resilient_fetch.krx(stock.get_market_ticker_list, date, market=market):
+            try:
+                name = stock.get_market_ticker_name(ticker)
+            except Exception:
+                continue
+            records.append({
+                "ticker": ticker,
+                "name": name,
+                "market": market,
+                "market_cap": int(caps.get(ticker, 0) or 0)
+            })
+
+    if not records:
+        raise RuntimeError(f"종목 목록을 가져올 수 없습니다 ({date})")
+    return records
+
+
+def _ensure_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tickers ("
+        "ticker TEXT PRIMARY KEY, name TEXT NOT NULL, market TEXT, "
+        "market_cap INTEGER DEFAULT 0)"
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(tickers)")}
+    if "market_cap" not in columns:
+        conn.execute("ALTER TABLE tickers ADD COLUMN market_cap INTEGER DEFAULT 0")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+
+def load_index():
+    """저장된 인덱스 로드 (없으면 None)"""
+    conn = connect(DB_NAME)
+    try:
+        _ensure_schema(conn)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'built_for'").fetchone()
+        if row is None:
+            return None
+        rows = conn.execute(
+            "SELECT ticker, name, market, market_cap FROM tickers ORDER BY rowid"
+        ).fetchall()
+        if not rows:
+            return None
+        records = [
+            {"ticker": t, "name": n, "market": m, "market_cap": c or 0}
+            for t, n, m, c in rows
+        ]
+        return TickerIndex(records, row[0])
+    finally:
+        conn.close()
+
+
+def save_index(index):
+    """인덱스를 SQLite에 저장 (기존 목록 교체)"""
+    conn = connect(DB_NAME)
+    try:
+        _ensure_schema(conn)
+        with conn:
+            conn.execute("DELETE FROM tickers")
+            conn.executemany(
+                "INSERT OR REPLACE INTO tickers (ticker, name, market, market_cap) "
+                "VALUES (?, ?, ?, ?)",
+                [(r["ticker"], r["name"], r.get("market"), r.get("market_cap", 0))
+                 for r in index.records]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('built_for', ?)",
+                (index.built_for,)
+            )
+    finally:
+        conn.close()
+
+
+def build_index():
+    """pykrx에서 최근 거래일 기준으로 새로 수집하여 인덱스를 만들고 저장"""
+    built_for = trading_calendar.trading_date_key()
+    records = _fetch_records(built_for)
+    index = TickerIndex(records, built_for)
+    save_index(index)
+    print(f"[ticker_index] 인덱스 생성: {len(index)}개 ({index.built_for})", file=sys.stderr)
+    return index
+
+
+def _is_stale(index):
+    """새 거래일이 시작되어 다시 만들어야 하는지 여부 (휴장일에는 다시 만들지 않음)"""
+    return index.built_for < trading_calendar.trading_date_key()
+
+
+def get_ticker_index():
+    """
+    메모리 인덱스 반환
+
+    1. 메모리에 있으면 그대로 사용
+    2. 없으면 디스크에서 로드
+    3. 기준 날짜가 지났으면 새로 생성 (실패 시 기존 인덱스 유지)
+    """
+    global _index, _last_build_attempt
+
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = load_index()
+            except Exception as e:
+                print(f"[ticker_index] 인덱스 로드 실패: {e}", file=sys.stderr)
+
+        retry_blocked = time.time() - _last_build_attempt < REBUILD_RETRY_INTERVAL
+        if _index is None or (_is_stale(_index) and not retry_blocked):
+            _last_build_attempt = time.time()
+            try:
+                _index = build_index()
+            except Exception as e:
+                if _index is None:
+                    raise
+                print(f"[ticker_index] 인덱스 갱신 실패, 기존 인덱스 사용: {e}", file=sys.stderr)
+
+        return _index
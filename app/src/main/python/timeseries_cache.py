@@ -0,0 +1,346 @@
+"""
+종목별 일별 시계열 캐시 모듈
+pykrx에서 받은 원본 일별 데이터(시가총액, 투자자별 거래대금)를 SQLite에 저장하고,
+이후 요청에서는 저장된 구간 밖의 날짜만 추가로 수집합니다.
+
+- 캐시 범위(coverage)는 종목별로 하나의 연속 구간으로 관리
+- 롤링 합계 등 파생 값은 저장하지 않음 (원본만 저장하여 재계산 가능)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from instrumentation import count, set_rows, span
+from local_store import connect
+import resilient_fetch
+import trading_calendar
+
+DB_NAME = "timeseries.db"
+
+# 당일 데이터는 장중 변동이 있으므로 이 시간(초)이 지나면 다시 수집
+TODAY_REFRESH_INTERVAL = 300
+
+# 상세 투자자 컬럼 → 합계 컬럼 구성
+INSTITUTION_COLUMNS = ["금융투자", "보험", "투신", "사모", "은행", "기타금융", "연기금"]
+FOREIGN_COLUMNS = ["외국인", "기타외국인"]
+
+_DATE_FMT = "%Y-%m-%d"
+
+_conn = None
+_conn_lock = threading.RLock()
+
+
+def _reset_after_fork():
+    """자식 프로세스(백테스트 프로세스 풀 등)는 부모의 SQLite 연결을 이어 쓰지 않고 새로 엶"""
+    global _conn, _conn_lock
+    _conn = None
+    _conn_lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = connect(DB_NAME)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS market_cap ("
+            "ticker TEXT NOT NULL, date TEXT NOT NULL, market_cap INTEGER, "
+            "PRIMARY KEY (ticker, date))"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS investor_values ("
+            "ticker TEXT NOT NULL, date TEXT NOT NULL, investor TEXT NOT NULL, "
+            "value INTEGER, PRIMARY KEY (ticker, date, investor))"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            "ticker TEXT PRIMARY KEY, start TEXT NOT NULL, end TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS indicator_state ("
+            "ticker TEXT NOT NULL, key TEXT NOT NULL, state TEXT NOT NULL, "
+            "PRIMARY KEY (ticker, key))"
+        )
+    return _conn
+
+
+def _parse_date(text):
+    return datetime.strptime(text, _DATE_FMT).date()
+
+
+def with_totals(inv):
+    """상세 투자자 컬럼만 있는 경우 기관합계/외국인합계 컬럼 추가"""
+    if "기관합계" not in inv.columns:
+        present = [c for c in INSTITUTION_COLUMNS if c in inv.columns]
+        if present:
+            inv["기관합계"] = inv[present].sum(axis=1)
+    if "외국인합계" not in inv.columns:
+        present = [c for c in FOREIGN_COLUMNS if c in inv.columns]
+        if present:
+            inv["외국인합계"] = inv[present].sum(axis=1)
+    return inv
+
+
+def _fetch_range(ticker, start, end):
+    """
+    pykrx에서 [start, end] 구간 원본 데이터 수집
+
+    Returns:
+        tuple: (시가총액 DataFrame, 투자자별 거래대금 DataFrame)
+    """
+    from pykrx import stock
+
+    start_str = start.strftime("%Y%m%d")
+    end_str = end.strftime("%Y%m%d")
+
+    with span("timeseries.fetch"):
+        mcap = resilient_fetch.krx(stock.get_market_cap, start_str, end_str, ticker)
+        inv = resilient_fetch.krx(
+            stock.get_market_trading_value_by_date, start_str, end_str, ticker, detail=True
+        )
+        set_rows(len(mcap))
+    return mcap, inv
+
+
+def _store(conn, ticker, mcap, inv):
+    mcap_rows = [
+        (ticker, idx.strftime(_DATE_FMT), int(value))
+        for idx, value in mcap["시가총액"].items()
+        if pd.notna(value)
+    ] if not mcap.empty else []
+
+    inv_rows = []
+    if not inv.empty:
+        stacked = inv.stack().dropna()
+        inv_rows = [
+            (ticker, idx.strftime(_DATE_FMT), str(investor), int(value))
+            for (idx, investor), value in stacked.items()
+        ]
+
+    conn.executemany(
+        "INSERT OR REPLACE INTO market_cap (ticker, date, market_cap) VALUES (?, ?, ?)",
+        mcap_rows
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO investor_values (ticker, date, investor, value) "
+        "VALUES (?, ?, ?, ?)",
+        inv_rows
+    )
+
+
+def _missing_ranges(coverage, start, end, now):
+    """
+    캐시 범위 밖에서 새로 받아야 할 날짜 구간 목록
+
+    요청 구간은 거래일 기준으로 좁히고(주말/휴장일만 남은 구간은 요청하지 않음),
+    확정된(장 마감 후 수집된) 거래일 데이터는 다시 받지 않습니다.
+
+    Args:
+        coverage: (start, end, fetched_at) 또는 None
+        start, end: 요청 구간 (date)
+        now: 현재 시각 (datetime)
+
+    Returns:
+        list: [(start, end), ...]
+    """
+    days = trading_calendar.trading_days(start, end, now)
+    if not days:
+        return []
+    start, end = days[0], days[-1]
+
+    if coverage is None:
+        return [(start, end)]
+
+    cov_start = _parse_date(coverage[0])
+    cov_end = _parse_date(coverage[1])
+    fetched_at = coverage[2]
+    settled = trading_calendar.is_settled(cov_end, fetched_at, now)
+
+    ranges = []
+    if start < cov_start:
+        ranges.append((start, cov_start - timedelta(days=1)))
+
+    if end > cov_end:
+        # 마지막 저장일이 수집 당시 장중이었다면 그 날부터 다시 수집
+        # (캐시 범위가 끊기지 않도록 요청 시작일이 아닌 cov_end부터)
+        ranges.append((cov_end if not settled else cov_end + timedelta(days=1), end))
+    elif cov_end == end and not settled and now.timestamp() - fetched_at > TODAY_REFRESH_INTERVAL:
+        ranges.append((end, end))
+
+    return ranges
+
+
+def get_daily_frames(ticker, start, end):
+    """
+    [start, end] 구간의 원본 일별 데이터 (캐시 우선, 부족한 구간만 수집)
+
+    Args:
+        ticker: 종목 코드
+        start, end: 조회 구간 (datetime 또는 date)
+
+    Returns:
+        tuple: (시가총액 DataFrame["시가총액"], 투자자별 거래대금 DataFrame)
+               인덱스는 DatetimeIndex
+    """
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+
+    ensure_range(ticker, start, end)
+
+    with span("timeseries.load"):
+        return load_frames(ticker, start, end)
+
+
+def ensure_range(ticker, start, end, allow_stale=True):
+    """
+    [start, end] 구간 중 캐시에 없는 부분만 수집하여 저장 (읽기는 하지 않음)
+
+    Args:
+        allow_stale: 수집 실패 시 저장된 데이터가 있으면 오류 대신 그대로 둠
+                     (False면 오류 발생: 백필처럼 실패를 기록해야 하는 경우)
+
+    Returns:
+        int: 새로 저장한 시가총액 행 수
+    """
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+
+    coverage = _read_coverage(ticker)
+    ranges = _missing_ranges(coverage, start, end, datetime.now())
+
+    if ranges:
+        count("timeseries.cache", "miss")
+        print(f"[timeseries_cache] {ticker} 캐시 미스: {ranges}", file=sys.stderr)
+    else:
+        count("timeseries.cache", "hit")
+        print(f"[timeseries_cache] {ticker} 캐시 히트", file=sys.stderr)
+
+    # 네트워크 수집은 잠금 밖에서 수행 (여러 종목 병렬 수집 가능)
+    rows = 0
+    for fetch_start, fetch_end in ranges:
+        try:
+            mcap, inv = _fetch_range(ticker, fetch_start, fetch_end)
+        except Exception as e:
+            # 재시도 후에도 실패(서킷 열림 포함)하면 저장된 데이터가 있을 때 그것으로 응답
+            if coverage is None or not allow_stale:
+                raise
+            count("timeseries.cache", "stale")
+            print(f"[timeseries_cache] {ticker} 수집 실패, 저장된 데이터 사용 "
+                  f"({coverage[0]} ~ {coverage[1]}): {e}", file=sys.stderr)
+            break
+        with span("timeseries.store"):
+            _write_range(ticker, fetch_start, fetch_end, mcap, inv)
+        rows += len(mcap)
+    return rows
+
+
+def is_cached(ticker, start, end):
+    """[start, end] 구간을 새로 수집하지 않고 캐시만으로 응답할 수 있는지 (미리 받기 확인용)"""
+    start = start.date() if isinstance(start, datetime) else start
+    end = end.date() if isinstance(end, datetime) else end
+    return not _missing_ranges(_read_coverage(ticker), start, end, datetime.now())
+
+
+def _read_coverage(ticker):
+    """저장된 캐시 범위 (start, end, fetched_at) 또는 None"""
+    with _conn_lock:
+        return _get_conn().execute(
+            "SELECT start, end, fetched_at FROM coverage WHERE ticker = ?", (ticker,)
+        ).fetchone()
+
+
+def _write_range(ticker, fetch_start, fetch_end, mcap, inv):
+    """수집한 구간을 저장하고 캐시 범위를 확장"""
+    with _conn_lock:
+        conn = _get_conn()
+        coverage = _read_coverage(ticker)
+        if coverage is not None:
+            fetch_start = min(fetch_start, _parse_date(coverage[0]))
+            fetch_end = max(fetch_end, _parse_date(coverage[1]))
+        with conn:
+            _store(conn, ticker, mcap, inv)
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (ticker, start, end, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (ticker, fetch_start.strftime(_DATE_FMT), fetch_end.strftime(_DATE_FMT),
+                 time.time())
+            )
+
+
+def load_frames(ticker, start, end):
+    """
+    저장된 데이터만으로 [start, end] 구간 DataFrame 생성 (네트워크 사용 안 함)
+
+    Returns:
+        tuple: (시가총액 DataFrame, 투자자별 거래대금 DataFrame)
+    """
+    params = (ticker, start.strftime(_DATE_FMT), end.strftime(_DATE_FMT))
+
+    with _conn_lock:
+        conn = _get_conn()
+        mcap_rows = conn.execute(
+            "SELECT date, market_cap FROM market_cap "
+            "WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+            params
+        ).fetchall()
+        inv_rows = conn.execute(
+            "SELECT date, investor, value FROM investor_values "
+            "WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+            params
+        ).fetchall()
+
+    mcap = pd.DataFrame(mcap_rows, columns=["date", "시가총액"])
+    mcap.index = pd.to_datetime(mcap.pop("date"))
+
+    if inv_rows:
+        long = pd.DataFrame(inv_rows, columns=["date", "investor", "value"])
+        inv = long.pivot(index="date", columns="investor", values="value")
+        inv.index = pd.to_datetime(inv.index)
+        inv.columns.name = None
+        inv = with_totals(inv)
+    else:
+        inv = pd.DataFrame()
+
+    return mcap, inv
+
+
+def load_indicator_state(ticker, key):
+    """저장된 증분 지표 상태 (dict) 또는 None"""
+    with _conn_lock:
+        row = _get_conn().execute(
+            "SELECT state FROM indicator_state WHERE ticker = ? AND key = ?", (ticker, key)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_indicator_state(ticker, key, state):
+    """증분 지표 상태 저장 (IncrementalOscillator.to_dict() 결과)"""
+    with _conn_lock:
+        conn = _get_conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO indicator_state (ticker, key, state) VALUES (?, ?, ?)",
+                (ticker, key, json.dumps(state))
+            )
+
+
+def clear(ticker=None):
+    """캐시 삭제 (ticker가 없으면 전체)"""
+    with _conn_lock:
+        conn = _get_conn()
+        with conn:
+            for table in ("market_cap", "investor_values", "coverage", "indicator_state"):
+                if ticker is None:
+                    conn.execute(f"DELETE FROM {table}")
+                else:
+                    conn.execute(f"DELETE FROM {table} WHERE ticker = ?", (ticker,))
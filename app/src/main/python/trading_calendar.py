@@ -0,0 +1,250 @@
+"""
+KRX 거래일 달력 모듈
+pykrx의 영업일 목록을 SQLite에 누적 저장하고, 요청 구간 계산과
+캐시 신선도 판단(마감된 거래일 데이터는 다시 받지 않음)에 사용합니다.
+
+- 지난 날짜의 거래일 여부는 한 번 받으면 바뀌지 않으므로 다시 묻지 않습니다.
+- 오늘은 장이 열려야 KRX 목록에 나타나므로, 목록에 없으면 TODAY_REFRESH_INTERVAL마다 다시 확인합니다.
+- 달력을 받을 수 없으면(오프라인 등) 주말만 제외한 평일로 대신합니다.
+"""
+
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from datetime import time as dtime
+
+from local_store import connect
+import resilient_fetch
+
+DB_NAME = "calendar.db"
+
+# 투자자별 거래대금 등 일별 데이터가 확정되는 시각 (장 마감 15:30 이후)
+DATA_SETTLED = dtime(18, 0)
+
+# 오늘이 거래일 목록에 없을 때 다시 확인하는 간격 (초)
+TODAY_REFRESH_INTERVAL = 600
+
+# 처음 만들 때 최소 수집 기간 (일)
+MIN_HISTORY_DAYS = 60
+
+_DATE_FMT = "%Y-%m-%d"
+
+_lock = threading.Lock()
+_days = None        # 정렬된 거래일 목록 [date, ...]
+_coverage = None    # (start, end, fetched_at): KRX에 물어본 구간
+_failed_at = 0.0    # 마지막 수집 실패 시각
+
+
+def _get_conn():
+    conn = connect(DB_NAME)
+    conn.execute("CREATE TABLE IF NOT EXISTS business_days (date TEXT PRIMARY KEY)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS coverage ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), start TEXT, end TEXT, fetched_at REAL)"
+    )
+    return conn
+
+
+def _parse_date(text):
+    return datetime.strptime(text, _DATE_FMT).date()
+
+
+def _load():
+    """저장된 달력을 메모리로 (잠금 안에서 호출)"""
+    global _days, _coverage
+    conn = _get_conn()
+    try:
+        _days = [_parse_date(row[0]) for row in
+                 conn.execute("SELECT date FROM business_days ORDER BY date")]
+        row = conn.execute("SELECT start, end, fetched_at FROM coverage WHERE id = 1").fetchone()
+        _coverage = (_parse_date(row[0]), _parse_date(row[1]), row[2]) if row else None
+    finally:
+        conn.close()
+
+
+def _fetch(start, end):
+    """pykrx에서 [start, end] 영업일 목록 수집"""
+    from pykrx import stock
+
+    days = resilient_fetch.krx(
+        stock.get_previous_business_days,
+        fromdate=start.strftime("%Y%m%d"), todate=end.strftime("%Y%m%d")
+    )
+    return [d.date() if isinstance(d, datetime) else d for d in days]
+
+
+def _save(fetched, start, end, fetched_at):
+    """수집 결과 저장 및 메모리 달력 갱신 (잠금 안에서 호출)"""
+    global _days, _coverage
+    conn = _get_conn()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO business_days (date) VALUES (?)",
+                [(d.strftime(_DATE_FMT),) for d in fetched]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (id, start, end, fetched_at) VALUES (1, ?, ?, ?)",
+                (start.strftime(_DATE_FMT), end.strftime(_DATE_FMT), fetched_at)
+            )
+    finally:
+        conn.close()
+    _days = sorted(set(_days) | set(fetched))
+    _coverage = (start, end, fetched_at)
+
+
+def _ensure(start, now):
+    """
+    [start, 오늘] 구간의 거래일을 확보
+
+    Returns:
+        bool: 달력을 쓸 수 있으면 True (False면 평일로 대신)
+    """
+    global _failed_at
+    today = now.date()
+
+    with _lock:
+        if _days is None:
+            _load()
+
+        ranges = []
+        if _coverage is None:
+            ranges.append((min(start, today - timedelta(days=MIN_HISTORY_DAYS)), today))
+        else:
+            cov_start, cov_end, fetched_at = _coverage
+            if start < cov_start:
+                ranges.append((start, cov_start - timedelta(days=1)))
+            if cov_end < today:
+                ranges.append((cov_end, today))
+            elif ((not _days or _days[-1] < today)
+                  and fetched_at < datetime.combine(today, DATA_SETTLED).timestamp()
+                  and time.time() - fetched_at > TODAY_REFRESH_INTERVAL):
+                # 오늘이 아직 목록에 없음: 장 시작 전이거나 휴장일 (마감 이후에도 없으면 휴장일)
+                ranges.append((today, today))
+
+        if not ranges:
+            return True
+        if time.time() - _failed_at < TODAY_REFRESH_INTERVAL:
+            return _coverage is not None
+
+        try:
+            for fetch_start, fetch_end in ranges:
+                fetched = _fetch(fetch_start, fetch_end)
+                new_start = fetch_start if _coverage is None else min(fetch_start, _coverage[0])
+                new_end = fetch_end if _coverage is None else max(fetch_end, _coverage[1])
+                _save(fetched, new_start, new_end, time.time())
+            return True
+        except Exception as e:
+            _failed_at = time.time()
+            print(f"[trading_calendar] 거래일 수집 실패, 평일로 대신: {e}", file=sys.stderr)
+            return _coverage is not None
+
+
+def _weekdays(start, end):
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def trading_days(start, end, now=None):
+    """
+    [start, end] 구간의 거래일 목록 (오늘 이후는 제외)
+
+    Args:
+        start, end: date 또는 datetime
+
+    Returns:
+        list: [date, ...] (오름차순)
+    """
+    now = now or datetime.now()
+    start, end = _as_date(start), min(_as_date(end), now.date())
+    if start > end:
+        return []
+
+    if not _ensure(start, now):
+        return _weekdays(start, end)
+
+    with _lock:
+        lo = bisect_left(_days, start)
+        hi = bisect_right(_days, end)
+        days = _days[lo:hi]
+        cov_end = _coverage[1]
+
+    # 수집 실패로 달력이 오늘까지 닿지 않았으면 그 뒤는 평일로 채움
+    if end > cov_end:
+        days += _weekdays(max(start, cov_end + timedelta(days=1)), end)
+    return days
+
+
+def last_trading_day(now=None):
+    """오늘 이전(오늘 포함) 가장 최근 거래일 (date)"""
+    now = now or datetime.now()
+    days = trading_days(now.date() - timedelta(days=14), now.date(), now)
+    if days:
+        return days[-1]
+    return _weekdays(now.date() - timedelta(days=7), now.date())[-1]
+
+
+def recent_trading_days(count, now=None):
+    """
+    최근 count개 거래일 (오름차순, 마지막이 last_trading_day)
+
+    Returns:
+        list: [date, ...]
+    """
+    now = now or datetime.now()
+    days = trading_days(now.date() - timedelta(days=count * 2 + 14), now.date(), now)
+    return days[-count:]
+
+
+def first_trading_day_on_or_after(day, now=None):
+    """day 이후(포함) 첫 거래일 (없으면 None)"""
+    now = now or datetime.now()
+    day = _as_date(day)
+    days = trading_days(day, min(day + timedelta(days=14), now.date()), now)
+    return days[0] if days else None
+
+
+def is_settled(day, fetched_at, now=None):
+    """
+    day까지의 일별 데이터가 fetched_at(epoch 초) 시점에 이미 확정되어 있었는지
+
+    day가 휴장일이면 그 이전 마지막 거래일을 기준으로 판단합니다.
+    확정된 데이터는 다시 받을 필요가 없습니다.
+    """
+    day = _as_date(day)
+    now = now or datetime.now()
+    if day > now.date():
+        return False
+    days = trading_days(day - timedelta(days=14), day, now)
+    last = days[-1] if days else day
+    return fetched_at >= datetime.combine(last, DATA_SETTLED).timestamp()
+
+
+def trading_date_key(now=None):
+    """캐시 키용 거래일 문자열 (YYYYMMDD): 새 거래일이 시작되어야 바뀜"""
+    return last_trading_day(now).strftime("%Y%m%d")
+
+
+def clear():
+    """저장된 달력 삭제"""
+    global _days, _coverage, _failed_at
+    with _lock:
+        conn = _get_conn()
+        try:
+            with conn:
+                conn.execute("DELETE FROM business_days")
+                conn.execute("DELETE FROM coverage")
+        finally:
+            conn.close()
+        _days, _coverage, _failed_at = [], None, 0.0
@@ -0,0 +1,674 @@
+"""
+전 종목 일별 데이터 저장소 (메모리 매핑 열 형식)
+종목별 DataFrame 대신 항목(field)마다 하나의 2차원 float64 배열(날짜 × 종목)을 파일로 두고
+np.memmap으로 열어, 필요한 구간만 운영체제가 읽어 오게 합니다.
+
+디렉터리 구성 (get_data_dir("universe")):
+    meta.json      버전, 항목 목록, 날짜 수, 배열 용량(행/열), 마지막 기록 시각
+    dates.i4       int32[행 용량]  1970-01-01 기준 일수 (epoch day, bridge_codec과 동일)
+    tickers.txt    열 순서대로 "종목코드<TAB>시장" 한 줄씩
+    <field>.f8     float64[행 용량, 열 용량] (C 순서, 행 = 거래일)
+
+- 값이 없으면 NaN (상장 전, 거래정지 등)
+- 저장하는 값은 원본 일별 값 (timeseries_cache와 같이 5일 합계 등 파생 값은 저장하지 않음)
+- 날짜/종목 구간 조회는 복사 없는 뷰를 반환 (종목 하나는 열 간격(stride) 뷰)
+- 새 거래일은 행 하나를 쓰는 것으로 추가 (행 용량은 DATE_CHUNK 단위로 파일 끝을 늘림)
+- 첫 저장일 이전 날짜는 파일을 다시 써서 앞에 추가 (과거 데이터 채우기, 드묾)
+- 새 종목은 남은 열 용량에 추가하고, 용량이 모자랄 때만 파일을 다시 씀
+- 쓰기는 한 프로세스에서만 (읽기는 여러 프로세스 가능). meta.json을 마지막에 교체하므로
+  읽는 쪽은 항상 완성된 행까지만 봅니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date as date_type, datetime, timedelta
+
+import numpy as np
+
+from local_store import get_data_dir
+
+STORE_DIR = "universe"
+VERSION = 1
+
+# 항목: 시가총액, 외국인합계/기관합계 일별 순매수 거래대금
+FIELDS = ("market_cap", "foreign", "institution")
+
+DTYPE = np.float64
+DATE_CHUNK = 256     # 행 용량 증가 단위 (약 1년)
+TICKER_CHUNK = 512   # 열 용량 증가 단위
+
+ROLLING_DAYS = 5
+
+_META = "meta.json"
+_DATES = "dates.i4"
+_TICKERS = "tickers.txt"
+_EPOCH = date_type(1970, 1, 1)
+
+
+def to_epoch_day(value):
+    """date/datetime/"YYYY-MM-DD"/"YYYYMMDD" → epoch day (int)"""
+    if isinstance(value, str):
+        fmt = "%Y%m%d" if len(value) == 8 else "%Y-%m-%d"
+        value = datetime.strptime(value, fmt)
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def from_epoch_day(day):
+    return _EPOCH + timedelta(days=int(day))
+
+
+class UniverseStore:
+    """
+    전 종목 일별 데이터 저장소
+
+    사용 예:
+        store = UniverseStore.open()
+        caps = store.view("market_cap", "2024-01-01")      # (날짜, 전 종목) 뷰
+        col = store.series("foreign", "005930")           # 한 종목 (간격 뷰)
+        data = store.stock_data("005930", 180)            # get_stock_data 형식
+    """
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self._lock = threading.RLock()
+        self._meta_mtime = None
+        self._load()
+
+    # --- 생성 / 열기 ---
+
+    @classmethod
+    def create(cls, path=None, fields=FIELDS, date_capacity=DATE_CHUNK, ticker_capacity=TICKER_CHUNK):
+        """빈 저장소 생성 (이미 있으면 FileExistsError)"""
+        path = path or get_data_dir(STORE_DIR)
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, _META)):
+            raise FileExistsError(f"이미 저장소가 있습니다: {path}")
+
+        meta = {
+            "version": VERSION,
+            "fields": list(fields),
+            "n_dates": 0,
+            "date_capacity": date_capacity,
+            "ticker_capacity": ticker_capacity,
+            "updated_at": 0.0,
+        }
+        np.zeros(date_capacity, dtype=np.int32).tofile(os.path.join(path, _DATES))
+        for field in fields:
+            _allocate(os.path.join(path, field + ".f8"), date_capacity, ticker_capacity)
+        open(os.path.join(path, _TICKERS), "w", encoding="utf-8").close()
+        _write_json(os.path.join(path, _META), meta)
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path=None, writable=False, create=False):
+        """
+        저장소 열기
+
+        Args:
+            writable: 쓰기 가능 (쓰는 프로세스는 하나만)
+            create: 없으면 새로 생성
+
+        Raises:
+            FileNotFoundError: 저장소가 없고 create=False
+        """
+        path = path or get_data_dir(STORE_DIR)
+        if not os.path.exists(os.path.join(path, _META)):
+            if create:
+                return cls.create(path)
+            raise FileNotFoundError(f"저장소가 없습니다: {path}")
+        return cls(path, writable=writable)
+
+    @staticmethod
+    def exists(path=None):
+        return os.path.exists(os.path.join(path or get_data_dir(STORE_DIR), _META))
+
+    def _load(self):
+        """meta/인덱스 파일을 읽고 배열을 메모리 매핑"""
+        meta_path = os.path.join(self.path, _META)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != VERSION:
+            raise ValueError(f"지원하지 않는 저장소 버전: {meta.get('version')}")
+
+        self._meta_mtime = os.stat(meta_path).st_mtime_ns
+        self.fields = tuple(meta["fields"])
+        self.n_dates = meta["n_dates"]
+        self.date_capacity = meta["date_capacity"]
+        self.ticker_capacity = meta["ticker_capacity"]
+        self.updated_at = meta.get("updated_at", 0.0)
+
+        with open(os.path.join(self.path, _TICKERS), encoding="utf-8") as f:
+            entries = [line.rstrip("\n").split("\t") for line in f if line.strip()]
+        self.tickers = [entry[0] for entry in entries]
+        self.markets = [entry[1] if len(entry) > 1 else "" for entry in entries]
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        mode = "r+" if self.writable else "r"
+        shape = (self.date_capacity, self.ticker_capacity)
+        self._dates = np.memmap(os.path.join(self.path, _DATES), dtype=np.int32,
+                                mode=mode, shape=(self.date_capacity,))
+        self._arrays = {
+            field: np.memmap(os.path.join(self.path, field + ".f8"), dtype=DTYPE, mode=mode, shape=shape)
+            for field in self.fields
+        }
+
+    def refresh(self):
+        """다른 프로세스가 추가한 날짜/종목 반영 (바뀐 경우에만 다시 읽음)"""
+        with self._lock:
+            mtime = os.stat(os.path.join(self.path, _META)).st_mtime_ns
+            if mtime != self._meta_mtime:
+                self._load()
+
+    # --- 조회 (복사 없는 뷰) ---
+
+    @property
+    def dates(self):
+        """저장된 거래일 (int32 epoch day 뷰)"""
+        return self._dates[:self.n_dates]
+
+    @property
+    def last_date(self):
+        return from_epoch_day(self._dates[self.n_dates - 1]) if self.n_dates else None
+
+    def column(self, ticker):
+        """종목의 열 번호 (없으면 KeyError)"""
+        try:
+            return self._columns[ticker]
+        except KeyError:
+            raise KeyError(f"저장소에 없는 종목입니다: {ticker}") from None
+
+    def rows(self, start=None, end=None):
+        """[start, end] 구간의 행 범위 slice (날짜는 date/문자열/epoch day)"""
+        dates = self.dates
+        lo = 0 if start is None else int(np.searchsorted(dates, _as_day(start), "left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, _as_day(end), "right"))
+        return slice(lo, hi)
+
+    def view(self, field, start=None, end=None):
+        """
+        (날짜, 전 종목) 2차원 뷰
+
+        Returns:
+            ndarray: shape (구간 날짜 수, 종목 수), 파일에 매핑된 뷰 (복사 없음)
+        """
+        return self._arrays[field][self.rows(start, end), :len(self.tickers)]
+
+    def series(self, field, ticker, start=None, end=None):
+        """한 종목의 날짜 구간 1차원 뷰 (열 간격 뷰, 복사 없음)"""
+        return self._arrays[field][self.rows(start, end), self.column(ticker)]
+
+    def select(self, field, tickers, start=None, end=None):
+        """
+        여러 종목 (날짜, 선택 종목) 배열
+
+        연속된 열이면 뷰, 아니면 선택한 열만 복사합니다.
+        """
+        columns = [self.column(t) for t in tickers]
+        rows = self.rows(start, end)
+        if columns and columns == list(range(columns[0], columns[0] + len(columns))):
+            return self._arrays[field][rows, columns[0]:columns[0] + len(columns)]
+        return self._arrays[field][rows][:, columns]
+
+    def stock_data(self, ticker, days=None, now=None):
+        """
+        한 종목의 get_stock_data 형식 결과 (저장된 값만 사용, 네트워크 사용 안 함)
+
+        get_stock_data와 같이 구간 안의 값으로 5일 합계를 만들어 처음 ROLLING_DAYS - 1 거래일은
+        버리고, 값이 없는 날(상장 전 등)은 dropna처럼 제외하므로 같은 결과를 냅니다.
+
+        Returns:
+            dict 또는 None: {"dates", "market_cap", "foreign_5d", "institution_5d"}
+        """
+        with self._lock:
+            if ticker not in self._columns:
+                return None
+            rows = self.rows()
+            if days is not None:
+                start = ((now or datetime.now()) - timedelta(days=days)).date()
+                rows = self.rows(start)
+            lo = rows.start
+            col = self._columns[ticker]
+            dates = self._dates[lo:rows.stop].copy()
+            mcap = np.array(self._arrays["market_cap"][lo:rows.stop, col])
+            foreign = np.array(self._arrays["foreign"][lo:rows.stop, col])
+            institution = np.array(self._arrays["institution"][lo:rows.stop, col])
+
+        # get_stock_data와 같이: 투자자 값이 있는 날로 5일 합계, 시가총액과 합쳐 결측 제거
+        flows = ~(np.isnan(foreign) | np.isnan(institution))
+        foreign_5d = np.full(len(dates), np.nan)
+        institution_5d = np.full(len(dates), np.nan)
+        index = np.flatnonzero(flows)
+        foreign_5d[index] = _rolling_sum(foreign[index])
+        institution_5d[index] = _rolling_sum(institution[index])
+
+        keep = ~(np.isnan(mcap) | np.isnan(foreign_5d))
+        if not keep.any():
+            return None
+
+        return {
+            "dates": [from_epoch_day(d).strftime("%Y-%m-%d") for d in dates[keep].tolist()],
+            "market_cap": mcap[keep].tolist(),
+            "foreign_5d": foreign_5d[keep].tolist(),
+            "institution_5d": institution_5d[keep].tolist(),
+        }
+
+    def rolling_snapshot(self, market=None, days=ROLLING_DAYS):
+        """
+        마지막 거래일 기준 전 종목 횡단면 (시장 스캔용)
+
+        Returns:
+            dict 또는 None: {"date": "YYYYMMDD", "tickers", "markets", "market_cap",
+                             "foreign_5d", "institution_5d"} (배열)
+                            저장된 날짜가 days보다 적으면 None
+        """
+        with self._lock:
+            if self.n_dates < days:
+                return None
+            rows = slice(self.n_dates - days, self.n_dates)
+            n = len(self.tickers)
+            markets = np.array(self.markets, dtype=object)
+            mask = np.ones(n, dtype=bool) if market is None else markets == market
+            mcap = self._arrays["market_cap"][self.n_dates - 1, :n][mask]
+            # nansum: 값이 없는 날은 순매수 0 (시장 전체 순매수 조회와 같은 결과)
+            foreign = np.nansum(self._arrays["foreign"][rows, :n], axis=0)[mask]
+            institution = np.nansum(self._arrays["institution"][rows, :n], axis=0)[mask]
+            return {
+                "date": self.last_date.strftime("%Y%m%d"),
+                "tickers": [t for t, keep in zip(self.tickers, mask) if keep],
+                "markets": markets[mask].tolist(),
+                "market_cap": np.array(mcap),
+                "foreign_5d": foreign,
+                "institution_5d": institution,
+            }
+
+    # --- 쓰기 ---
+
+    def _check_writable(self):
+        if not self.writable:
+            raise PermissionError("읽기 전용으로 연 저장소입니다")
+
+    def add_tickers(self, tickers, markets=None):
+        """
+        새 종목 열 추가 (이미 있는 종목은 무시, 시장 정보만 갱신)
+
+        Returns:
+            int: 새로 추가한 종목 수
+        """
+        self._check_writable()
+        markets = markets or [""] * len(tickers)
+        with self._lock:
+            new = []
+            for ticker, market in zip(tickers, markets):
+                col = self._columns.get(ticker)
+                if col is None:
+                    self._columns[ticker] = len(self.tickers)
+                    self.tickers.append(ticker)
+                    self.markets.append(market)
+                    new.append(ticker)
+                elif market:
+                    self.markets[col] = market
+
+            if len(self.tickers) > self.ticker_capacity:
+                capacity = -(-len(self.tickers) // TICKER_CHUNK) * TICKER_CHUNK
+                self._resize(self.date_capacity, capacity)
+            self._write_tickers()
+            return len(new)
+
+    def append_day(self, day, values, markets=None):
+        """
+        거래일 하나의 전 종목 값 추가 (마지막 날짜와 같으면 그 행을 교체)
+
+        Args:
+            day: 날짜 (date/문자열)
+            values: {field: {ticker: 값}} (dict 또는 pandas Series). 없는 종목은 NaN
+            markets: {ticker: 시장} (새 종목의 시장 정보, 선택)
+
+        Raises:
+            ValueError: 마지막 저장일보다 이전 날짜
+        """
+        self._check_writable()
+        epoch_day = _as_day(day)
+        with self._lock:
+            values = {field: list(field_values.items()) for field, field_values in values.items()}
+            tickers = []
+            for items in values.values():
+                tickers.extend(t for t, _ in items if t not in self._columns)
+            tickers = list(dict.fromkeys(tickers))
+            if tickers:
+                self.add_tickers(tickers, [(markets or {}).get(t, "") for t in tickers])
+
+            if self.n_dates and epoch_day < self._dates[self.n_dates - 1]:
+                raise ValueError(f"마지막 저장일({self.last_date}) 이전 날짜는 추가할 수 없습니다: {day}")
+            if self.n_dates and epoch_day == self._dates[self.n_dates - 1]:
+                row = self.n_dates - 1
+            else:
+                row = self.n_dates
+                if row >= self.date_capacity:
+                    self._resize(self.date_capacity + DATE_CHUNK, self.ticker_capacity)
+
+            n = len(self.tickers)
+            for field in self.fields:
+                line = np.full(n, np.nan)
+                items = values.get(field)
+                if items:
+                    cols = [self._columns[t] for t, _ in items]
+                    line[cols] = np.fromiter((v for _, v in items), dtype=DTYPE, count=len(cols))
+                self._arrays[field][row, :n] = line
+            self._dates[row] = epoch_day
+            self._commit(max(self.n_dates, row + 1))
+
+    def write_column(self, ticker, days, values):
+        """
+        한 종목의 여러 날짜 값 쓰기 (이미 있는 행만, 과거 데이터 채우기용)
+
+        Args:
+            days: 날짜 목록 (저장소에 없는 날짜는 무시)
+            values: {field: 값 배열} (days와 같은 길이)
+
+        Returns:
+            int: 쓴 행 수
+        """
+        self._check_writable()
+        with self._lock:
+            if ticker not in self._columns:
+                self.add_tickers([ticker])
+            col = self._columns[ticker]
+            stored = self.dates
+            wanted = np.fromiter((_as_day(d) for d in days), dtype=np.int32, count=len(days))
+            if not len(stored):
+                return 0
+            pos = np.searchsorted(stored, wanted)
+            found = (pos < len(stored)) & (stored[np.minimum(pos, len(stored) - 1)] == wanted)
+            for field, field_values in values.items():
+                self._arrays[field][pos[found], col] = np.asarray(field_values, dtype=DTYPE)[found]
+            return int(np.count_nonzero(found))
+
+    def extend_dates(self, days):
+        """
+        저장 구간 밖의 날짜 행 추가 (값은 NaN, write_column으로 채움)
+
+        마지막 저장일 이후 날짜는 행을 뒤에 쓰고, 첫 저장일 이전 날짜는 파일을 다시 써서
+        기존 행 앞에 넣습니다. 저장 구간 안의 빠진 날짜는 추가하지 않습니다.
+
+        Returns:
+            int: 추가한 날짜 수
+        """
+        self._check_writable()
+        with self._lock:
+            wanted = {_as_day(d) for d in days}
+            first = self._dates[0] if self.n_dates else None
+            last = self._dates[self.n_dates - 1] if self.n_dates else -1
+            older = sorted(d for d in wanted if first is not None and d < first)
+            new = sorted(d for d in wanted if d > last)
+            if older:
+                self._prepend(older)
+            if not new:
+                return len(older)
+            needed = self.n_dates + len(new)
+            if needed > self.date_capacity:
+                capacity = -(-needed // DATE_CHUNK) * DATE_CHUNK
+                self._resize(capacity, self.ticker_capacity)
+            self._dates[self.n_dates:needed] = new
+            for field in self.fields:
+                self._arrays[field][self.n_dates:needed, :] = np.nan
+            self._commit(needed)
+            return len(older) + len(new)
+
+    def flush(self):
+        """배열/인덱스 파일을 디스크에 기록"""
+        with self._lock:
+            if self.writable:
+                self._commit(self.n_dates)
+
+    def _commit(self, n_dates):
+        """데이터를 먼저 기록한 뒤 meta.json을 교체하여 새 행을 공개"""
+        for array in self._arrays.values():
+            array.flush()
+        self._dates.flush()
+        self.n_dates = n_dates
+        self.updated_at = time.time()
+        _write_json(os.path.join(self.path, _META), {
+            "version": VERSION,
+            "fields": list(self.fields),
+            "n_dates": n_dates,
+            "date_capacity": self.date_capacity,
+            "ticker_capacity": self.ticker_capacity,
+            "updated_at": self.updated_at,
+        })
+        self._meta_mtime = os.stat(os.path.join(self.path, _META)).st_mtime_ns
+
+    def _write_tickers(self):
+        tmp = os.path.join(self.path, _TICKERS + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for ticker, market in zip(self.tickers, self.markets):
+                f.write(f"{ticker}\t{market}\n")
+        os.replace(tmp, os.path.join(self.path, _TICKERS))
+
+    def _resize(self, date_capacity, ticker_capacity):
+        """
+        배열 용량 변경
+
+        열 용량이 같으면 파일 끝만 늘리고(C 순서이므로 기존 행은 그대로),
+        열 용량이 바뀌면 새 파일에 복사한 뒤 교체합니다.
+        """
+        shape = (date_capacity, ticker_capacity)
+        for field in self.fields:
+            path = os.path.join(self.path, field + ".f8")
+            old = self._arrays[field]
+            old.flush()
+            self._arrays[field] = None
+            if ticker_capacity == self.ticker_capacity:
+                del old
+                with open(path, "r+b") as f:
+                    f.truncate(date_capacity * ticker_capacity * np.dtype(DTYPE).itemsize)
+                array = np.memmap(path, dtype=DTYPE, mode="r+", shape=shape)
+                array[self.date_capacity:] = np.nan
+            else:
+                tmp = path + ".tmp"
+                _allocate(tmp, date_capacity, ticker_capacity)
+                array = np.memmap(tmp, dtype=DTYPE, mode="r+", shape=shape)
+                array[:self.n_dates, :self.ticker_capacity] = old[:self.n_dates]
+                array.flush()
+                del array, old
+                os.replace(tmp, path)
+                array = np.memmap(path, dtype=DTYPE, mode="r+", shape=shape)
+            self._arrays[field] = array
+
+        if date_capacity != self.date_capacity:
+            dates_path = os.path.join(self.path, _DATES)
+            self._dates.flush()
+            self._dates = None
+            with open(dates_path, "r+b") as f:
+                f.truncate(date_capacity * np.dtype(np.int32).itemsize)
+            self._dates = np.memmap(dates_path, dtype=np.int32, mode="r+", shape=(date_capacity,))
+
+        self.date_capacity = date_capacity
+        self.ticker_capacity = ticker_capacity
+        print(f"[universe_store] 용량 변경: {date_capacity}일 x {ticker_capacity}종목", file=sys.stderr)
+
+    def _prepend(self, days):
+        """
+        첫 저장일 이전 날짜 행을 앞에 추가 (days는 정렬된 epoch day, 값은 NaN)
+
+        기존 행을 옮겨야 하므로 열 용량 변경과 같이 새 파일에 복사한 뒤 교체합니다.
+        """
+        count = len(days)
+        needed = self.n_dates + count
+        capacity = max(self.date_capacity, -(-needed // DATE_CHUNK) * DATE_CHUNK)
+        shape = (capacity, self.ticker_capacity)
+        for field in self.fields:
+            path = os.path.join(self.path, field + ".f8")
+            old = self._arrays[field]
+            old.flush()
+            self._arrays[field] = None
+            tmp = path + ".tmp"
+            _allocate(tmp, capacity, self.ticker_capacity)
+            array = np.memmap(tmp, dtype=DTYPE, mode="r+", shape=shape)
+            for lo in range(0, self.n_dates, DATE_CHUNK):
+                hi = min(lo + DATE_CHUNK, self.n_dates)
+                array[count + lo:count + hi] = old[lo:hi]
+            array.flush()
+            del array, old
+            os.replace(tmp, path)
+            self._arrays[field] = np.memmap(path, dtype=DTYPE, mode="r+", shape=shape)
+
+        dates = np.zeros(capacity, dtype=np.int32)
+        dates[:count] = days
+        dates[count:needed] = self._dates[:self.n_dates]
+        dates_path = os.path.join(self.path, _DATES)
+        self._dates = None
+        dates.tofile(dates_path + ".tmp")
+        os.replace(dates_path + ".tmp", dates_path)
+        self._dates = np.memmap(dates_path, dtype=np.int32, mode="r+", shape=(capacity,))
+
+        self.date_capacity = capacity
+        self._commit(needed)
+        print(f"[universe_store] 이전 날짜 {count}일 추가: {from_epoch_day(days[0])}부터", file=sys.stderr)
+
+
+def _as_day(value):
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return to_epoch_day(value)
+
+
+def _allocate(path, rows, cols):
+    """NaN으로 채운 배열 파일 생성"""
+    array = np.memmap(path, dtype=DTYPE, mode="w+", shape=(rows, cols))
+    array[:] = np.nan
+    array.flush()
+    del array
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _rolling_sum(values, window=ROLLING_DAYS):
+    """pandas rolling(window).sum()과 같은 값 (앞 window-1개는 NaN)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        total = values[:len(values) - window + 1].copy()
+        for k in range(1, window):
+            total += values[k:len(values) - window + 1 + k]
+        out[window - 1:] = total
+    return out
+
+
+# --- 수집 ---
+
+def update_from_market(day=None, store=None):
+    """
+    하루치 전 종목 값을 pykrx 시장 전체 조회로 수집하여 추가
+    (시장별 시가총액 1회 + 투자자별 순매수 3회)
+
+    Args:
+        day: 거래일 (None이면 최근 거래일)
+
+    Returns:
+        int: 저장한 종목 수
+    """
+    from pykrx import stock
+
+    import resilient_fetch
+    import trading_calendar
+    from market_scanner import FOREIGN_INVESTORS, INSTITUTION_INVESTOR, MARKETS
+
+    day = day or trading_calendar.last_trading_day()
+    key = from_epoch_day(_as_day(day)).strftime("%Y%m%d")
+    store = store or UniverseStore.open(writable=True, create=True)
+
+    values = {field: {} for field in FIELDS}
+    markets = {}
+    for market in MARKETS:
+        caps = resilient_fetch.krx(stock.get_market_cap, key, market=market)["시가총액"]
+        values["market_cap"].update(caps.astype("float64").to_dict())
+        markets.update(dict.fromkeys(caps.index, market))
+
+        for field, investors in (("foreign", FOREIGN_INVESTORS), ("institution", (INSTITUTION_INVESTOR,))):
+            for investor in investors:
+                df = resilient_fetch.krx(
+                    stock.get_market_net_purchases_of_equities, key, key, market, investor
+                )
+                if df.empty:
+                    continue
+                target = values[field]
+                for ticker, value in df["순매수거래대금"].astype("float64").items():
+                    target[ticker] = target.get(ticker, 0.0) + value
+
+    store.append_day(day, values, markets)
+    print(f"[universe_store] {key} 추가: {len(values['market_cap'])}개 종목", file=sys.stderr)
+    return len(values["market_cap"])
+
+
+def import_from_cache(tickers, start, end=None, store=None):
+    """
+    timeseries_cache(종목별 SQLite 캐시)의 원본 일별 데이터로 저장소 채우기
+    (캐시에 없는 구간은 get_daily_frames가 수집)
+
+    날짜 행은 trading_calendar의 [start, end] 거래일로 추가합니다 (첫 저장일 이전 날짜는 앞에 추가).
+    데이터가 없는 종목(상장 전 구간 등)은 건너뜁니다.
+
+    Returns:
+        dict: {ticker: 쓴 행 수}
+    """
+    import trading_calendar
+    from ticker_index import get_ticker_index
+    from timeseries_cache import get_daily_frames
+
+    start = from_epoch_day(_as_day(start))
+    end = from_epoch_day(_as_day(end or datetime.now()))
+    store = store or UniverseStore.open(writable=True, create=True)
+    store.extend_dates(trading_calendar.trading_days(start, end))
+
+    markets = {r["ticker"]: r["market"] for r in get_ticker_index().records}
+    store.add_tickers(tickers, [markets.get(t, "") for t in tickers])
+
+    written = {}
+    for ticker in tickers:
+        try:
+            mcap, inv = get_daily_frames(ticker, start, end)
+        except Exception as e:
+            print(f"[universe_store] {ticker} 수집 실패: {e}", file=sys.stderr)
+            continue
+        if mcap.empty or inv.empty:
+            written[ticker] = 0
+            continue
+        frame = inv[["외국인합계", "기관합계"]].join(mcap["시가총액"], how="outer")
+        written[ticker] = store.write_column(ticker, frame.index.date.tolist(), {
+            "market_cap": frame["시가총액"].to_numpy(dtype=DTYPE),
+            "foreign": frame["외국인합계"].to_numpy(dtype=DTYPE),
+            "institution": frame["기관합계"].to_numpy(dtype=DTYPE),
+        })
+    store.flush()
+    return written
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    읽기 전용 공유 저장소 (없으면 None)
+
+    다른 프로세스/스레드가 추가한 날짜는 호출할 때마다 refresh()로 반영합니다.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            if not UniverseStore.exists():
+                return None
+            _store = UniverseStore.open()
+        else:
+            _store.refresh()
+        return _store
@@ -0,0 +1,231 @@
+package com.stockoscillator.data.calculator
+
+import com.stockoscillator.data.model.EpochDates
+import com.stockoscillator.data.model.StockData
+import org.junit.Assert.assertArrayEquals
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertTrue
+import org.junit.Test
+import java.lang.management.ManagementFactory
+import java.time.LocalDate
+import kotlin.random.Random
+
+/**
+ * 열 단위(기본형 배열) 결과 모델과 이전 List 기반 계산 비교
+ *
+ * 10년치(약 2,520 거래일) 데이터로 결과가 비트 단위까지 같은지 확인하고,
+ * 디코딩 + 오실레이터 계산 한 번에 드는 할당량과 시간을 출력합니다.
+ */
+class OscillatorCalculatorBenchmarkTest {
+
+    private val rows = 2520
+    private val warmUp = 200
+    private val iterations = 500
+
+    @Test
+    fun columnarMatchesLegacy() {
+        val raw = sampleColumns(rows)
+        val result = OscillatorCalculator.calculate(columnar(raw))
+        val legacy = LegacyCalculator.calculate(legacy(raw))
+
+        assertEquals(legacy.dates, List(result.size) { result.dates[it] })
+        assertEquals(legacy.marketCap, result.marketCap.asList())
+        assertArrayEquals(legacy.oscillator.toDoubleArray(), result.oscillator, 0.0)
+        assertArrayEquals(legacy.ema.toDoubleArray(), result.ema, 0.0)
+        assertArrayEquals(legacy.macd.toDoubleArray(), result.macd, 0.0)
+        assertArrayEquals(legacy.signal.toDoubleArray(), result.signal, 0.0)
+        assertArrayEquals(legacy.histogram.toDoubleArray(), result.histogram, 0.0)
+    }
+
+    @Test
+    fun shortSeriesMatchesLegacyPrefix() {
+        // 기간보다 짧은 데이터: 이전 계산은 앞을 0으로 채운 목록이 데이터보다 길었으므로 앞 n개만 비교
+        for (size in listOf(0, 1, 8, 11, 12, 25, 26, 34, 35)) {
+            val raw = sampleColumns(size)
+            val result = OscillatorCalculator.calculate(columnar(raw))
+            val legacy = LegacyCalculator.calculate(legacy(raw))
+
+            assertEquals(size, result.macd.size)
+            assertArrayEquals(legacy.oscillator.toDoubleArray(), result.oscillator, 0.0)
+            assertArrayEquals(legacy.ema.take(size).toDoubleArray(), result.ema, 0.0)
+            if (size >= 12) {
+                assertArrayEquals(legacy.macd.take(size).toDoubleArray(), result.macd, 0.0)
+                assertArrayEquals(legacy.signal.take(size).toDoubleArray(), result.signal, 0.0)
+                assertArrayEquals(legacy.histogram.take(size).toDoubleArray(), result.histogram, 0.0)
+            }
+        }
+    }
+
+    @Test
+    fun calculateIntoReusesArrays() {
+        val data = columnar(sampleColumns(rows))
+        val result = OscillatorCalculator.calculate(data)
+        val oscillator = result.oscillator
+
+        repeat(warmUp) { OscillatorCalculator.calculateInto(data, result) }
+        val allocated = allocatedBytes { OscillatorCalculator.calculateInto(data, result) }
+
+        assertTrue(oscillator === result.oscillator)
+        if (allocated >= 0) {
+            println("calculateInto: ${allocated}B/회")
+            assertTrue("calculateInto가 할당함: ${allocated}B", allocated < 1024)
+        }
+    }
+
+    @Test
+    fun benchmarkTenYears() {
+        val raw = sampleColumns(rows)
+
+        val legacy = measure { LegacyCalculator.calculate(legacy(raw)) }
+        val columnar = measure { OscillatorCalculator.calculate(columnar(raw)) }
+
+        println("10년치 $rows 행, ${iterations}회 평균")
+        println("  List 기반  : ${legacy.bytes}B/회, ${"%.1f".format(legacy.micros)}µs/회")
+        println("  기본형 배열: ${columnar.bytes}B/회, ${"%.1f".format(columnar.micros)}µs/회")
+
+        if (legacy.bytes >= 0 && columnar.bytes >= 0) {
+            assertTrue(
+                "기본형 배열 할당량(${columnar.bytes}B)이 List 기반(${legacy.bytes}B)보다 많음",
+                columnar.bytes < legacy.bytes
+            )
+        }
+    }
+
+    /**
+     * 디코딩 직후 상태의 열 데이터 (bridge_codec 페이로드와 같은 구성)
+     */
+    private class RawColumns(
+        val days: IntArray,
+        val marketCap: LongArray,
+        val foreign5d: LongArray,
+        val institution5d: LongArray
+    )
+
+    private class Measurement(val bytes: Long, val micros: Double)
+
+    private fun sampleColumns(size: Int): RawColumns {
+        val random = Random(42)
+        val first = LocalDate.of(2015, 1, 2).toEpochDay().toInt()
+        var mcap = 300_000_000_000_000L
+
+        return RawColumns(
+            days = IntArray(size) { first + it * 7 / 5 },
+            marketCap = LongArray(size) {
+                mcap += random.nextLong(-3_000_000_000_000L, 3_000_000_000_000L)
+                if (it % 500 == 499) 0L else mcap  // 시가총액 0인 날 포함
+            },
+            foreign5d = LongArray(size) { random.nextLong(-500_000_000_000L, 500_000_000_000L) },
+            institution5d = LongArray(size) { random.nextLong(-300_000_000_000L, 300_000_000_000L) }
+        )
+    }
+
+    /**
+     * BridgeCodec이 만드는 형태: 디코딩한 배열을 그대로 사용
+     */
+    private fun columnar(raw: RawColumns): StockData =
+        StockData(
+            ticker = "005930",
+            name = "삼성전자",
+            dates = EpochDates(raw.days.copyOf()),
+            marketCap = raw.marketCap.copyOf(),
+            foreign5d = raw.foreign5d.copyOf(),
+            institution5d = raw.institution5d.copyOf()
+        )
+
+    /**
+     * 이전 디코더가 만들던 형태: 날짜 문자열 목록 + 박싱 목록
+     */
+    private fun legacy(raw: RawColumns): LegacyStockData =
+        LegacyStockData(
+            dates = List(raw.days.size) { LocalDate.ofEpochDay(raw.days[it].toLong()).toString() },
+            marketCap = raw.marketCap.copyOf().asList(),
+            foreign5d = raw.foreign5d.copyOf().asList(),
+            institution5d = raw.institution5d.copyOf().asList()
+        )
+
+    private fun measure(block: () -> Any): Measurement {
+        repeat(warmUp) { block() }
+
+        val bytes = allocatedBytes { repeat(iterations) { block() } }
+        val started = System.nanoTime()
+        repeat(iterations) { block() }
+        val elapsed = System.nanoTime() - started
+
+        return Measurement(
+            bytes = if (bytes < 0) -1 else bytes / iterations,
+            micros = elapsed / 1_000.0 / iterations
+        )
+    }
+
+    /**
+     * 현재 스레드가 block 실행 중 할당한 바이트 수 (HotSpot 외 JVM에서는 -1)
+     */
+    private fun allocatedBytes(block: () -> Unit): Long {
+        val bean = ManagementFactory.getThreadMXBean() as? com.sun.management.ThreadMXBean
+        if (bean == null || !bean.isThreadAllocatedMemorySupported) return -1
+
+        val threadId = Thread.currentThread().id
+        val before = bean.getThreadAllocatedBytes(threadId)
+        block()
+        return bean.getThreadAllocatedBytes(threadId) - before
+    }
+
+    private class LegacyStockData(
+        val dates: List<String>,
+        val marketCap: List<Long>,
+        val foreign5d: List<Long>,
+        val institution5d: List<Long>
+    )
+
+    private class LegacyResult(
+        val dates: List<String>,
+        val marketCap: List<Long>,
+        val oscillator: List<Double>,
+        val ema: List<Double>,
+        val macd: List<Double>,
+        val signal: List<Double>,
+        val histogram: List<Double>
+    )
+
+    /**
+     * 열 단위 모델 이전의 List 기반 계산 (비교 기준)
+     */
+    private object LegacyCalculator {
+
+        fun calculate(data: LegacyStockData): LegacyResult {
+            val oscillator = mutableListOf<Double>()
+            for (i in data.marketCap.indices) {
+                val mcap = data.marketCap[i].toDouble()
+                val foreign = data.foreign5d[i].toDouble()
+                val institution = data.institution5d[i].toDouble()
+                oscillator.add(if (mcap > 0) ((foreign + institution) / mcap) * 100.0 else 0.0)
+            }
+
+            val ema = calculateEMA(oscillator, 12)
+            val ema12 = calculateEMA(oscillator, 12)
+            val ema26 = calculateEMA(oscillator, 26)
+            val macd = ema12.zip(ema26) { e12, e26 -> e12 - e26 }
+            val signal = calculateEMA(macd, 9)
+            val histogram = macd.zip(signal) { m, s -> m - s }
+
+            return LegacyResult(data.dates, data.marketCap, oscillator, ema, macd, signal, histogram)
+        }
+
+        private fun calculateEMA(values: List<Double>, period: Int): List<Double> {
+            if (values.isEmpty()) return emptyList()
+
+            val result = mutableListOf<Double>()
+            val multiplier = 2.0 / (period + 1)
+
+            var ema = values.take(period).average()
+            result.add(ema)
+
+            for (i in period until values.size) {
+                ema = (values[i] - ema) * multiplier + ema
+                result.add(ema)
+            }
+
+            return List(period - 1) { 0.0 } + result
+        }
+    }
+}
@@ -0,0 +1,112 @@
+package com.stockoscillator.data.model
+
+import org.junit.Assert.assertArrayEquals
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNotEquals
+import org.junit.Assert.assertNotSame
+import org.junit.Test
+
+/**
+ * 배열을 담은 결과 모델의 내용 비교와 단계적 수집 버퍼 확인
+ */
+class StockDataTest {
+
+    private fun sample(first: Int, size: Int, offset: Long = 0L) = StockData(
+        ticker = "005930",
+        name = "삼성전자",
+        dates = EpochDates(IntArray(size) { first + it }),
+        marketCap = LongArray(size) { 1_000L + it + offset },
+        foreign5d = LongArray(size) { -it.toLong() },
+        institution5d = LongArray(size) { it * 2L }
+    )
+
+    @Test
+    fun equalsComparesArrayContents() {
+        val a = sample(19_000, 30)
+        val b = sample(19_000, 30)
+
+        assertEquals(EpochDates(intArrayOf(1, 2)), EpochDates(intArrayOf(1, 2)))
+        assertEquals(EpochDates(intArrayOf(1, 2)).hashCode(), EpochDates(intArrayOf(1, 2)).hashCode())
+        assertEquals(a, b)
+        assertEquals(a.hashCode(), b.hashCode())
+        assertNotEquals(a, sample(19_000, 30, offset = 1L))
+        assertNotEquals(a, sample(19_001, 30))
+    }
+
+    @Test
+    fun oscillatorResultEqualsComparesArrayContents() {
+        fun result(last: Double) = OscillatorResult(
+            dates = EpochDates(intArrayOf(19_000, 19_001)),
+            marketCap = longArrayOf(10L, 20L),
+            oscillator = doubleArrayOf(0.1, last),
+            ema = doubleArrayOf(0.0, 0.1),
+            macd = doubleArrayOf(0.0, 0.2),
+            signal = doubleArrayOf(0.0, 0.3),
+            histogram = doubleArrayOf(0.0, -0.1)
+        )
+
+        assertEquals(result(0.5), result(0.5))
+        assertEquals(result(0.5).hashCode(), result(0.5).hashCode())
+        assertNotEquals(result(0.5), result(0.6))
+    }
+
+    private fun parts(whole: StockData, vararg ranges: IntRange) = ranges.map { range ->
+        whole.copy(
+            dates = EpochDates(whole.dates.days.sliceArray(range)),
+            marketCap = whole.marketCap.sliceArray(range),
+            foreign5d = whole.foreign5d.sliceArray(range),
+            institution5d = whole.institution5d.sliceArray(range)
+        )
+    }
+
+    @Test
+    fun bufferPrependsChunksInOrder() {
+        val whole = sample(19_000, 25)
+        // 받는 순서: 최근 조각 → 과거 조각
+        val received = parts(whole, 20 until 25, 10 until 20, 0 until 10)
+        val buffer = StockDataBuffer(25)
+
+        buffer.prepend(received[0])
+        assertEquals(received[0], buffer.toStockData())
+        buffer.prepend(received[1])
+        assertEquals(parts(whole, 10 until 25)[0], buffer.toStockData())
+        buffer.prepend(received[2])
+
+        val joined = buffer.toStockData()
+        assertEquals(whole, joined)
+        assertArrayEquals(whole.dates.days, joined.dates.days)
+    }
+
+    @Test
+    fun bufferGrowsWhenEstimateIsShort() {
+        val whole = sample(19_000, 25)
+        val buffer = StockDataBuffer(4)
+        for (part in parts(whole, 20 until 25, 10 until 20, 3 until 10, 0 until 3)) {
+            buffer.prepend(part)
+        }
+
+        assertEquals(25, buffer.size)
+        assertEquals(whole, buffer.toStockData())
+        // 내보낸 결과는 버퍼와 배열을 공유하지 않음
+        assertNotSame(buffer.toStockData().marketCap, buffer.toStockData().marketCap)
+    }
+
+    @Test
+    fun depositBufferPrependsChunksInOrder() {
+        fun deposit(range: IntRange) = MarketDepositData(
+            dates = range.map { "d$it" },
+            depositAmounts = range.map { it.toDouble() },
+            depositChanges = range.map { -it.toDouble() },
+            creditAmounts = range.map { it * 2.0 },
+            creditChanges = range.map { it * 0.5 }
+        )
+        val buffer = MarketDepositBuffer(10)
+
+        buffer.prepend(deposit(10 until 15))
+        assertEquals(deposit(10 until 15), buffer.toMarketDepositData())
+        buffer.prepend(deposit(3 until 10))
+        buffer.prepend(deposit(0 until 3))
+
+        assertEquals(deposit(0 until 15), buffer.toMarketDepositData())
+    }
+}
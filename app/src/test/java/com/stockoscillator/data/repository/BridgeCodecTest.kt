@@ -0,0 +1,70 @@
+package com.stockoscillator.data.repository
+
+import com.stockoscillator.data.model.StockData
+import org.junit.Assert.assertArrayEquals
+import org.junit.Assert.assertEquals
+import org.junit.Test
+
+/**
+ * Python bridge_codec.py가 만든 고정 페이로드 디코딩 검증
+ *
+ * 페이로드는 tests/test_bridge_codec.py가 생성/검증하는 src/test/resources/bridge_codec/*.bin
+ * (Python 인코더 출력이 바뀌면 Python 테스트가, 디코더가 바뀌면 이 테스트가 실패)
+ */
+class BridgeCodecTest {
+
+    private fun fixture(name: String): ByteArray =
+        requireNotNull(javaClass.getResourceAsStream("/bridge_codec/$name")) { "픽스처 없음: $name" }
+            .use { it.readBytes() }
+
+    private fun assertFixtureStock(stock: StockData) {
+        assertEquals("005930", stock.ticker)
+        assertEquals("삼성전자", stock.name)
+        assertArrayEquals(intArrayOf(10956, 19724, 19725, 19782, 24855), stock.dates.days)
+        assertEquals(
+            listOf("1999-12-31", "2024-01-02", "2024-01-03", "2024-02-29", "2038-01-19"),
+            List(stock.size) { stock.dates[it] }
+        )
+        assertArrayEquals(
+            longArrayOf(0L, 1L, 2_147_483_648L, 430_000_000_000_000L, 9_007_199_254_740_992L),
+            stock.marketCap
+        )
+        assertArrayEquals(
+            longArrayOf(-9_007_199_254_740_992L, -1L, 0L, 123_456_789_012L, -98_765_432_109L),
+            stock.foreign5d
+        )
+        assertArrayEquals(
+            longArrayOf(5L, -5L, 3_000_000_000L, -3_000_000_000L, 0L),
+            stock.institution5d
+        )
+    }
+
+    @Test
+    fun decodeStockData() {
+        assertFixtureStock(BridgeCodec.decodeStockData(fixture("stock.bin")))
+    }
+
+    @Test
+    fun decodeBatch() {
+        val (results, errors) = BridgeCodec.decodeBatch(fixture("batch.bin"))
+
+        assertEquals(listOf("005930", "A0"), results.keys.toList())
+        assertFixtureStock(results.getValue("005930"))
+
+        val other = results.getValue("A0")
+        assertEquals("", other.name)
+        assertArrayEquals(intArrayOf(19724), other.dates.days)
+        assertArrayEquals(longArrayOf(7L), other.marketCap)
+        assertArrayEquals(longArrayOf(-7L), other.foreign5d)
+        assertArrayEquals(longArrayOf(0L), other.institution5d)
+
+        assertEquals(mapOf("000000" to "데이터를 가져올 수 없습니다"), errors)
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun rejectsWrongMagic() {
+        val bytes = fixture("stock.bin")
+        bytes[0] = 'X'.code.toByte()
+        BridgeCodec.decodeStockData(bytes)
+    }
+}
@@ -0,0 +1,79 @@
+"""
+백테스트 파라미터 스윕 벤치마크
+기록된 pykrx 응답(standins.py)으로 여러 종목에 파라미터 조합을 실행하여
+프로세스 수별 소요 시간을 측정합니다. (대체 서비스는 모든 종목에 같은 일별 데이터를 돌려줌)
+
+사용법:
+    python benchmarks/bench_backtest.py                              # 200종목, 기본 조합
+    python benchmarks/bench_backtest.py --tickers 2700 --workers 1 8 --days 3650
+    python benchmarks/bench_backtest.py --json out.json
+
+프로세스 풀은 fork 시작 방식(Linux)을 기준으로 합니다. 자식 프로세스가 대체 서비스를 물려받습니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app", "src", "main", "python"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import standins  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백테스트 파라미터 스윕 벤치마크")
+    parser.add_argument("--tickers", type=int, default=200, help="종목 수")
+    parser.add_argument("--days", type=int, default=1825, help="종목별 기간 (일)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+
+    report = {"tickers": args.tickers, "days": args.days, "runs": []}
+    with tempfile.TemporaryDirectory(prefix="stock_bench_") as data_dir:
+        os.environ["STOCK_OSCILLATOR_DATA_DIR"] = data_dir
+        pykrx = standins.PykrxStandIn()
+        standins.install_pykrx(pykrx)
+
+        import backtest
+
+        tickers = pykrx.tickers["ticker"].tolist()[:args.tickers]
+        grid = backtest.param_grid(weak_threshold=(0.2, 0.3), strong_threshold=(0.5, 0.8),
+                                   macd_fast=(8, 12), macd_slow=(21, 26), signal_period=(5, 9))
+        report["combinations"] = len(grid)
+
+        # 로컬 캐시 채우기 (수집 시간은 측정에서 제외)
+        start = time.perf_counter()
+        backtest.run_universe(tickers, args.days, grid[:1], workers=1)
+        fill = time.perf_counter() - start
+        print(f"캐시 채우기: {len(tickers)}종목 {fill:.1f}s", file=stderr)
+
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            result = backtest.run_universe(tickers, args.days, grid, workers=workers)
+            elapsed = time.perf_counter() - start
+            per_pair = elapsed / (len(tickers) * len(grid)) * 1000
+            print(f"workers={workers:<3} {len(tickers)}종목 x {len(grid)}조합 "
+                  f"{elapsed:.2f}s ({per_pair:.3f}ms/종목·조합, 실패 {len(result['errors'])})", file=stderr)
+            report["runs"].append({"workers": workers, "seconds": round(elapsed, 3),
+                                   "errors": len(result["errors"])})
+
+        best = max(result["results"], key=lambda row: row["hit_rate"] or 0)
+        print(f"적중률 최고 조합: {best['params']} → {best['hit_rate']:.3f} "
+              f"(거래 {best['trades']}회)", file=stderr)
+
+    sys.stderr = stderr
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
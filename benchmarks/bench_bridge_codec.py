@@ -0,0 +1,103 @@
+"""
+브릿지 페이로드 벤치마크
+같은 종목 데이터를 JSON 문자열과 bridge_codec 바이너리로 인코딩/디코딩하여
+크기와 시간을 비교합니다. (Python 쪽 비용 기준, 디코딩은 Kotlin 파싱의 대용)
+
+사용법:
+    python benchmarks/bench_bridge_codec.py
+    python benchmarks/bench_bridge_codec.py --rows 250 2500 --batch 20 --json out.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app", "src", "main", "python"))
+
+import bridge_codec  # noqa: E402
+
+
+def make_stock(rows, seed, ticker="005930", name="삼성전자"):
+    """get_stock_data 형식의 합성 데이터 (수급 값은 pandas rolling 결과처럼 float)"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-12-30", periods=rows)
+    return {
+        "dates": index.strftime("%Y-%m-%d").tolist(),
+        "market_cap": rng.integers(10**11, 5 * 10**14, rows).tolist(),
+        "foreign_5d": rng.normal(0, 5e10, rows).round().tolist(),
+        "institution_5d": rng.normal(0, 3e10, rows).round().tolist(),
+        "ticker": ticker,
+        "name": name,
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_case(label, data, encode, decode, repeat):
+    text = json.dumps(data, ensure_ascii=False)
+    payload = encode()
+    return {
+        "case": label,
+        "json_bytes": len(text.encode("utf-8")),
+        "binary_bytes": len(payload),
+        "json_encode_ms": timed(lambda: json.dumps(data, ensure_ascii=False), repeat),
+        "json_decode_ms": timed(lambda: json.loads(text), repeat),
+        "binary_encode_ms": timed(encode, repeat),
+        "binary_decode_ms": timed(lambda: decode(payload), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs 바이너리 브릿지 페이로드 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[120, 750, 2500])
+    parser.add_argument("--batch", type=int, default=30, help="배치 케이스 종목 수")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        data = make_stock(rows, seed=rows)
+        results.append(bench_case(
+            f"single/{rows}", data,
+            lambda: bridge_codec.encode_stock_data(data),
+            bridge_codec.decode_stock_data,
+            args.repeat,
+        ))
+
+    rows = args.rows[-1]
+    batch = {f"{i:06d}": make_stock(rows, seed=i, ticker=f"{i:06d}") for i in range(args.batch)}
+    results.append(bench_case(
+        f"batch/{args.batch}x{rows}", {"results": batch, "errors": {}},
+        lambda: bridge_codec.encode_batch(batch, {}),
+        bridge_codec.decode_batch,
+        max(1, args.repeat // 5),
+    ))
+
+    for r in results:
+        print(f"{r['case']:>16}: size {r['json_bytes']:>10,} → {r['binary_bytes']:>10,} bytes "
+              f"(x{r['json_bytes'] / r['binary_bytes']:.1f}), "
+              f"encode {r['json_encode_ms']:.2f} → {r['binary_encode_ms']:.2f}ms, "
+              f"decode {r['json_decode_ms']:.2f} → {r['binary_decode_ms']:.2f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "bridge_codec", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
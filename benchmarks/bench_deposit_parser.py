@@ -0,0 +1,111 @@
+"""
+증시자금동향(sise_deposit) HTML 파서 벤치마크
+저장된 HTML 픽스처로 deposit_scraper의 파서 백엔드를 오프라인에서 비교합니다.
+
+사용법:
+    python benchmarks/bench_deposit_parser.py                # 모든 백엔드 비교
+    python benchmarks/bench_deposit_parser.py --repeat 200   # 반복 횟수 지정
+    python benchmarks/bench_deposit_parser.py --json out.json
+    python benchmarks/bench_deposit_parser.py --record 3     # 실제 페이지를 픽스처로 저장 (네트워크 필요)
+
+픽스처: benchmarks/fixtures/sise_deposit/page*.html (euc-kr)
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures", "sise_deposit")
+sys.path.insert(0, os.path.join(ROOT, "app", "src", "main", "python"))
+
+import deposit_scraper  # noqa: E402
+
+
+def load_fixtures():
+    """픽스처 HTML 목록 [(이름, 텍스트), ...]"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "page*.html"))):
+        with open(path, "rb") as f:
+            fixtures.append((os.path.basename(path), f.read().decode("euc-kr")))
+    return fixtures
+
+
+def record_fixtures(num_pages):
+    """실제 네이버 페이지를 픽스처로 저장"""
+    session = deposit_scraper.get_session()
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for page in range(1, num_pages + 1):
+        response = session.get(f"{deposit_scraper.BASE_URL}?page={page}",
+                               headers=deposit_scraper.HEADERS, timeout=15)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURE_DIR, f"page{page}.html"), "wb") as f:
+            f.write(response.content)
+        print(f"page{page}.html 저장 ({len(response.content):,} bytes)")
+
+
+def bench_backend(backend, fixtures, repeat):
+    """한 백엔드로 모든 픽스처를 repeat번 파싱한 시간 (페이지당 ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, html in fixtures:
+            deposit_scraper.parse_deposit_html(html, backend=backend)
+        samples.append((time.perf_counter() - start) * 1000 / len(fixtures))
+
+    samples.sort()
+    return {
+        "backend": backend,
+        "pages": len(fixtures),
+        "repeat": repeat,
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sise_deposit 파서 벤치마크")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--record", type=int, metavar="PAGES", help="실제 페이지를 픽스처로 저장")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+        return
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        sys.exit(f"픽스처가 없습니다: {FIXTURE_DIR}")
+
+    backends = ["stream", "bs4"]
+    if deposit_scraper.lxml_available():
+        backends.insert(1, "lxml")
+
+    # 모든 백엔드가 같은 결과를 내는지 먼저 확인
+    expected = [deposit_scraper.parse_deposit_html(html, backend="bs4") for _, html in fixtures]
+    for backend in backends:
+        actual = [deposit_scraper.parse_deposit_html(html, backend=backend) for _, html in fixtures]
+        if actual != expected:
+            sys.exit(f"{backend} 결과가 bs4와 다릅니다")
+
+    results = [bench_backend(backend, fixtures, args.repeat) for backend in backends]
+
+    baseline = next(r for r in results if r["backend"] == "bs4")["median_ms"]
+    for r in results:
+        r["speedup_vs_bs4"] = baseline / r["median_ms"] if r["median_ms"] else None
+        print(f"{r['backend']:>6}: median {r['median_ms']:.3f}ms/page, "
+              f"p95 {r['p95_ms']:.3f}ms, x{r['speedup_vs_bs4']:.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "deposit_parser", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Python 계층 오프라인 벤치마크
+기록된 pykrx 응답과 sise_deposit HTML을 로컬 대체 서비스(standins.py)로 재생하여
+검색/데이터 수집/스크래핑/stock_analyzer 진입점을 데이터 크기별로 측정합니다.
+
+사용법:
+    python benchmarks/bench_suite.py                         # 전체 실행, 표 출력
+    python benchmarks/bench_suite.py --json results.json     # 결과 저장 (compare.py로 비교)
+    python benchmarks/bench_suite.py --only get_stock_data --repeat 20
+    python benchmarks/bench_suite.py --latency-ms 30         # 호출당 네트워크 지연 흉내
+
+측정:
+    cold_ms  - 로컬 캐시(SQLite, 요청 결과 캐시)를 비운 직후 1회 (대체 서비스에서 다시 수집)
+    warm     - 캐시가 채워진 상태에서 repeat회 (median/p90/min/mean)
+
+결과 JSON:
+    {"meta": {...}, "results": [{"name", "params", "key", "cold_ms", "warm": {...}, "repeat"}]}
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app", "src", "main", "python"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import standins  # noqa: E402
+
+DAY_SIZES = (60, 180, 365, 1095, 3650)
+PAGE_SIZES = (1, 5, 10, 50)
+SEARCH_QUERIES = ("삼성전자", "005930", "ㅅㅅㅈㅈ", "하이닉스", "바이오")
+BATCH_SIZES = (10, 50)
+
+
+class Suite:
+    """대체 서비스 설치 + 앱 모듈 로드 + 측정 케이스"""
+
+    def __init__(self, data_dir, latency):
+        os.environ["STOCK_OSCILLATOR_DATA_DIR"] = data_dir
+        self.pykrx = standins.PykrxStandIn(latency=latency)
+        standins.install_pykrx(self.pykrx)
+        self.naver = standins.NaverStandIn(latency=latency)
+
+        import deposit_scraper
+        import deposit_store
+        import local_store
+        import stock_analyzer
+        import stock_data_fetcher
+        import timeseries_cache
+
+        deposit_scraper.get_session = lambda: self.naver
+        # 대체 서비스는 제한할 필요가 없으므로 속도 제한 해제
+        deposit_scraper.configure(rate=1e9, burst=1e9)
+
+        self.deposit_scraper = deposit_scraper
+        self.deposit_store = deposit_store
+        self.local_store = local_store
+        self.stock_analyzer = stock_analyzer
+        self.fetcher = stock_data_fetcher
+        self.timeseries_cache = timeseries_cache
+        self.tickers = self.pykrx.tickers["ticker"].tolist()
+
+        # 종목 인덱스는 모든 케이스가 공유하므로 미리 생성
+        stock_data_fetcher.get_all_stocks()
+
+    # --- 캐시 초기화 (cold 측정용) ---
+    def clear_timeseries(self):
+        self.timeseries_cache.clear()
+        self.stock_analyzer._results.clear()
+
+    def clear_deposit(self):
+        self.deposit_scraper._validators.clear()
+        self.stock_analyzer._results.clear()
+        conn = self.local_store.connect(self.deposit_store.DB_NAME)
+        try:
+            with conn:
+                conn.execute("DELETE FROM deposit")
+                conn.execute("DELETE FROM meta")
+        except Exception:
+            pass
+        finally:
+            conn.close()
+
+    def clear_market_scan(self):
+        import market_scanner
+        conn = self.local_store.connect(market_scanner.DB_NAME)
+        try:
+            with conn:
+                conn.execute("DELETE FROM scan_meta")
+        except Exception:
+            pass
+        finally:
+            conn.close()
+
+    # --- 케이스 ---
+    def cases(self):
+        """(이름, params, 함수, cold 준비 함수 또는 None)"""
+        sa = self.stock_analyzer
+        ticker = "005930"
+
+        for query in SEARCH_QUERIES:
+            yield "search_stock", {"query": query}, lambda q=query: self.fetcher.search_stock(q), None
+            yield "search_stock_wrapper", {"query": query}, lambda q=query: sa.search_stock_wrapper(q), None
+            yield ("search_stocks_autocomplete", {"query": query},
+                   lambda q=query: sa.search_stocks_autocomplete(q, 20), None)
+
+        for days in DAY_SIZES:
+            yield ("get_stock_data", {"days": days},
+                   lambda d=days: self.fetcher.get_stock_data(ticker, d), self.clear_timeseries)
+            for fmt in ("json", "binary"):
+                yield ("get_stock_analysis", {"days": days, "fmt": fmt},
+                       lambda d=days, f=fmt: sa.get_stock_analysis(ticker, d, f), self.clear_timeseries)
+            yield ("get_stock_indicators", {"days": days},
+                   lambda d=days: sa.get_stock_indicators(ticker, d), self.clear_timeseries)
+
+        for size in BATCH_SIZES:
+            batch = json.dumps(self.tickers[:size])
+            for days in (180, 3650):
+                yield ("get_stock_analysis_batch", {"tickers": size, "days": days},
+                       lambda b=batch, d=days: sa.get_stock_analysis_batch(b, d), self.clear_timeseries)
+
+        for pages in PAGE_SIZES:
+            yield ("scrape_deposit_data", {"pages": pages},
+                   lambda p=pages: self.deposit_scraper.scrape_deposit_data(p), self.clear_deposit)
+            yield ("get_market_deposit_data", {"pages": pages},
+                   lambda p=pages: sa.get_market_deposit_data(p), self.clear_deposit)
+        yield "get_latest_market_data", {}, sa.get_latest_market_data, self.clear_deposit
+
+        for market in ("KOSPI", "ALL"):
+            yield ("get_market_scan", {"market": market},
+                   lambda m=market: sa.get_market_scan(m, 20), self.clear_market_scan)
+
+        yield "get_all_stocks_list", {}, sa.get_all_stocks_list, None
+
+
+def _measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p90_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 3),
+        "min_ms": round(samples[0], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def result_key(name, params):
+    """compare.py에서 결과를 맞추는 키"""
+    if not params:
+        return name
+    return name + "[" + ",".join(f"{k}={params[k]}" for k in sorted(params)) + "]"
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python 계층 오프라인 벤치마크")
+    parser.add_argument("--repeat", type=int, default=10, help="warm 측정 반복 횟수")
+    parser.add_argument("--only", nargs="+", help="측정할 케이스 이름")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="대체 서비스 호출당 지연 (ms)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="앱 stderr 로그 표시")
+    args = parser.parse_args()
+
+    stderr = sys.stderr
+    if not args.verbose:
+        sys.stderr = open(os.devnull, "w")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="stock_bench_") as data_dir:
+        suite = Suite(data_dir, args.latency_ms / 1000)
+
+        for name, params, fn, clear in suite.cases():
+            if args.only and name not in args.only:
+                continue
+
+            cold = None
+            if clear is not None:
+                clear()
+                start = time.perf_counter()
+                fn()
+                cold = round((time.perf_counter() - start) * 1000, 3)
+            else:
+                fn()  # 첫 호출(import, 인덱스 로드 등)은 warm 측정에서 제외
+
+            warm = _measure(fn, args.repeat)
+            key = result_key(name, params)
+            results.append({"name": name, "params": params, "key": key,
+                            "cold_ms": cold, "warm": warm, "repeat": args.repeat})
+            cold_text = f"{cold:>10.2f}ms" if cold is not None else f"{'-':>12}"
+            print(f"{key:<58} cold {cold_text}  warm {warm['median_ms']:>9.3f}ms "
+                  f"(p90 {warm['p90_ms']:.3f})", file=stderr)
+
+    sys.stderr = stderr
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+        },
+        "results": results,
+    }
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+벤치마크 결과 비교
+bench_suite.py --json 결과 두 개(기준, 비교 대상)를 케이스별로 비교합니다.
+
+사용법:
+    python benchmarks/compare.py base.json new.json
+    python benchmarks/compare.py base.json new.json --metric cold_ms --threshold 10
+
+종료 코드: threshold(%)보다 느려진 케이스가 있으면 1
+"""
+
+import argparse
+import json
+import sys
+
+
+def _value(result, metric):
+    if metric == "cold_ms":
+        return result.get("cold_ms")
+    return result["warm"].get(metric)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return report.get("meta", {}), {r["key"]: r for r in report["results"]}
+
+
+def compare(base, new, metric):
+    """
+    Returns:
+        list: [(키, 기준 값, 비교 값, 변화율 %)] (양쪽에 모두 있는 케이스만)
+    """
+    rows = []
+    for key, result in base.items():
+        if key not in new:
+            continue
+        before = _value(result, metric)
+        after = _value(new[key], metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append((key, before, after, change))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base", help="기준 결과 JSON")
+    parser.add_argument("new", help="비교할 결과 JSON")
+    parser.add_argument("--metric", default="median_ms",
+                        choices=("median_ms", "p90_ms", "min_ms", "mean_ms", "cold_ms"))
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="이 비율(%%) 이상 느려지면 회귀로 표시")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    new_meta, new = load(args.new)
+    rows = compare(base, new, args.metric)
+
+    print(f"기준: {base_meta.get('revision')} ({base_meta.get('timestamp')})")
+    print(f"비교: {new_meta.get('revision')} ({new_meta.get('timestamp')})")
+    print(f"지표: {args.metric}\n")
+
+    regressions = 0
+    for key, before, after, change in rows:
+        mark = ""
+        if change >= args.threshold:
+            mark = "  ▲ 느려짐"
+            regressions += 1
+        elif change <= -args.threshold:
+            mark = "  ▼ 빨라짐"
+        print(f"{key:<58} {before:>10.3f} → {after:>10.3f}ms {change:>+7.1f}%{mark}")
+
+    missing = sorted(set(base) ^ set(new))
+    if missing:
+        print(f"\n한쪽에만 있는 케이스 {len(missing)}개: {', '.join(missing)}")
+
+    print(f"\n회귀 {regressions}개 / 비교 {len(rows)}개 (기준 {args.threshold:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
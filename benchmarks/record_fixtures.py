@@ -0,0 +1,142 @@
+"""
+벤치마크용 pykrx 픽스처 기록
+bench_suite가 네트워크 없이 재생하는 pykrx 응답을 CSV(gzip)로 저장합니다.
+
+사용법:
+    python benchmarks/record_fixtures.py --live        # 실제 pykrx 응답 기록 (네트워크/KRX 로그인 필요)
+    python benchmarks/record_fixtures.py --synthetic   # 같은 형식의 합성 데이터 생성 (저장소 기본 픽스처)
+
+픽스처 (benchmarks/fixtures/pykrx/):
+    tickers.csv.gz         ticker, name, market, market_cap           (get_market_ticker_list/name, get_market_cap)
+    daily.csv.gz           date, 시가총액, 금융투자 ... 전체           (한 종목 10년치 get_market_cap + trading_value detail)
+    net_purchases.csv.gz   ticker, market, investor, value            (최근 5영업일 get_market_net_purchases_of_equities)
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures", "pykrx")
+
+MARKETS = ("KOSPI", "KOSDAQ")
+DAILY_TICKER = "005930"
+DAILY_YEARS = 11
+
+# get_market_trading_value_by_date(detail=True) 컬럼
+INVESTOR_COLUMNS = ["금융투자", "보험", "투신", "사모", "은행", "기타금융", "연기금",
+                    "기타법인", "개인", "외국인", "기타외국인", "전체"]
+NET_PURCHASE_INVESTORS = ("외국인", "기타외국인", "기관합계")
+
+_NAME_HEADS = ["삼성", "현대", "엘지", "에스케이", "한화", "대한", "동아", "한국", "신한", "코리아",
+               "대성", "동양", "세원", "한솔", "태영", "우리", "미래", "대우", "금호", "한일",
+               "서울", "부산", "광주", "제일", "유니", "케이", "에이치", "씨제이", "오리온", "아이"]
+_NAME_TAILS = ["전자", "화학", "바이오", "제약", "건설", "증권", "반도체", "에너지", "홀딩스", "물산",
+               "테크", "소재", "중공업", "식품", "통신", "로직스", "엔터", "디스플레이", "정밀", "산업"]
+_WELL_KNOWN = [("005930", "삼성전자", "KOSPI"), ("000660", "SK하이닉스", "KOSPI"),
+               ("035420", "NAVER", "KOSPI"), ("035720", "카카오", "KOSPI"),
+               ("005380", "현대차", "KOSPI"), ("051910", "LG화학", "KOSPI"),
+               ("247540", "에코프로비엠", "KOSDAQ"), ("091990", "셀트리온헬스케어", "KOSDAQ")]
+
+
+def _write(frame, name):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = os.path.join(FIXTURE_DIR, name)
+    frame.to_csv(path, index=False, compression="gzip")
+    print(f"{name}: {len(frame):,}행 ({os.path.getsize(path):,} bytes)")
+
+
+def record_live():
+    """실제 pykrx 응답 기록"""
+    from pykrx import stock
+
+    latest = stock.get_nearest_business_day_in_a_week()
+    rows = []
+    for market in MARKETS:
+        caps = stock.get_market_cap(latest, market=market)["시가총액"]
+        for ticker in stock.get_market_ticker_list(latest, market=market):
+            rows.append({"ticker": ticker, "name": stock.get_market_ticker_name(ticker),
+                         "market": market, "market_cap": int(caps.get(ticker, 0))})
+    _write(pd.DataFrame(rows), "tickers.csv.gz")
+
+    end = datetime.strptime(latest, "%Y%m%d")
+    start = (end - timedelta(days=365 * DAILY_YEARS)).strftime("%Y%m%d")
+    mcap = stock.get_market_cap(start, latest, DAILY_TICKER)[["시가총액"]]
+    inv = stock.get_market_trading_value_by_date(start, latest, DAILY_TICKER, detail=True)
+    daily = mcap.join(inv, how="inner")
+    daily.index = daily.index.strftime("%Y-%m-%d")
+    _write(daily.rename_axis("date").reset_index(), "daily.csv.gz")
+
+    days = stock.get_previous_business_days(fromdate=(end - timedelta(days=15)).strftime("%Y%m%d"), todate=latest)
+    from_date = days[-5].strftime("%Y%m%d")
+    rows = []
+    for market in MARKETS:
+        for investor in NET_PURCHASE_INVESTORS:
+            df = stock.get_market_net_purchases_of_equities(from_date, latest, market, investor)
+            for ticker, value in df["순매수거래대금"].items():
+                rows.append({"ticker": ticker, "market": market, "investor": investor, "value": int(value)})
+    _write(pd.DataFrame(rows), "net_purchases.csv.gz")
+
+
+def generate_synthetic(seed=20240101):
+    """실제 응답과 같은 형식/규모의 합성 픽스처 생성"""
+    rng = np.random.default_rng(seed)
+
+    rows = [{"ticker": t, "name": n, "market": m, "market_cap": int(rng.integers(10**12, 5 * 10**14))}
+            for t, n, m in _WELL_KNOWN]
+    used = {r["ticker"] for r in rows} | {r["name"] for r in rows}
+    counts = {"KOSPI": 950, "KOSDAQ": 1750}
+    for market, total in counts.items():
+        while sum(r["market"] == market for r in rows) < total:
+            ticker = f"{rng.integers(0, 999999):06d}"
+            name = (_NAME_HEADS[rng.integers(len(_NAME_HEADS))]
+                    + _NAME_TAILS[rng.integers(len(_NAME_TAILS))])
+            if rng.random() < 0.4:
+                name += str(rng.integers(1, 10))
+            if ticker in used or name in used:
+                continue
+            used.update((ticker, name))
+            rows.append({"ticker": ticker, "name": name, "market": market,
+                         "market_cap": int(rng.lognormal(25.5, 1.3))})
+    _write(pd.DataFrame(rows), "tickers.csv.gz")
+
+    dates = pd.bdate_range(end="2025-12-30", periods=250 * DAILY_YEARS)
+    n = len(dates)
+    mcap = (4e14 * np.exp(np.cumsum(rng.normal(0, 0.015, n)) - 0.3)).round()
+    scales = {"금융투자": 4e10, "보험": 5e9, "투신": 8e9, "사모": 6e9, "은행": 2e9,
+              "기타금융": 1e9, "연기금": 2e10, "기타법인": 1e10, "외국인": 1e11, "기타외국인": 2e9}
+    daily = pd.DataFrame({"date": dates.strftime("%Y-%m-%d"), "시가총액": mcap.astype("int64")})
+    for column, scale in scales.items():
+        daily[column] = rng.normal(0, scale, n).round().astype("int64")
+    daily["개인"] = -daily[list(scales)].sum(axis=1)
+    daily["전체"] = 0
+    _write(daily[["date", "시가총액"] + INVESTOR_COLUMNS], "daily.csv.gz")
+
+    net = []
+    for row in rows:
+        for investor in NET_PURCHASE_INVESTORS:
+            scale = row["market_cap"] * (0.004 if investor != "기타외국인" else 0.0002)
+            net.append({"ticker": row["ticker"], "market": row["market"], "investor": investor,
+                        "value": int(rng.normal(0, scale))})
+    _write(pd.DataFrame(net), "net_purchases.csv.gz")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 pykrx 픽스처 기록")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--live", action="store_true", help="실제 pykrx 응답 기록")
+    group.add_argument("--synthetic", action="store_true", help="합성 픽스처 생성")
+    args = parser.parse_args()
+
+    if args.live:
+        record_live()
+    else:
+        generate_synthetic()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
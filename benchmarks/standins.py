@@ -0,0 +1,177 @@
+"""
+벤치마크용 로컬 대체 서비스
+기록된 pykrx 픽스처와 sise_deposit HTML을 네트워크 없이 재생합니다.
+
+- install_pykrx(): sys.modules에 pykrx / pykrx.stock 대체 모듈 등록
+  (앱 모듈을 import하기 전에 호출해야 합니다)
+- NaverStandIn: deposit_scraper.get_session 자리에 넣는 세션.
+  저장된 페이지를 틀로 삼아 페이지 번호에 맞게 날짜를 바꿔 50페이지 이상도 만들어 냅니다.
+
+픽스처 날짜는 "오늘 이전 마지막 평일"에서 끝나도록 영업일 단위로 옮겨서,
+datetime.now() 기준으로 구간을 계산하는 앱 코드가 그대로 동작하게 합니다.
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+import types
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+INVESTOR_COLUMNS = ["금융투자", "보험", "투신", "사모", "은행", "기타금융", "연기금",
+                    "기타법인", "개인", "외국인", "기타외국인", "전체"]
+
+
+def last_business_day(now=None):
+    day = pd.Timestamp((now or datetime.now()).date())
+    while day.weekday() >= 5:
+        day -= pd.Timedelta(days=1)
+    return day
+
+
+class PykrxStandIn:
+    """pykrx.stock 함수 중 앱이 쓰는 것만 픽스처로 재생"""
+
+    def __init__(self, fixture_dir=None, latency=0.0):
+        fixture_dir = fixture_dir or os.path.join(FIXTURE_DIR, "pykrx")
+        self.latency = latency
+        self.calls = 0
+
+        self.tickers = pd.read_csv(os.path.join(fixture_dir, "tickers.csv.gz"), dtype={"ticker": str})
+        self.names = dict(zip(self.tickers["ticker"], self.tickers["name"]))
+
+        daily = pd.read_csv(os.path.join(fixture_dir, "daily.csv.gz"))
+        daily.index = pd.bdate_range(end=last_business_day(), periods=len(daily), name="날짜")
+        self.daily = daily.drop(columns=["date"])
+
+        self.net = pd.read_csv(os.path.join(fixture_dir, "net_purchases.csv.gz"), dtype={"ticker": str})
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _slice(self, fromdate, todate):
+        start = pd.Timestamp(datetime.strptime(str(fromdate), "%Y%m%d"))
+        end = pd.Timestamp(datetime.strptime(str(todate), "%Y%m%d"))
+        return self.daily.loc[start:end]
+
+    # --- 시세/시가총액 ---
+    def get_market_cap(self, fromdate, todate=None, ticker=None, market="KOSPI", **kwargs):
+        self._call()
+        if ticker is None:
+            subset = self.tickers[self.tickers["market"] == market]
+            return pd.DataFrame({"시가총액": subset["market_cap"].to_numpy()},
+                                index=pd.Index(subset["ticker"].to_numpy(), name="티커"))
+        return self._slice(fromdate, todate)[["시가총액"]].copy()
+
+    def get_market_trading_value_by_date(self, fromdate, todate, ticker, detail=False, **kwargs):
+        self._call()
+        return self._slice(fromdate, todate)[INVESTOR_COLUMNS].copy()
+
+    # --- 종목 목록 ---
+    def get_market_ticker_list(self, date=None, market="KOSPI"):
+        self._call()
+        return self.tickers.loc[self.tickers["market"] == market, "ticker"].tolist()
+
+    def get_market_ticker_name(self, ticker):
+        return self.names[ticker]
+
+    # --- 영업일 ---
+    def get_nearest_business_day_in_a_week(self, date=None, prev=True):
+        self._call()
+        return last_business_day().strftime("%Y%m%d")
+
+    def get_previous_business_days(self, fromdate=None, todate=None, **kwargs):
+        self._call()
+        return list(pd.bdate_range(pd.Timestamp(fromdate), pd.Timestamp(todate)))
+
+    # --- 시장 전체 순매수 ---
+    def get_market_net_purchases_of_equities(self, fromdate, todate, market, investor):
+        self._call()
+        subset = self.net[(self.net["market"] == market) & (self.net["investor"] == investor)]
+        return pd.DataFrame({
+            "종목명": subset["ticker"].map(self.names).to_numpy(),
+            "순매수거래대금": subset["value"].to_numpy(),
+        }, index=pd.Index(subset["ticker"].to_numpy(), name="티커"))
+
+
+def install_pykrx(standin):
+    """pykrx 대체 모듈 등록 (pykrx.stock의 함수 = standin 메서드)"""
+    package = types.ModuleType("pykrx")
+    stock = types.ModuleType("pykrx.stock")
+    for name in dir(standin):
+        if name.startswith("get_"):
+            setattr(stock, name, getattr(standin, name))
+    package.stock = stock
+    sys.modules["pykrx"] = package
+    sys.modules["pykrx.stock"] = stock
+    return stock
+
+
+class _Response:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.encoding = None
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "euc-kr")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class NaverStandIn:
+    """
+    sise_deposit 페이지 재생 세션
+
+    페이지 p는 저장된 페이지 중 하나를 틀로, p번째 페이지에 해당하는 날짜로 바꿔 반환합니다.
+    end를 주면 그 날짜를 1페이지 첫 행으로 삼습니다 (며칠 전 상태를 재현할 때).
+    """
+
+    _DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{2}")
+
+    def __init__(self, fixture_dir=None, latency=0.0, end=None):
+        fixture_dir = fixture_dir or os.path.join(FIXTURE_DIR, "sise_deposit")
+        self.templates = []
+        for path in sorted(glob.glob(os.path.join(fixture_dir, "page*.html"))):
+            with open(path, "rb") as f:
+                self.templates.append(f.read().decode("euc-kr"))
+        if not self.templates:
+            raise FileNotFoundError(f"sise_deposit 픽스처가 없습니다: {fixture_dir}")
+        self.rows_per_page = len(self._DATE_RE.findall(self.templates[0]))
+        self.latency = latency
+        self.end = end
+        self.calls = 0
+        self._pages = {}
+
+    def _page(self, page):
+        cached = self._pages.get(page)
+        if cached is not None:
+            return cached
+
+        end = last_business_day() if self.end is None else pd.Timestamp(self.end)
+        days = pd.bdate_range(end=end, periods=page * self.rows_per_page)[::-1]
+        dates = iter(days[(page - 1) * self.rows_per_page:])
+        template = self.templates[(page - 1) % len(self.templates)]
+        html = self._DATE_RE.sub(lambda m: next(dates).strftime("%y.%m.%d"), template)
+        content = html.encode("euc-kr")
+        self._pages[page] = content
+        return content
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        match = re.search(r"page=(\d+)", url)
+        return _Response(self._page(int(match.group(1)) if match else 1))
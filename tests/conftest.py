@@ -0,0 +1,107 @@
+"""
+pytest 공통 설정
+앱 Python 모듈(app/src/main/python)과 오프라인 대체 서비스(benchmarks)를 import 경로에 추가하고,
+저장소/수집 모듈을 네트워크 없이 시험하는 픽스처를 제공합니다.
+"""
+
+import os
+import sys
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, "app", "src", "main", "python"), os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def weekdays(start, end, holidays=()):
+    """[start, end] 평일 중 holidays를 뺀 날 (거래일 달력 대신)"""
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and day not in holidays:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """임시 데이터 디렉터리 (모듈이 들고 있는 SQLite 연결/메모리 상태도 비움)"""
+    import local_store
+    import resilient_fetch
+    import timeseries_cache
+    import trading_calendar
+
+    monkeypatch.setenv(local_store.DATA_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(timeseries_cache, "_conn", None)
+    monkeypatch.setattr(trading_calendar, "_days", None)
+    monkeypatch.setattr(trading_calendar, "_coverage", None)
+    monkeypatch.setattr(trading_calendar, "_failed_at", 0.0)
+    resilient_fetch.reset()
+    yield tmp_path
+    if timeseries_cache._conn is not None:
+        timeseries_cache._conn.close()
+    resilient_fetch.reset()
+
+
+@pytest.fixture
+def holidays():
+    """휴장일로 처리할 평일 (테스트 모듈에서 같은 이름의 픽스처로 바꿔 씀)"""
+    return frozenset()
+
+
+@pytest.fixture
+def calendar(monkeypatch, holidays):
+    """KRX 대신 평일 - holidays를 거래일로 쓰는 달력"""
+    import trading_calendar
+
+    def trading_days(start, end, now=None):
+        now = now or datetime.now()
+        end = min(trading_calendar._as_date(end), now.date())
+        return weekdays(trading_calendar._as_date(start), end, holidays)
+
+    monkeypatch.setattr(trading_calendar, "trading_days", trading_days)
+    return trading_days
+
+
+@pytest.fixture
+def krx(monkeypatch, data_dir, calendar, holidays):
+    """
+    기록된 픽스처를 재생하는 pykrx 대체 모듈 (sys.modules에 등록)
+
+    holidays의 행은 픽스처에서 빼므로 휴장일처럼 동작합니다.
+    """
+    from standins import PykrxStandIn
+
+    standin = PykrxStandIn()
+    standin.daily = standin.daily[[day.date() not in holidays for day in standin.daily.index]]
+
+    package = types.ModuleType("pykrx")
+    stock = types.ModuleType("pykrx.stock")
+    for name in dir(standin):
+        if name.startswith("get_"):
+            setattr(stock, name, getattr(standin, name))
+    package.stock = stock
+    monkeypatch.setitem(sys.modules, "pykrx", package)
+    monkeypatch.setitem(sys.modules, "pykrx.stock", stock)
+    return standin
+
+
+@pytest.fixture
+def metrics():
+    """계측을 모두 기록하도록 켜고 결과 카운터 조회 함수를 반환 (끝나면 끄고 초기화)"""
+    import instrumentation
+
+    instrumentation.reset()
+    instrumentation.set_mode("sample", 1.0)
+
+    def counter(name, outcome):
+        return instrumentation.snapshot()["counters"].get(name, {}).get(outcome, 0)
+
+    yield counter
+    instrumentation.set_mode("off", 0.1)
+    instrumentation.reset()
@@ -0,0 +1,103 @@
+"""
+backfill 검증 (workers=1, 현재 프로세스에서 실행)
+중단된 실행이 기록된 조각부터 이어지는지, 상장 전(빈) 조각 이후의 과거 조각을 건너뛰는지,
+status()의 상태별 조각 수가 맞는지 확인합니다.
+"""
+
+import sys
+from datetime import timedelta
+
+import pytest
+
+import backfill
+
+TICKERS = ["005930", "000660"]
+CHUNK_DAYS = 100
+LISTED_DAYS = 250   # 상장 후 기간 (일): 네 번째 조각부터 데이터 없음
+
+
+@pytest.fixture
+def listed(krx):
+    """약 LISTED_DAYS일 전에 상장한 종목처럼 그 이전 행을 뺀 대체 모듈"""
+    end = (krx.daily.index[-1] - timedelta(days=7)).date()
+    krx.daily = krx.daily[krx.daily.index.date >= end - timedelta(days=LISTED_DAYS)]
+    krx.end = end
+    krx.start = end - timedelta(days=7 * CHUNK_DAYS - 1)
+    krx.rows = int(((krx.daily.index.date >= krx.start) & (krx.daily.index.date <= end)).sum())
+    return krx
+
+
+def run(krx, **kwargs):
+    return backfill.run(TICKERS, krx.start, krx.end, workers=1, rate=1000, chunk_days=CHUNK_DAYS, **kwargs)
+
+
+def fail_on(monkeypatch, call, error):
+    """투자자별 거래대금 조회 call번째에서 error 발생"""
+    stock = sys.modules["pykrx.stock"]
+    original = stock.get_market_trading_value_by_date
+    calls = []
+
+    def get_market_trading_value_by_date(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == call:
+            raise error
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(stock, "get_market_trading_value_by_date", get_market_trading_value_by_date)
+    return lambda: monkeypatch.setattr(stock, "get_market_trading_value_by_date", original)
+
+
+def test_interrupted_run_resumes_from_checkpoint(listed, monkeypatch):
+    # 종목 순서(000660 → 005930), 최근 조각부터: 000660은 4조각 수집 후 3조각 건너뜀,
+    # 005930의 두 번째 조각에서 중단
+    restore = fail_on(monkeypatch, 6, KeyboardInterrupt())
+    with pytest.raises(KeyboardInterrupt):
+        run(listed)
+
+    progress = backfill.status()
+    assert progress["counts"] == {"pending": 6, "done": 5, "skipped": 3, "failed": 0}
+    assert not progress["finished"]
+    assert progress["progress"] == pytest.approx(8 / 14)
+
+    restore()
+    calls = listed.calls
+    summary = run(listed)
+
+    # 남은 005930 조각만 수집: 조각 2~4 (조각마다 pykrx 요청 2회), 이후 3조각은 빈 조각 뒤라 건너뜀
+    assert listed.calls - calls == 3 * 2
+    assert summary["tickers"] == 1
+    assert (summary["done"], summary["skipped"], summary["failed"]) == (3, 3, 0)
+
+    progress = backfill.status(summary["run_id"])
+    assert progress["counts"] == {"pending": 0, "done": 8, "skipped": 6, "failed": 0}
+    assert progress["finished"] and progress["progress"] == 1.0
+    assert progress["rows"] == 2 * listed.rows
+
+    # 끝난 작업을 다시 실행하면 아무것도 받지 않음
+    calls = listed.calls
+    assert run(listed)["tickers"] == 0
+    assert listed.calls == calls
+
+
+def test_failed_chunk_defers_rest_of_ticker(listed, monkeypatch):
+    # 재시도하지 않는 오류: 000660의 두 번째 조각 실패 → 그 종목의 더 과거 조각은 다음 실행으로
+    restore = fail_on(monkeypatch, 2, TypeError("잘못된 응답"))
+    summary = run(listed)
+    assert summary["failed"] == 1 and set(summary["errors"]) == {"000660"}
+
+    progress = backfill.status()
+    assert progress["counts"] == {"pending": 5, "done": 5, "skipped": 3, "failed": 1}
+    assert not progress["finished"]
+
+    restore()
+    summary = run(listed)
+    assert (summary["done"], summary["skipped"], summary["failed"]) == (3, 3, 0)
+    assert backfill.status()["counts"] == {"pending": 0, "done": 8, "skipped": 6, "failed": 0}
+
+
+def test_make_chunks_cover_range_newest_first(listed):
+    chunks = backfill.make_chunks(listed.start, listed.end, CHUNK_DAYS)
+    assert len(chunks) == 7
+    assert chunks[0][1] == listed.end and chunks[-1][0] == listed.start
+    for (newer_start, _), (_, older_end) in zip(chunks, chunks[1:]):
+        assert older_end == newer_start - timedelta(days=1)
@@ -0,0 +1,82 @@
+"""
+backtest 검증
+모든 봉의 점수가 Kotlin analyzeSignal 점수 계산(봉마다 앞부분만 잘라 계산)과 같은지,
+파라미터 스윕이 조합별 단독 실행과 같은 결과를 내는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from backtest import MIN_BARS, param_grid, run, score_series, sweep
+from oscillator_engine import calculate
+
+
+def kotlin_reference_score(oscillator, macd, signal, histogram, weak=0.2, strong=0.5):
+    """Kotlin analyzeSignal 점수 계산을 그대로 옮긴 참조 구현 (마지막 봉)"""
+    recent_osc = oscillator[-5:]
+    total = 0.0
+    for v in recent_osc:
+        total += v
+    avg = total / len(recent_osc)
+
+    if avg > strong:
+        score = 40.0
+    elif avg > weak:
+        score = 20.0
+    elif avg < -strong:
+        score = -40.0
+    elif avg < -weak:
+        score = -20.0
+    else:
+        score = 0.0
+
+    cross = macd[-1] - signal[-1]
+    prev_cross = macd[-2] - signal[-2]
+    if cross > 0 and prev_cross <= 0:
+        score += 30.0
+    elif cross < 0 and prev_cross >= 0:
+        score -= 30.0
+    elif cross > 0:
+        score += 15.0
+    else:
+        score -= 15.0
+
+    h = histogram[-3:]
+    if all(x > 0 for x in h) and h[2] > h[0]:
+        score += 30.0
+    elif all(x < 0 for x in h) and h[2] < h[0]:
+        score -= 30.0
+
+    return min(max(score, -100.0), 100.0)
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 6, 30, 400])
+def test_score_matches_kotlin_reference(n):
+    rng = np.random.default_rng(7 + n)
+    mcap = rng.integers(10 ** 11, 10 ** 12, n)
+    foreign = rng.integers(-10 ** 10, 10 ** 10, n)
+    institution = rng.integers(-10 ** 10, 10 ** 10, n)
+    ind = calculate(mcap, foreign, institution)
+
+    score = score_series(ind["oscillator"], ind["macd"], ind["signal"], ind["histogram"])
+    for i in range(MIN_BARS - 1, n):
+        expected = kotlin_reference_score(
+            *(ind[k][:i + 1].tolist() for k in ("oscillator", "macd", "signal", "histogram"))
+        )
+        assert score[i] == expected, f"i={i}"
+
+
+def test_sweep_matches_single_runs():
+    rng = np.random.default_rng(7)
+    n = 500
+    data = {
+        "market_cap": np.cumprod(1 + rng.normal(0, 0.02, n)) * 10 ** 12,
+        "foreign_5d": rng.normal(0, 3 * 10 ** 9, n),
+        "institution_5d": rng.normal(0, 3 * 10 ** 9, n),
+    }
+    grid = param_grid(weak_threshold=(0.1, 0.2), macd_fast=(8, 12), macd_slow=(12, 26))
+
+    results = sweep(data, grid)
+    assert len(results) == len(grid) == 6  # macd_fast >= macd_slow 조합 제외
+    for params, result in zip(grid, results):
+        assert result == run(data, params)["summary"]
@@ -0,0 +1,104 @@
+"""
+bridge_codec 검증
+인코딩/디코딩 왕복과, Kotlin BridgeCodec 테스트가 읽는 고정 페이로드(app/src/test/resources/bridge_codec)가
+현재 인코더 출력과 같은지 확인합니다. 형식을 바꾸면 양쪽 테스트가 함께 실패합니다.
+
+고정 페이로드 다시 만들기: PYTHONPATH=app/src/main/python python tests/test_bridge_codec.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bridge_codec import (
+    VALUE_COLUMNS, decode_batch, decode_stock_data, encode_batch, encode_stock_data,
+)
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "app", "src", "test", "resources", "bridge_codec",
+)
+
+# Kotlin BridgeCodecTest와 같은 값 (바꾸면 양쪽을 함께 수정, 인코더가 float64를 거치므로 ±2^53 이내)
+FIXTURE_STOCK = {
+    "ticker": "005930",
+    "name": "삼성전자",
+    "dates": ["1999-12-31", "2024-01-02", "2024-01-03", "2024-02-29", "2038-01-19"],
+    "market_cap": [0, 1, 2 ** 31, 430_000_000_000_000, 2 ** 53],
+    "foreign_5d": [-(2 ** 53), -1, 0, 123_456_789_012, -98_765_432_109],
+    "institution_5d": [5, -5, 3_000_000_000, -3_000_000_000, 0],
+}
+FIXTURE_OTHER = {
+    "ticker": "A0",
+    "name": "",
+    "dates": ["2024-01-02"],
+    "market_cap": [7],
+    "foreign_5d": [-7],
+    "institution_5d": [0],
+}
+FIXTURE_ERRORS = {"000000": "데이터를 가져올 수 없습니다"}
+
+
+def fixture_payloads():
+    """고정 페이로드 파일 이름 → 현재 인코더 출력"""
+    return {
+        "stock.bin": encode_stock_data(FIXTURE_STOCK),
+        "batch.bin": encode_batch({"005930": FIXTURE_STOCK, "A0": FIXTURE_OTHER}, FIXTURE_ERRORS),
+    }
+
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range("2015-01-02", periods=2500)
+    return {
+        "ticker": "005930",
+        "name": "삼성전자",
+        "dates": index.strftime("%Y-%m-%d").tolist(),
+        "market_cap": rng.integers(10 ** 11, 5 * 10 ** 14, len(index)).tolist(),
+        "foreign_5d": rng.normal(0, 5e10, len(index)).round().tolist(),
+        "institution_5d": rng.normal(0, 3e10, len(index)).round().tolist(),
+    }
+
+
+def test_stock_round_trip(sample):
+    decoded = decode_stock_data(encode_stock_data(sample))
+    assert decoded["ticker"] == sample["ticker"]
+    assert decoded["name"] == sample["name"]
+    assert decoded["dates"] == sample["dates"]
+    for key in VALUE_COLUMNS:
+        assert decoded[key] == [int(v) for v in sample[key]], key
+
+
+def test_empty_round_trip(sample):
+    empty = dict(sample, dates=[], market_cap=[], foreign_5d=[], institution_5d=[])
+    assert decode_stock_data(encode_stock_data(empty))["dates"] == []
+
+
+def test_batch_round_trip(sample):
+    other = dict(sample, ticker="A0", name="")
+    batch = decode_batch(encode_batch({"005930": sample, "A0": other}, FIXTURE_ERRORS))
+    assert list(batch["results"]) == ["005930", "A0"]
+    assert batch["results"]["A0"]["market_cap"] == [int(v) for v in sample["market_cap"]]
+    assert batch["errors"] == FIXTURE_ERRORS
+
+
+@pytest.mark.parametrize("name", ["stock.bin", "batch.bin"])
+def test_fixture_matches_encoder(name):
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        assert f.read() == fixture_payloads()[name], f"{name}이 인코더 출력과 다릅니다 (형식 변경 시 다시 생성)"
+
+
+def test_fixture_decodes_to_source():
+    decoded = decode_stock_data(fixture_payloads()["stock.bin"])
+    assert decoded == FIXTURE_STOCK
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, payload in fixture_payloads().items():
+        with open(os.path.join(FIXTURE_DIR, name), "wb") as f:
+            f.write(payload)
+        print(f"{name}: {len(payload)} bytes")
@@ -0,0 +1,110 @@
+"""
+조각 단위 조회 검증
+iter_stock_data / iter_deposit_data의 조각을 오래된 순으로 이어 붙이면
+한 번에 조회한 get_stock_data / get_deposit_data 결과와 같은지 확인합니다.
+조각 경계가 휴장일 연휴 안에 걸리는 경우(누적 계산용 이전 구간이 연휴를 넘는 경우)를 포함합니다.
+"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import deposit_scraper
+import deposit_store
+import stock_data_fetcher
+from deposit_store import ROWS_PER_PAGE
+from standins import NaverStandIn, last_business_day
+
+TICKER = "005930"
+CHUNK_DAYS = 30
+TODAY = datetime.now().date()
+
+
+def boundary(n):
+    """iter_stock_data(chunk_days=CHUNK_DAYS)의 n번째 조각 시작일"""
+    return TODAY - timedelta(days=n * CHUNK_DAYS - 1)
+
+
+def weekdays_around(day, before, after):
+    days = [day + timedelta(days=k) for k in range(-before, after + 1)]
+    return {d for d in days if d.weekday() < 5}
+
+
+@pytest.fixture
+def holidays():
+    # 첫 조각 경계: 경계일 앞뒤 사흘 연휴 / 셋째 조각 경계: 경계일 직전 열흘 연휴
+    # (LOOKBACK_DAYS=14 안의 거래일이 누적 계산에 필요한 ROLLING_DAYS - 1보다 적음)
+    return frozenset(weekdays_around(boundary(1), 1, 1) | weekdays_around(boundary(3), 12, 0))
+
+
+def joined(chunks):
+    """최근 조각부터 받은 조각을 오래된 순으로 이어 붙이기"""
+    result = {}
+    for chunk in reversed(chunks):
+        for key, values in chunk.items():
+            result.setdefault(key, []).extend(values)
+    return result
+
+
+@pytest.mark.parametrize("days", [90, 200, 365])
+def test_stock_chunks_join_to_full_result(krx, days):
+    chunks = list(stock_data_fetcher.iter_stock_data(TICKER, days, chunk_days=CHUNK_DAYS))
+    assert len(chunks) > 1
+    for newer, older in zip(chunks, chunks[1:]):
+        assert older["dates"][-1] < newer["dates"][0]
+    assert joined(chunks) == stock_data_fetcher.get_stock_data(TICKER, days)
+
+
+def test_stock_chunks_stop_before_listing(krx):
+    krx.daily = krx.daily.iloc[-100:]
+    chunks = list(stock_data_fetcher.iter_stock_data(TICKER, 365, chunk_days=CHUNK_DAYS))
+    assert joined(chunks) == stock_data_fetcher.get_stock_data(TICKER, 365)
+
+
+class HolidayNaver(NaverStandIn):
+    """holidays를 뺀 영업일로 날짜를 만드는 재생 세션"""
+
+    def __init__(self, holidays, **kwargs):
+        super().__init__(**kwargs)
+        self.freq = pd.offsets.CustomBusinessDay(holidays=sorted(holidays))
+
+    def _page(self, page):
+        cached = self._pages.get(page)
+        if cached is not None:
+            return cached
+        days = pd.date_range(end=self.freq.rollback(last_business_day()), periods=page * self.rows_per_page,
+                             freq=self.freq)[::-1]
+        dates = iter(days[(page - 1) * self.rows_per_page:])
+        template = self.templates[(page - 1) % len(self.templates)]
+        html = self._DATE_RE.sub(lambda m: next(dates).strftime("%y.%m.%d"), template)
+        self._pages[page] = html.encode("euc-kr")
+        return self._pages[page]
+
+
+@pytest.fixture
+def naver(monkeypatch, data_dir):
+    monkeypatch.setattr(deposit_scraper, "_validators", {})
+    monkeypatch.setattr(deposit_scraper, "_rate_limiter", deposit_scraper.RateLimiter(1e9, 1e9))
+
+    def use(session):
+        monkeypatch.setattr(deposit_scraper, "get_session", lambda: session)
+        return session
+
+    return use
+
+
+@pytest.mark.parametrize("num_pages, chunk_pages", [(12, 5), (72, 10)])
+def test_deposit_chunks_join_to_full_result(naver, num_pages, chunk_pages):
+    # 첫 묶음 경계(chunk_pages 페이지 끝) 근처 영업일을 연휴로
+    plain = pd.bdate_range(end=last_business_day(), periods=(chunk_pages + 1) * ROWS_PER_PAGE)
+    around = chunk_pages * ROWS_PER_PAGE
+    naver(HolidayNaver([day.date() for day in plain[-around - 2:-around + 2]]))
+
+    chunks = list(deposit_store.iter_deposit_data(num_pages, chunk_pages))
+    assert len(chunks) == -(-num_pages // chunk_pages)
+    assert all(len(chunk["dates"]) == chunk_pages * ROWS_PER_PAGE for chunk in chunks[:-1])
+
+    full = deposit_store.get_deposit_data(num_pages)
+    assert joined(chunks) == full
+    assert len(full["dates"]) == num_pages * ROWS_PER_PAGE
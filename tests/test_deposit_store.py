@@ -0,0 +1,129 @@
+"""
+deposit_store 검증
+새로고침 분기(보유 날짜에서 조기 중단, 이어지지 않으면 새로 시작, 일부만 받으면 저장 거부)와
+과거 페이지 조회가 새로고침 시각을 바꾸지 않는지 확인합니다.
+저장된 행은 항상 빈 구간 없이 이어져야 합니다 (load/get_older_pages가 행 수로 페이지를 나눔).
+"""
+
+import pandas as pd
+import pytest
+
+import deposit_scraper
+import deposit_store
+from deposit_store import MAX_REFRESH_PAGES, ROWS_PER_PAGE
+from standins import NaverStandIn, _Response, last_business_day
+
+
+class FailingNaver(NaverStandIn):
+    """fail_from 페이지부터 404 (이후 페이지 수집 실패)"""
+
+    def __init__(self, fail_from, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_from = fail_from
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        page = int(url.rsplit("page=", 1)[1])
+        if page >= self.fail_from:
+            self.calls += 1
+            return _Response(b"", status_code=404)
+        return super().get(url, headers, timeout, **kwargs)
+
+
+@pytest.fixture
+def naver(monkeypatch, data_dir):
+    """네이버 대신 재생 세션을 쓰게 하고, 세션을 바꿀 수 있는 함수를 반환"""
+    monkeypatch.setattr(deposit_scraper, "_validators", {})
+    monkeypatch.setattr(deposit_scraper, "_rate_limiter", deposit_scraper.RateLimiter(1e9, 1e9))
+
+    def use(session):
+        monkeypatch.setattr(deposit_scraper, "get_session", lambda: session)
+        return session
+
+    return use
+
+
+def business_days_before(days):
+    return last_business_day() - pd.offsets.BDay(days)
+
+
+def expected(pages, end=None):
+    """재생 세션이 만드는 최근 pages 페이지의 날짜 (오름차순, YY.MM.DD)"""
+    end = last_business_day() if end is None else end
+    return pd.bdate_range(end=end, periods=pages * ROWS_PER_PAGE).strftime("%y.%m.%d").tolist()
+
+
+def stored_dates():
+    data = deposit_store.load(10 ** 6)
+    return data["dates"] if data else []
+
+
+def test_first_refresh_fills_requested_pages(naver):
+    naver(NaverStandIn())
+    assert deposit_store.refresh(5) == 5 * ROWS_PER_PAGE
+    assert stored_dates() == expected(5)
+
+
+def test_refresh_stops_at_known_dates(naver):
+    naver(NaverStandIn(end=business_days_before(3)))
+    deposit_store.refresh(5)
+
+    session = naver(NaverStandIn())
+    saved = deposit_store.refresh(5, force=True)
+
+    # 1페이지(새 날짜 3개 포함), 2페이지(모두 보유) 후 중단: 첫 묶음만 요청
+    assert saved == 2 * ROWS_PER_PAGE
+    assert session.calls <= deposit_scraper.DEFAULT_MAX_WORKERS
+    assert stored_dates() == pd.bdate_range(end=last_business_day(), periods=53).strftime("%y.%m.%d").tolist()
+    assert deposit_store.load(5)["dates"] == expected(5)
+
+
+def test_recent_refresh_is_skipped(naver):
+    naver(NaverStandIn())
+    deposit_store.refresh(5)
+    session = naver(NaverStandIn())
+    assert deposit_store.refresh(5) == 0
+    assert session.calls == 0
+
+
+def test_disjoint_refresh_restarts_store(naver, metrics):
+    # 저장된 마지막 날짜가 MAX_REFRESH_PAGES 페이지보다 오래됨
+    old_end = business_days_before((MAX_REFRESH_PAGES + 5) * ROWS_PER_PAGE)
+    naver(NaverStandIn(end=old_end))
+    deposit_store.refresh(5)
+
+    naver(NaverStandIn())
+    assert deposit_store.refresh(5, force=True) == MAX_REFRESH_PAGES * ROWS_PER_PAGE
+    assert metrics("deposit.store", "reset") == 1
+    assert stored_dates() == expected(MAX_REFRESH_PAGES)
+
+
+def test_partial_disjoint_scrape_is_not_saved(naver, metrics):
+    old_end = business_days_before((MAX_REFRESH_PAGES + 5) * ROWS_PER_PAGE)
+    naver(NaverStandIn(end=old_end))
+    deposit_store.refresh(5)
+    old = stored_dates()
+
+    # 3페이지부터 실패: 보유 날짜까지 닿지 못했으므로 빈 구간을 만들지 않게 저장하지 않음
+    naver(FailingNaver(fail_from=3))
+    assert deposit_store.refresh(5, force=True) == 0
+    assert metrics("deposit.store", "gap") == 1
+    assert stored_dates() == old
+
+
+def test_older_pages_do_not_mark_refresh(naver):
+    naver(NaverStandIn(end=business_days_before(3)))
+    deposit_store.refresh(5)
+    conn = deposit_store._get_conn()
+    with conn:
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'last_refresh'")
+    conn.close()
+
+    naver(NaverStandIn(end=business_days_before(3)))
+    older = deposit_store.get_older_pages(6, 5)
+    assert older["dates"] == expected(10, business_days_before(3))[:5 * ROWS_PER_PAGE]
+
+    # 과거 페이지 조회는 1페이지를 새로 받은 것이 아니므로 다음 새로고침은 수집해야 함
+    session = naver(NaverStandIn())
+    assert deposit_store.refresh(5) > 0
+    assert session.calls > 0
+    assert deposit_store.load(5)["dates"] == expected(5)
@@ -0,0 +1,99 @@
+"""
+oscillator_engine 검증
+Kotlin OscillatorCalculator.calculate를 옮긴 참조 구현과 비트 단위로 같은지,
+증분 계산이 전체 재계산과 같은지 확인합니다.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from oscillator_engine import ROLLING_DAYS, IncrementalOscillator, calculate
+
+KEYS = ("oscillator", "ema", "macd", "signal", "histogram")
+
+
+def kotlin_reference(market_cap, foreign_5d, institution_5d):
+    """Kotlin OscillatorCalculator.calculate를 그대로 옮긴 참조 구현"""
+
+    def ema_ref(values, period):
+        if not values:
+            return []
+        head = values[:period]
+        total = 0.0
+        for v in head:
+            total += v
+        ema = total / len(head)
+        result = [ema]
+        multiplier = 2.0 / (period + 1)
+        for i in range(period, len(values)):
+            ema = (values[i] - ema) * multiplier + ema
+            result.append(ema)
+        return [0.0] * (period - 1) + result
+
+    oscillator = []
+    for m, f, i in zip(market_cap, foreign_5d, institution_5d):
+        m, f, i = float(int(m)), float(int(f)), float(int(i))
+        oscillator.append(((f + i) / m) * 100.0 if m > 0 else 0.0)
+
+    ema = ema_ref(oscillator, 12)
+    ema12 = ema_ref(oscillator, 12)
+    ema26 = ema_ref(oscillator, 26)
+    macd = [a - b for a, b in zip(ema12, ema26)]
+    signal = ema_ref(macd, 9)
+    histogram = [a - b for a, b in zip(macd, signal)]
+
+    return {
+        "oscillator": oscillator,
+        "ema": ema,
+        "macd": macd,
+        "signal": signal,
+        "histogram": histogram,
+    }
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 11, 12, 25, 26, 34, 35, 60, 2500])
+def test_matches_kotlin_reference(n):
+    rng = np.random.default_rng(42 + n)
+    mcap = rng.integers(10 ** 11, 10 ** 14, n)
+    mcap[: n // 10] = 0
+    foreign = rng.integers(-10 ** 11, 10 ** 11, n)
+    institution = rng.integers(-10 ** 11, 10 ** 11, n)
+
+    result = calculate(mcap, foreign, institution)
+    reference = kotlin_reference(mcap.tolist(), foreign.tolist(), institution.tolist())
+
+    for key in KEYS:
+        # 이전 Kotlin 구현은 입력보다 긴 리스트를 만들 수 있으므로 앞 n개만 비교
+        assert result[key].tolist() == reference[key][:n], key
+
+
+def test_incremental_matches_full():
+    # 원본 일별 값을 한 건씩 추가한 결과가 전체 재계산과 같은지 확인
+    rng = np.random.default_rng(42)
+    n = 300
+    mcap = rng.integers(10 ** 11, 10 ** 14, n)
+    foreign = rng.integers(-10 ** 10, 10 ** 10, n)
+    institution = rng.integers(-10 ** 10, 10 ** 10, n)
+    foreign_5d = np.convolve(foreign, np.ones(ROLLING_DAYS, dtype=np.int64), "valid")
+    institution_5d = np.convolve(institution, np.ones(ROLLING_DAYS, dtype=np.int64), "valid")
+    full = calculate(mcap[ROLLING_DAYS - 1:], foreign_5d, institution_5d)
+
+    state = IncrementalOscillator()
+    bars = []
+    for i in range(n):
+        if i == n // 2:
+            # 직렬화 후 복원해도 이어서 계산되는지 확인
+            state = IncrementalOscillator.from_dict(json.loads(json.dumps(state.to_dict())))
+        if i == n - 1:
+            # 장중 값으로 추가했다가 종가로 교체
+            state.append(str(i), int(mcap[i]), 0, 0)
+            bar = state.replace_last(str(i), int(mcap[i]), int(foreign[i]), int(institution[i]))
+        else:
+            bar = state.append(str(i), int(mcap[i]), int(foreign[i]), int(institution[i]))
+        if bar is not None:
+            bars.append(bar)
+
+    for key in KEYS:
+        assert [b[key] for b in bars] == full[key].tolist(), key
@@ -0,0 +1,51 @@
+"""
+prefetch_scheduler 검증
+작업마다 정한 시작 시각을 지키는지, 같은 키를 다시 넣으면 시작 시각이 앞당겨지는지 확인합니다.
+"""
+
+import threading
+import time
+
+from prefetch_scheduler import PrefetchScheduler
+
+
+def recorder():
+    started = {}
+    lock = threading.Lock()
+
+    def task(name):
+        def run():
+            with lock:
+                started[name] = time.time()
+        return run
+
+    return started, task
+
+
+def test_start_at_is_per_task():
+    scheduler = PrefetchScheduler(max_workers=1)
+    started, task = recorder()
+    now = time.time()
+
+    scheduler.submit("later", task("later"), priority=0, start_at=now + 0.3)
+    assert scheduler.status()["start_at"] is not None
+    scheduler.submit("now", task("now"), priority=10)
+
+    assert scheduler.wait(5)
+    # 우선순위가 높아도 시작 시각 전인 작업은 기다리고, 나중에 넣은 즉시 작업은 바로 실행
+    assert started["now"] - now < 0.2
+    assert started["later"] >= now + 0.3
+    assert scheduler.status()["completed"] == 2
+
+
+def test_resubmit_moves_start_earlier():
+    scheduler = PrefetchScheduler(max_workers=1)
+    started, task = recorder()
+    now = time.time()
+
+    assert scheduler.submit("a", task("a"), start_at=now + 60)
+    assert scheduler.status()["state"] == "waiting"
+    assert not scheduler.submit("a", task("a"), start_at=0.0)
+
+    assert scheduler.wait(5)
+    assert started["a"] - now < 0.2
@@ -0,0 +1,199 @@
+"""
+request_cache / 요청 병합 검증
+SingleFlight 결과 공유, ResultCache TTL 만료와 LRU 상한, stock_analyzer._coalesced의
+더 넓은 결과 재사용과 slice_stock_data가 직접 계산한 결과와 같은지 확인합니다.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import request_cache
+import stock_analyzer
+import stock_data_fetcher
+from request_cache import MISSING, ResultCache, SingleFlight
+
+# 잘라낼 기간 (시작일이 주말/휴장일/거래일인 경우가 섞이도록 여러 개)
+WINDOWS = (20, 30, 31, 45, 61, 100, 181)
+WIDE = 400
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(request_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 1}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(value is results[0][0] for value, _ in results)
+
+    # 끝난 뒤의 호출은 새로 실행
+    assert flight.do("k", lambda: 2) == (2, False)
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("실패")
+
+    errors = []
+
+    def run():
+        try:
+            flight.do("k", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run)]
+    threads[0].start()
+    assert started.wait(5)
+    threads.append(threading.Thread(target=run))
+    threads[1].start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 2 and errors[0] is errors[1]
+
+
+def test_wait_any_without_match():
+    assert SingleFlight().wait_any(lambda key: True) is MISSING
+
+
+def test_result_cache_ttl(clock):
+    cache = ResultCache(maxsize=4, ttl=60)
+    cache.put("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    assert cache.items() == [("a", 1)]
+    clock.now += 2
+    assert cache.get("a") is MISSING
+    assert cache.items() == []
+
+
+def test_result_cache_lru_bound(clock):
+    cache = ResultCache(maxsize=3, ttl=60)
+    for key in "abc":
+        cache.put(key, key)
+    cache.get("a")          # a를 최근 사용으로
+    cache.put("d", "d")     # 가장 오래 쓰지 않은 b 제거
+    assert len(cache) == 3
+    assert cache.get("b") is MISSING
+    assert [cache.get(k) for k in "acd"] == ["a", "c", "d"]
+
+
+@pytest.fixture
+def coalesced(monkeypatch):
+    """새 캐시/병합 상태로 _coalesced 실행"""
+    monkeypatch.setattr(stock_analyzer, "_results", ResultCache())
+    monkeypatch.setattr(stock_analyzer, "_in_flight", SingleFlight())
+    monkeypatch.setattr(stock_analyzer, "trading_date", lambda: "20240313")
+    return stock_analyzer._coalesced
+
+
+def test_cached_wider_result_does_not_wait_for_in_flight(coalesced):
+    covers = lambda other, args: other[0] > args[0]
+    narrow = lambda other, data: {"rows": data["rows"][-args_days[0]:]}
+    args_days = [30]
+
+    coalesced("data", (365,), lambda: {"rows": list(range(365))}, covers, narrow)
+
+    # 더 넓은 3650일 요청이 진행 중이어도 캐시된 365일 결과로 바로 응답
+    started = threading.Event()
+    release = threading.Event()
+
+    def cold():
+        started.set()
+        release.wait(5)
+        return {"rows": list(range(3650))}
+
+    worker = threading.Thread(target=lambda: coalesced("data", (3650,), cold, covers, narrow))
+    worker.start()
+    assert started.wait(5)
+    try:
+        began = time.monotonic()
+        value = coalesced("data", (30,), lambda: pytest.fail("직접 수집하면 안 됨"), covers, narrow)
+        assert time.monotonic() - began < 1.0
+        assert value == {"rows": list(range(335, 365))}
+    finally:
+        release.set()
+        worker.join(5)
+
+
+def test_in_flight_wider_result_is_used_without_cache(coalesced):
+    covers = lambda other, args: other[0] > args[0]
+    narrow = lambda other, data: {"rows": data["rows"][-30:]}
+    started = threading.Event()
+    release = threading.Event()
+
+    def cold():
+        started.set()
+        release.wait(5)
+        return {"rows": list(range(3650))}
+
+    worker = threading.Thread(target=lambda: coalesced("data", (3650,), cold, covers, narrow))
+    worker.start()
+    assert started.wait(5)
+    threading.Timer(0.05, release.set).start()
+    value = coalesced("data", (30,), lambda: pytest.fail("직접 수집하면 안 됨"), covers, narrow)
+    worker.join(5)
+    assert value == {"rows": list(range(3620, 3650))}
+
+
+@pytest.fixture
+def holidays():
+    # 잘라낼 기간의 시작일 중 평일을 휴장일로 (시작일이 휴장일인 경계)
+    today = datetime.now().date()
+    starts = [today - timedelta(days=days) for days in WINDOWS[:3]]
+    return frozenset(day for day in starts if day.weekday() < 5)
+
+
+def test_slice_matches_direct_fetch(krx):
+    wide = stock_data_fetcher.get_stock_data("005930", WIDE)
+    for days in WINDOWS:
+        direct = stock_data_fetcher.get_stock_data("005930", days)
+        assert stock_data_fetcher.slice_stock_data(wide, days) == direct, days
+
+    # 원본이 시작일 이전을 포함하지 않으면 잘라낼 수 없음
+    assert stock_data_fetcher.slice_stock_data(stock_data_fetcher.get_stock_data("005930", 30), 45) is None
@@ -0,0 +1,207 @@
+"""
+resilient_fetch 검증
+서킷 브레이커 상태 전이, 헤지 요청, 재시도 시간 한도, 저장된 데이터로 대체하는 경로를
+가짜 함수와 가짜 시계로 확인합니다.
+"""
+
+import threading
+import types
+
+import pytest
+
+import resilient_fetch
+from resilient_fetch import CircuitBreaker, CircuitOpenError, Policy, RetryableStatus
+
+HOST = "test"
+COUNTER = f"fetch.{HOST}"
+
+
+class Clock:
+    """time 모듈 대신 쓰는 시계 (sleep은 시간만 앞으로)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilient_fetch, "time", types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    return clock
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    """HOST 정책 지정 (테스트가 끝나면 원래 정책/상태로)"""
+    def use(**kwargs):
+        monkeypatch.setitem(resilient_fetch.DEFAULT_POLICIES, HOST, Policy(**kwargs))
+        resilient_fetch.reset()
+    yield use
+    resilient_fetch.reset()
+
+
+class Fake:
+    """정해진 순서로 결과를 내거나 오류를 던지는 함수 (호출 수 기록)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_breaker_state_machine(clock):
+    breaker = CircuitBreaker(failure_threshold=2, open_seconds=30)
+    assert breaker.allow()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.retry_in() == 30
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    # half_open: 시험 요청은 하나만
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+    # 시험 요청 실패 → 바로 다시 열림 (연속 실패 수와 무관)
+    assert breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_open_circuit_skips_calls(clock, policy, metrics):
+    policy(retries=0, failure_threshold=2, open_seconds=30)
+    failing = Fake(RetryableStatus(503))
+    for _ in range(2):
+        with pytest.raises(RetryableStatus):
+            resilient_fetch.call(HOST, failing)
+    assert resilient_fetch.status()[HOST]["state"] == "open"
+
+    with pytest.raises(CircuitOpenError):
+        resilient_fetch.call(HOST, failing)
+    assert failing.calls == 2
+    assert metrics(COUNTER, "open") == 1 and metrics(COUNTER, "failed") == 2
+
+    clock.now += 30
+    assert resilient_fetch.call(HOST, Fake("ok")) == "ok"
+    assert resilient_fetch.status()[HOST]["state"] == "closed"
+
+
+def test_retry_stops_at_deadline(clock, policy, monkeypatch, metrics):
+    policy(retries=5, backoff_base=1.0, backoff_cap=1.0, deadline=2.5)
+    monkeypatch.setattr(resilient_fetch.random, "uniform", lambda low, high: high)
+    failing = Fake(RetryableStatus(503))
+
+    with pytest.raises(RetryableStatus):
+        resilient_fetch.call(HOST, failing)
+    # 1초씩 두 번 기다린 뒤, 세 번째 대기는 한도(2.5초)를 넘으므로 재시도 횟수가 남아도 중단
+    assert failing.calls == 3
+    assert clock.slept == [1.0, 1.0]
+    assert metrics(COUNTER, "retry") == 2 and metrics(COUNTER, "failed") == 1
+
+
+def test_retry_after_past_deadline_is_not_waited(clock, policy):
+    policy(retries=3, deadline=10.0)
+    failing = Fake(RetryableStatus(429, retry_after=60))
+    with pytest.raises(RetryableStatus):
+        resilient_fetch.call(HOST, failing)
+    assert failing.calls == 1 and clock.slept == []
+
+
+def test_retry_then_success(clock, policy, metrics):
+    policy(retries=2, backoff_base=0.1, deadline=10.0)
+    flaky = Fake(RetryableStatus(502), "ok")
+    assert resilient_fetch.call(HOST, flaky) == "ok"
+    assert flaky.calls == 2
+    assert metrics(COUNTER, "retry") == 1 and metrics(COUNTER, "ok") == 1
+
+
+def test_non_retryable_error_is_not_retried(clock, policy):
+    policy(retries=3)
+    broken = Fake(TypeError("잘못된 인자"))
+    with pytest.raises(TypeError):
+        resilient_fetch.call(HOST, broken)
+    assert broken.calls == 1
+
+
+def test_fall_back_serves_stale(clock, policy, metrics):
+    policy(retries=0, failure_threshold=1, open_seconds=30)
+    failing = Fake(RetryableStatus(503))
+
+    assert resilient_fetch.call(HOST, failing, fallback=lambda: "저장된 값") == "저장된 값"
+    assert metrics(COUNTER, "failed") == 1 and metrics(COUNTER, "stale") == 1
+
+    # 서킷이 열려 있어도 fallback으로 응답 (요청은 보내지 않음)
+    assert resilient_fetch.call(HOST, failing, fallback=lambda: "저장된 값") == "저장된 값"
+    assert failing.calls == 1
+    assert metrics(COUNTER, "open") == 1 and metrics(COUNTER, "stale") == 2
+
+    # fallback에 값이 없으면 원래 오류
+    with pytest.raises(CircuitOpenError):
+        resilient_fetch.call(HOST, failing, fallback=lambda: None)
+
+
+class SlowFirst:
+    """첫 호출은 release까지 멈추고, 이후 호출은 바로 응답"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(5)
+            return "first"
+        return "second"
+
+
+def test_hedge_wins_when_first_attempt_is_slow(policy, metrics):
+    policy(retries=0, hedge=True, hedge_min=0.05, hedge_max=0.05, max_concurrency=2)
+    fn = SlowFirst()
+    try:
+        assert resilient_fetch.call(HOST, fn) == "second"
+    finally:
+        fn.release.set()
+    assert fn.calls == 2
+    assert metrics(COUNTER, "hedge") == 1 and metrics(COUNTER, "hedge_win") == 1
+
+
+def test_no_hedge_when_first_attempt_is_fast(policy, metrics):
+    policy(retries=0, hedge=True, hedge_min=0.05, hedge_max=1.0)
+    fast = Fake("ok")
+    assert resilient_fetch.call(HOST, fast) == "ok"
+    assert fast.calls == 1 and metrics(COUNTER, "hedge") == 0
+
+
+def test_no_hedge_when_saturated(policy, metrics):
+    # 동시 요청 한도가 첫 시도로 차 있으면 헤지하지 않고 첫 시도를 기다림
+    policy(retries=0, hedge=True, hedge_min=0.05, hedge_max=0.05, max_concurrency=1)
+    fn = SlowFirst()
+    threading.Timer(0.2, fn.release.set).start()
+    assert resilient_fetch.call(HOST, fn) == "first"
+    assert fn.calls == 1 and metrics(COUNTER, "hedge") == 0
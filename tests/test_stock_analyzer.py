@@ -0,0 +1,35 @@
+"""
+stock_analyzer 검증
+Kotlin에서 부르는 공개 함수가 모두 진입점으로 계측되는지 확인합니다.
+"""
+
+import inspect
+import json
+
+import instrumentation
+import stock_analyzer
+
+
+def public_functions():
+    return [
+        name for name, fn in inspect.getmembers(stock_analyzer, inspect.isfunction)
+        if not name.startswith("_") and fn.__module__ == stock_analyzer.__name__
+    ]
+
+
+def test_public_functions_are_entry_points():
+    names = public_functions()
+    assert "get_stock_analysis" in names and "stream_stock_analysis" in names
+    missing = [name for name in names
+               if not hasattr(getattr(stock_analyzer, name), "__wrapped__")]
+    assert missing == []
+
+
+def test_entry_points_are_timed(metrics):
+    stock_analyzer.get_import_report(5)
+    errors = [json.loads(payload) for payload in stock_analyzer.stream_stock_analysis("", 30)]
+    assert "error" in errors[0]
+
+    spans = instrumentation.snapshot()["spans"]
+    assert spans["get_import_report"]["calls"] == 1
+    assert spans["stream_stock_analysis"]["calls"] == 1
@@ -0,0 +1,94 @@
+"""
+stock_search 검증
+2-gram 색인 후보, 초성 검색, 완전 일치 → 오타 허용 순위 정렬과 search_stock 결과 순서를 고정합니다.
+"""
+
+import pytest
+
+import stock_data_fetcher
+from stock_search import (
+    RANK_CHOSUNG_PREFIX, RANK_CHOSUNG_SUBSTRING, RANK_CONTAINED, RANK_EXACT, RANK_FUZZY,
+    RANK_PREFIX, RANK_SUBSTRING, StockSearchEngine, edit_distance, to_chosung,
+)
+
+SAMPLE = [
+    {"ticker": "005930", "name": "삼성전자", "market_cap": 400},
+    {"ticker": "005935", "name": "삼성전자우", "market_cap": 50},
+    {"ticker": "006400", "name": "삼성SDI", "market_cap": 30},
+    {"ticker": "028260", "name": "삼성물산", "market_cap": 25},
+    {"ticker": "000660", "name": "SK하이닉스", "market_cap": 100},
+    {"ticker": "009150", "name": "삼성전기", "market_cap": 20},
+    {"ticker": "207940", "name": "삼성바이오로직스", "market_cap": 60},
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return StockSearchEngine(SAMPLE)
+
+
+def hits(engine, query, **kwargs):
+    return [(hit["name"], hit["rank"]) for hit in engine.search(query, limit=None, **kwargs)]
+
+
+def test_to_chosung():
+    assert to_chosung("삼성SDI") == "ㅅㅅSDI"
+
+
+def test_edit_distance_stops_early():
+    assert edit_distance("삼송전자", "삼성전자", 1) == 1
+    assert edit_distance("005390", "005930", 2) == 2
+    assert edit_distance("abcdef", "uvwxyz", 2) == 3
+
+
+def test_exact_match_first(engine):
+    assert hits(engine, "005930") == [("삼성전자", RANK_EXACT)]
+    assert hits(engine, "삼성전자")[:2] == [("삼성전자", RANK_EXACT), ("삼성전자우", RANK_PREFIX)]
+
+
+def test_prefix_ties_by_market_cap(engine):
+    assert hits(engine, "삼성") == [
+        ("삼성전자", RANK_PREFIX),
+        ("삼성바이오로직스", RANK_PREFIX),
+        ("삼성전자우", RANK_PREFIX),
+        ("삼성SDI", RANK_PREFIX),
+        ("삼성물산", RANK_PREFIX),
+        ("삼성전기", RANK_PREFIX),
+    ]
+    # 대소문자 구분 없음, 코드 접두 일치
+    assert hits(engine, "sk하이") == [("SK하이닉스", RANK_PREFIX)]
+    assert hits(engine, "00593") == [("삼성전자", RANK_PREFIX), ("삼성전자우", RANK_PREFIX)]
+
+
+def test_partial_match(engine):
+    assert hits(engine, "전자") == [("삼성전자", RANK_SUBSTRING), ("삼성전자우", RANK_SUBSTRING)]
+    assert hits(engine, "이오") == [("삼성바이오로직스", RANK_SUBSTRING)]
+    assert hits(engine, "삼성전자 주가") == [("삼성전자", RANK_CONTAINED)]
+
+
+def test_chosung(engine):
+    assert hits(engine, "ㅅㅅㅈㅈ") == [("삼성전자", RANK_CHOSUNG_PREFIX), ("삼성전자우", RANK_CHOSUNG_PREFIX)]
+    assert hits(engine, "ㅈㅈ") == [("삼성전자", RANK_CHOSUNG_SUBSTRING), ("삼성전자우", RANK_CHOSUNG_SUBSTRING)]
+    assert hits(engine, "ㅂㅇㅇ") == [("삼성바이오로직스", RANK_CHOSUNG_SUBSTRING)]
+
+
+def test_fuzzy_only_without_exact_or_prefix(engine):
+    assert hits(engine, "삼송전자") == [("삼성전자", RANK_FUZZY + 1)]
+    # 숫자 검색어는 종목 코드끼리만 비교 (자리 바뀜 = 거리 2)
+    assert hits(engine, "005390") == [("삼성전자", RANK_FUZZY + 2)]
+    assert hits(engine, "삼송전자", fuzzy=False) == []
+
+
+def test_limit_and_blank(engine):
+    assert [hit["name"] for hit in engine.search("삼성", limit=2)] == ["삼성전자", "삼성바이오로직스"]
+    assert engine.search("  ") == []
+
+
+def test_search_stock_keeps_relevance_order(engine, monkeypatch):
+    monkeypatch.setattr(stock_data_fetcher, "get_search_engine", lambda: engine)
+    assert stock_data_fetcher.search_stock("삼성전자") == [
+        {"ticker": "005930", "name": "삼성전자"},
+        {"ticker": "005935", "name": "삼성전자우"},
+    ]
+    # 자동완성과 달리 오타 허용 결과는 포함하지 않음
+    assert stock_data_fetcher.search_stock("삼송전자") == []
@@ -0,0 +1,140 @@
+"""
+timeseries_cache 검증
+캐시 범위 밖 구간 계산(_missing_ranges)의 이전/이후/장중 재수집 분기와,
+저장 시 캐시 범위가 하나의 연속 구간으로 합쳐지는지 확인합니다.
+"""
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+import timeseries_cache
+from timeseries_cache import TODAY_REFRESH_INTERVAL, _missing_ranges
+
+# 2024-03-13 (수) 장중
+NOW = datetime(2024, 3, 13, 14, 0)
+SETTLED = datetime(2024, 3, 12, 18, 30).timestamp()   # 3/12 데이터 확정 후 수집
+
+
+def coverage(start, end, fetched_at):
+    return (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), fetched_at)
+
+
+@pytest.fixture(autouse=True)
+def _calendar(calendar):
+    return calendar
+
+
+def test_no_coverage_narrows_to_trading_days():
+    # 토요일 시작, 일요일 끝 → 그 사이 거래일만
+    assert _missing_ranges(None, date(2024, 3, 2), date(2024, 3, 10), NOW) == [
+        (date(2024, 3, 4), date(2024, 3, 8))
+    ]
+    assert _missing_ranges(None, date(2024, 3, 9), date(2024, 3, 10), NOW) == []
+
+
+def test_inside_settled_coverage_is_hit():
+    cov = coverage(date(2024, 1, 2), date(2024, 3, 12), SETTLED)
+    assert _missing_ranges(cov, date(2024, 2, 1), date(2024, 3, 12), NOW) == []
+
+
+def test_older_range_ends_before_coverage():
+    cov = coverage(date(2024, 2, 1), date(2024, 3, 12), SETTLED)
+    assert _missing_ranges(cov, date(2024, 1, 2), date(2024, 3, 12), NOW) == [
+        (date(2024, 1, 2), date(2024, 1, 31))
+    ]
+
+
+def test_newer_range_after_settled_end():
+    cov = coverage(date(2024, 2, 1), date(2024, 3, 8), datetime(2024, 3, 8, 19, 0).timestamp())
+    assert _missing_ranges(cov, date(2024, 2, 1), date(2024, 3, 13), NOW) == [
+        (date(2024, 3, 9), date(2024, 3, 13))
+    ]
+
+
+def test_newer_range_refetches_intraday_end():
+    # 3/12 장중에 받은 데이터: 3/12부터 다시 수집 (범위가 끊기지 않게)
+    cov = coverage(date(2024, 2, 1), date(2024, 3, 12), datetime(2024, 3, 12, 11, 0).timestamp())
+    assert _missing_ranges(cov, date(2024, 3, 1), date(2024, 3, 13), NOW) == [
+        (date(2024, 3, 12), date(2024, 3, 13))
+    ]
+
+
+def test_older_and_newer_together():
+    cov = coverage(date(2024, 2, 1), date(2024, 3, 8), datetime(2024, 3, 8, 19, 0).timestamp())
+    assert _missing_ranges(cov, date(2024, 1, 29), date(2024, 3, 13), NOW) == [
+        (date(2024, 1, 29), date(2024, 1, 31)),
+        (date(2024, 3, 9), date(2024, 3, 13)),
+    ]
+
+
+def test_today_refresh_uses_now():
+    today = NOW.date()
+    fresh = coverage(date(2024, 2, 1), today, NOW.timestamp() - TODAY_REFRESH_INTERVAL + 10)
+    stale = coverage(date(2024, 2, 1), today, NOW.timestamp() - TODAY_REFRESH_INTERVAL - 10)
+    assert _missing_ranges(fresh, date(2024, 3, 1), today, NOW) == []
+    assert _missing_ranges(stale, date(2024, 3, 1), today, NOW) == [(today, today)]
+
+    # 확정 후 수집한 오늘 데이터는 다시 받지 않음
+    evening = datetime(2024, 3, 13, 20, 0)
+    settled = coverage(date(2024, 2, 1), today, datetime(2024, 3, 13, 18, 5).timestamp())
+    assert _missing_ranges(settled, date(2024, 3, 1), today, evening) == []
+
+
+def frames(start, end):
+    index = pd.bdate_range(start, end)
+    mcap = pd.DataFrame({"시가총액": range(1, len(index) + 1)}, index=index)
+    inv = pd.DataFrame({"외국인": 1, "기타외국인": 2, "금융투자": 3}, index=index)
+    return mcap, inv
+
+
+def read_coverage(ticker):
+    cov = timeseries_cache._read_coverage(ticker)
+    return cov[0], cov[1]
+
+
+def test_write_range_merges_coverage(data_dir):
+    timeseries_cache._write_range("005930", date(2024, 2, 1), date(2024, 2, 29),
+                                  *frames("2024-02-01", "2024-02-29"))
+    assert read_coverage("005930") == ("2024-02-01", "2024-02-29")
+
+    # 이전 구간 추가
+    timeseries_cache._write_range("005930", date(2024, 1, 2), date(2024, 1, 31),
+                                  *frames("2024-01-02", "2024-01-31"))
+    assert read_coverage("005930") == ("2024-01-02", "2024-02-29")
+
+    # 안쪽 구간을 다시 써도 범위는 줄지 않음
+    timeseries_cache._write_range("005930", date(2024, 2, 5), date(2024, 2, 9),
+                                  *frames("2024-02-05", "2024-02-09"))
+    assert read_coverage("005930") == ("2024-01-02", "2024-02-29")
+
+    # 이후 구간 확장, 다른 종목은 따로 관리
+    timeseries_cache._write_range("005930", date(2024, 3, 1), date(2024, 3, 8),
+                                  *frames("2024-03-01", "2024-03-08"))
+    assert read_coverage("005930") == ("2024-01-02", "2024-03-08")
+    assert timeseries_cache._read_coverage("000660") is None
+
+    mcap, inv = timeseries_cache.load_frames("005930", date(2024, 1, 2), date(2024, 3, 8))
+    assert len(mcap) == len(pd.bdate_range("2024-01-02", "2024-03-08"))
+    assert (inv["외국인합계"] == 3).all() and (inv["기관합계"] == 3).all()
+
+
+def test_get_daily_frames_fetches_only_missing(krx):
+    end = krx.daily.index[-1].date()
+    recent = krx.daily.index[-40].date()
+    older = krx.daily.index[-80].date()
+
+    mcap, _ = timeseries_cache.get_daily_frames("005930", recent, end)
+    calls = krx.calls
+    assert len(mcap) == 40
+
+    # 같은 구간: 수집 없음
+    timeseries_cache.get_daily_frames("005930", recent, end)
+    assert krx.calls == calls
+
+    # 이전 구간만 수집 (시가총액 + 투자자 1회씩)
+    mcap, inv = timeseries_cache.get_daily_frames("005930", older, end)
+    assert krx.calls == calls + 2
+    assert len(mcap) == 80 and len(inv) == 80
+    assert read_coverage("005930") == (older.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
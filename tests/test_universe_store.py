@@ -0,0 +1,126 @@
+"""
+universe_store 저장소 검증
+용량 변경(_resize)과 앞쪽 날짜 추가(_prepend) 뒤에도 기존 값이 그대로인지,
+stock_data()가 get_stock_data와 같은 결과(결측/상장 전 구간 포함)를 내는지 확인합니다.
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+import stock_data_fetcher
+import universe_store
+from universe_store import UniverseStore, from_epoch_day, to_epoch_day
+
+from conftest import weekdays
+
+TICKER = "005930"
+
+
+def day_values(days, tickers, scale=1.0):
+    """날짜/종목마다 다른 값 {field: {ticker: 값}}"""
+    return [
+        {field: {t: scale * (i * 100 + j + k * 10_000) for j, t in enumerate(tickers)}
+         for k, field in enumerate(universe_store.FIELDS)}
+        for i, _ in enumerate(days)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UniverseStore.create(str(tmp_path / "universe"), date_capacity=4, ticker_capacity=2)
+
+
+def test_resize_keeps_values(store):
+    days = weekdays(date(2024, 1, 1), date(2024, 1, 10))
+    tickers = ["000001", "000002", "000003"]
+    for day, values in zip(days, day_values(days, tickers)):
+        store.append_day(day, values)
+
+    # 날짜/종목 용량을 모두 넘겨 파일이 커지고 열 용량 변경으로 복사됨
+    assert store.date_capacity >= len(days) and store.ticker_capacity >= len(tickers)
+    reopened = UniverseStore.open(store.path)
+    for s in (store, reopened):
+        assert s.dates.tolist() == [to_epoch_day(d) for d in days]
+        assert s.series("market_cap", "000003").tolist() == [i * 100 + 2.0 for i in range(len(days))]
+        assert s.view("institution").tolist() == [
+            [20_000 + i * 100 + j for j in range(3)] for i in range(len(days))
+        ]
+
+
+def test_prepend_keeps_rows_and_order(store):
+    days = weekdays(date(2024, 1, 1), date(2024, 1, 31))
+    old, stored, new = days[:8], days[8:14], days[14:]
+    for day, values in zip(stored, day_values(stored, [TICKER])):
+        store.append_day(day, values)
+    before = {field: store.series(field, TICKER).tolist() for field in store.fields}
+
+    # 저장 구간 안의 날짜는 무시하고 앞뒤 날짜만 추가
+    assert store.extend_dates(old + stored[2:4] + new) == len(old) + len(new)
+
+    assert store.dates.tolist() == [to_epoch_day(d) for d in days]
+    assert store.date_capacity >= len(days)
+    for field in store.fields:
+        column = store.series(field, TICKER)
+        assert np.isnan(column[:len(old)]).all()
+        assert column[len(old):len(old) + len(stored)].tolist() == before[field]
+        assert np.isnan(column[len(old) + len(stored):]).all()
+
+    # 앞에 추가한 행에도 쓸 수 있고, 다시 열어도 같음
+    assert store.write_column(TICKER, old[:2], {"market_cap": [1.0, 2.0]}) == 2
+    reopened = UniverseStore.open(store.path)
+    assert reopened.dates.tolist() == store.dates.tolist()
+    assert reopened.series("market_cap", TICKER, end=old[1]).tolist() == [1.0, 2.0]
+    assert from_epoch_day(reopened.dates[0]) == days[0]
+
+
+def test_prepend_before_single_row(store):
+    store.append_day(date(2024, 1, 10), {"market_cap": {TICKER: 5.0}})
+    store.extend_dates([date(2024, 1, 8), date(2024, 1, 9)])
+    assert [from_epoch_day(d) for d in store.dates] == [date(2024, 1, 8), date(2024, 1, 9), date(2024, 1, 10)]
+    assert store.series("market_cap", TICKER)[-1] == 5.0
+
+
+@pytest.fixture
+def listed(krx, monkeypatch):
+    """
+    최근 상장한 종목처럼: 상장(약 250거래일 전) 이전 행 없음,
+    일부 날짜는 투자자 데이터만 없고 하루는 시가총액만 없음
+    """
+    krx.daily = krx.daily.iloc[-250:]
+    index = krx.daily.index
+    no_flows = {index[40], index[41], index[120], index[-3]}
+    no_cap = index[80]
+
+    stock = sys.modules["pykrx.stock"]
+    trading_value = stock.get_market_trading_value_by_date
+    market_cap = stock.get_market_cap
+
+    def get_market_trading_value_by_date(*args, **kwargs):
+        df = trading_value(*args, **kwargs)
+        return df[~df.index.isin(no_flows)]
+
+    def get_market_cap(*args, **kwargs):
+        df = market_cap(*args, **kwargs).astype("float64")
+        if no_cap in df.index:
+            df.loc[no_cap, "시가총액"] = np.nan
+        return df
+
+    monkeypatch.setattr(stock, "get_market_trading_value_by_date", get_market_trading_value_by_date)
+    monkeypatch.setattr(stock, "get_market_cap", get_market_cap)
+    monkeypatch.setattr("ticker_index.get_ticker_index", lambda: type("Index", (), {"records": []})())
+    return krx
+
+
+def test_stock_data_matches_get_stock_data(listed, data_dir):
+    now = datetime.now()
+    store = UniverseStore.create(str(data_dir / "universe"))
+    written = universe_store.import_from_cache([TICKER], now - timedelta(days=500), store=store)
+    assert written[TICKER] == 250
+
+    for days in (10, 30, 100, 200, 365, 500):
+        expected = stock_data_fetcher.get_stock_data(TICKER, days)
+        assert store.stock_data(TICKER, days, now=now) == expected, days
+    assert store.stock_data("999999", 30) is None